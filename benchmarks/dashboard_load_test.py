@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Dashboard Load Test
+Replays every server-side callback of a running Dash dashboard from many
+concurrent clients and reports latency percentiles per callback.
+
+The layout and callback graph are read from the running app, one client walks
+the callbacks in dependency order to collect realistic inputs (such as the
+contents of the data store), then each callback is replayed with those inputs.
+
+Usage: python benchmarks/dashboard_load_test.py [--url http://localhost:8050] [--concurrency 20] [--requests 200]
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
+
+PropKey = Tuple[str, str]
+
+
+def parse_outputs(output: str) -> Any:
+    """Parse a callback's output spec into the ``outputs`` field of an update request."""
+    if output.startswith(".."):
+        return [dict(zip(("id", "property"), part.rsplit(".", 1))) for part in output[2:-2].split("...")]
+    component_id, prop = output.rsplit(".", 1)
+    return {"id": component_id, "property": prop}
+
+
+def output_keys(outputs: Any) -> List[PropKey]:
+    """Component properties written by a callback."""
+    return [(item["id"], item["property"]) for item in (outputs if isinstance(outputs, list) else [outputs])]
+
+
+def collect_props(node: Any, props: Dict[PropKey, Any]):
+    """Record the initial value of every property of every component with an id."""
+    if isinstance(node, list):
+        for child in node:
+            collect_props(child, props)
+    elif isinstance(node, dict):
+        node_props = node.get("props")
+        if isinstance(node_props, dict):
+            if isinstance(node_props.get("id"), str):
+                for name, value in node_props.items():
+                    props[(node_props["id"], name)] = value
+            for value in node_props.values():
+                collect_props(value, props)
+
+
+class DashClient:
+    """Issues callback requests the way the Dash renderer does."""
+
+    def __init__(self, url: str, timeout: float = 60):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def get(self, path: str) -> Any:
+        response = self.session.get(self.url + path, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def payload(self, dependency: Dict[str, Any], props: Dict[PropKey, Any]) -> Dict[str, Any]:
+        """Build the update request of a callback from the current property values.
+
+        The changed property is the first input that is not a click counter,
+        so callbacks that short-circuit on button clicks run their real work.
+        """
+
+        def values(items):
+            return [
+                {"id": item["id"], "property": item["property"], "value": props.get((item["id"], item["property"]))}
+                for item in items
+            ]
+
+        inputs = values(dependency["inputs"])
+        changed = next((item for item in inputs if item["property"] != "n_clicks"), inputs[0] if inputs else None)
+        return {
+            "output": dependency["output"],
+            "outputs": parse_outputs(dependency["output"]),
+            "inputs": inputs,
+            "state": values(dependency.get("state", [])),
+            "changedPropIds": [f"{changed['id']}.{changed['property']}"] if changed else [],
+        }
+
+    def call(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Run one callback; returns its response, or None when nothing was updated."""
+        response = self.session.post(self.url + "/_dash-update-component", json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json() if response.status_code == 200 else None
+
+
+def resolve_inputs(client: DashClient) -> Tuple[List[Dict[str, Any]], Dict[PropKey, Any]]:
+    """Run every server-side callback once in dependency order and return the final property values."""
+    props: Dict[PropKey, Any] = {}
+    collect_props(client.get("/_dash-layout"), props)
+    dependencies = [dep for dep in client.get("/_dash-dependencies") if not dep.get("clientside_function")]
+
+    produced = {key for dep in dependencies for key in output_keys(parse_outputs(dep["output"]))}
+    resolved = set()
+    pending = list(dependencies)
+    while pending:
+        ready = [
+            dep
+            for dep in pending
+            if all(
+                (item["id"], item["property"]) not in produced or (item["id"], item["property"]) in resolved
+                for item in dep["inputs"]
+            )
+        ] or pending  # Cycles: run the rest as is
+        for dep in ready:
+            pending.remove(dep)
+            try:
+                result = client.call(client.payload(dep, props))
+            except requests.RequestException as e:
+                print(f"⚠️ {dep['output']} failed during warmup: {e}")
+                result = None
+            for component_id, updates in ((result or {}).get("response") or {}).items():
+                for name, value in updates.items():
+                    props[(component_id, name)] = value
+            resolved.update(output_keys(parse_outputs(dep["output"])))
+
+    return dependencies, props
+
+
+def load_test(url: str, dependency: Dict[str, Any], props: Dict[PropKey, Any], concurrency: int, total: int) -> Dict[str, Any]:
+    """Replay one callback ``total`` times from ``concurrency`` clients."""
+    clients = [DashClient(url) for _ in range(concurrency)]
+    payload = clients[0].payload(dependency, props)
+
+    def run(index: int) -> Optional[float]:
+        started = time.perf_counter()
+        try:
+            clients[index % concurrency].call(payload)
+        except requests.RequestException:
+            return None
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(run, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = np.array([latency for latency in results if latency is not None]) * 1000
+    return {
+        "callback": dependency["output"].strip("."),
+        "requests": total,
+        "errors": results.count(None),
+        "throughput": total / elapsed,
+        "p50": float(np.percentile(latencies, 50)) if len(latencies) else float("nan"),
+        "p99": float(np.percentile(latencies, 99)) if len(latencies) else float("nan"),
+        "mean": statistics.fmean(latencies) if len(latencies) else float("nan"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8050")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per callback")
+    parser.add_argument("--callback", help="Only test callbacks whose outputs contain this text")
+    args = parser.parse_args()
+
+    dependencies, props = resolve_inputs(DashClient(args.url))
+    if args.callback:
+        dependencies = [dep for dep in dependencies if args.callback in dep["output"]]
+
+    print(f"{'Callback':<70} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9} {'errors':>7}")
+    for dependency in dependencies:
+        result = load_test(args.url, dependency, props, args.concurrency, args.requests)
+        print(
+            f"{result['callback'][:70]:<70} {result['throughput']:>8.1f} {result['p50']:>9.1f} "
+            f"{result['p99']:>9.1f} {result['mean']:>9.1f} {result['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Enrollment Analytics Benchmark
+Times the Enrollment Trends analytics on 10 years of monthly data for all 64
+districts: one shared trends frame per district and vectorized analytics,
+against the previous row-by-row code that reloaded the trends per analytic.
+
+Usage: python benchmarks/enrollment_analytics.py [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from io import StringIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from dashboards.enrollment_trends import analytics  # noqa: E402
+
+DISTRICTS = 64
+YEARS = 10
+GRADES = [f"Class {grade}" for grade in range(1, 11)]
+
+
+def make_trends(seed: int) -> pd.DataFrame:
+    """Create one district's monthly trends frame."""
+    rng = np.random.default_rng(seed)
+    months = np.arange(YEARS * 12)
+    enrollment = (20000 * (1 + 0.1 * np.sin(2 * np.pi * months / 12)) * (1 + 0.02 * months / 12)).astype("int64")
+    enrollment += rng.integers(-500, 500, len(months))
+    return pd.DataFrame(
+        {
+            "period": pd.date_range("2015-01-01", periods=len(months), freq="MS").strftime("%Y-%m"),
+            "enrollment_count": enrollment,
+            "unique_students": (enrollment * 0.95).astype("int64"),
+            "active_schools": enrollment // 60,
+            "retention_rate": 85 + rng.normal(0, 3, len(months)),
+        }
+    )
+
+
+def make_regional(districts) -> pd.DataFrame:
+    """Create yearly regional trends for every district."""
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "division": np.repeat(districts, YEARS),
+            "year": np.tile(np.arange(2015, 2015 + YEARS), len(districts)),
+            "growth_rate": rng.normal(3, 2, len(districts) * YEARS),
+        }
+    )
+
+
+def make_grades(districts) -> pd.DataFrame:
+    """Create yearly grade-level trends for every district."""
+    rng = np.random.default_rng(1)
+    rows = len(districts) * YEARS * len(GRADES)
+    return pd.DataFrame(
+        {
+            "grade_level": np.tile(GRADES, len(districts) * YEARS),
+            "year": np.tile(np.repeat(np.arange(2015, 2015 + YEARS), len(GRADES)), len(districts)),
+            "enrollment_count": rng.integers(1000, 5000, rows),
+        }
+    )
+
+
+def row_by_row_volatility(trends_data):
+    """Previous implementation: rebuild a frame from records and emit rows with iterrows."""
+    df = pd.DataFrame(trends_data)
+    df["rolling_std"] = df["enrollment_count"].rolling(window=12).std()
+    df["rolling_mean"] = df["enrollment_count"].rolling(window=12).mean()
+    df["volatility"] = (df["rolling_std"] / df["rolling_mean"]) * 100
+    df["mom_change"] = df["enrollment_count"].pct_change() * 100
+    result = []
+    for _, row in df.iterrows():
+        if pd.notna(row["volatility"]):
+            result.append(
+                {
+                    "period": row["period"],
+                    "enrollment_count": int(row["enrollment_count"]),
+                    "volatility": float(row["volatility"]),
+                    "mom_change": float(row["mom_change"] or 0),
+                }
+            )
+    return result
+
+
+def row_by_row_growth(trends_data):
+    """Previous implementation of the growth rate histogram."""
+    df = pd.DataFrame(trends_data)
+    growth_rates = (df["enrollment_count"].pct_change() * 100).dropna()
+    hist, bin_edges = np.histogram(growth_rates, bins=np.linspace(growth_rates.min(), growth_rates.max(), 10))
+    distribution_data = []
+    for i in range(len(hist)):
+        distribution_data.append(
+            {
+                "bin_start": float(bin_edges[i]),
+                "bin_end": float(bin_edges[i + 1]),
+                "bin_center": float((bin_edges[i] + bin_edges[i + 1]) / 2),
+                "frequency": int(hist[i]),
+                "percentage": float(hist[i] / len(growth_rates) * 100),
+            }
+        )
+    return distribution_data
+
+
+def row_by_row_seasonal(trends_data):
+    """Previous implementation of the monthly and quarterly seasonal patterns."""
+    df = pd.DataFrame(trends_data)
+    df["period_date"] = pd.to_datetime(df["period"])
+    df["month"] = df["period_date"].dt.month
+    df["quarter"] = df["period_date"].dt.quarter
+    seasonal_data = []
+    for period_type, key in (("monthly", "month"), ("quarterly", "quarter")):
+        patterns = df.groupby(key).agg({"enrollment_count": ["mean", "std"], "retention_rate": "mean"}).reset_index()
+        patterns.columns = [key, "avg_enrollment", "std_enrollment", "avg_retention"]
+        for _, row in patterns.iterrows():
+            seasonal_data.append(
+                {
+                    "period_type": period_type,
+                    "period": int(row[key]),
+                    "avg_enrollment": int(row["avg_enrollment"]),
+                    "std_enrollment": float(row["std_enrollment"]),
+                    "avg_retention": float(row["avg_retention"]),
+                }
+            )
+    return seasonal_data
+
+
+def timed(func, repeat: int) -> float:
+    """Best wall time of ``repeat`` runs in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    districts = [f"District {i:02d}" for i in range(DISTRICTS)]
+    # Trends as they come back from the Redis cache, one entry per district
+    cached = [make_trends(seed).to_json() for seed in range(DISTRICTS)]
+    regional = make_regional(districts)
+    grades = make_grades(districts)
+
+    def shared_frame():
+        for payload in cached:
+            trends = analytics.normalize_trends(pd.read_json(StringIO(payload)))
+            analytics.enrollment_volatility(trends)
+            analytics.growth_rate_distribution(trends)
+            analytics.seasonal_patterns(trends)
+
+    def row_by_row():
+        # Each analytic called get_enrollment_trends again and got records back
+        for payload in cached:
+            row_by_row_volatility(pd.read_json(StringIO(payload)).to_dict("records"))
+            row_by_row_growth(pd.read_json(StringIO(payload)).to_dict("records"))
+            row_by_row_seasonal(pd.read_json(StringIO(payload)).to_dict("records"))
+
+    results = {
+        "volatility + growth + seasonal, shared frame": timed(shared_frame, args.repeat),
+        "volatility + growth + seasonal, row by row": timed(row_by_row, args.repeat),
+        "regional insights": timed(lambda: analytics.regional_insights(regional), args.repeat),
+        "grade transition rates": timed(lambda: analytics.grade_transition_rates(grades), args.repeat),
+    }
+
+    print(f"{DISTRICTS} districts x {YEARS * 12} months, best of {args.repeat}")
+    for name, ms in results.items():
+        print(f"  {name:<45} {ms:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
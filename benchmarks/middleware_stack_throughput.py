@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Middleware Stack Throughput Benchmark
+Drives requests one after another through the API's full security middleware
+stack in process, without a network or server in between, and reports
+requests per second, latency percentiles and the stack's overhead per request
+against the same app without middleware.
+
+The stack is the one ``setup_security_middleware`` installs: security
+headers, request validation, rate limiting, GZip, HTTPS redirect and trusted
+hosts. Rate limits are raised out of the way and Redis is not used unless
+RATE_LIMIT_* and REDIS_URL are set in the environment. Run it on two
+checkouts to compare builds.
+
+Usage: python benchmarks/middleware_stack_throughput.py [--duration 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+os.environ.setdefault("RATE_LIMIT_ANONYMOUS", "100000000/second")
+os.environ.setdefault("REDIS_URL", "")
+
+from fastapi import Body, FastAPI  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+
+# The API modules import each other from the source root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "bossnet"))
+
+from middleware.security_headers import setup_security_middleware  # noqa: E402
+
+STUDENT = {"student_id": "S-0001", "first_name": "Abdul", "last_name": "Rahim", "division": "Dhaka", "grade": 8}
+POST_BODY = json.dumps({"students": [STUDENT] * 10}).encode()
+
+# name: (method, path, body)
+REQUESTS = {
+    "GET json": ("GET", "/students", b""),
+    "GET stream": ("GET", "/export", b""),
+    "POST json 1KB": ("POST", "/students", POST_BODY),
+}
+
+
+def make_app(with_middleware: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/students")
+    async def list_students():
+        return STUDENT
+
+    @app.post("/students")
+    async def create_students(payload: dict = Body(...)):
+        return {"received": len(payload["students"])}
+
+    @app.get("/export")
+    async def export():
+        return StreamingResponse((b"S-0001,Abdul,Rahim\n" for _ in range(20)), media_type="text/csv")
+
+    if with_middleware:
+        setup_security_middleware(app)
+    return app
+
+
+async def call(app: FastAPI, method: str, path: str, body: bytes) -> int:
+    """Send one request through the ASGI app and return its status code."""
+    headers = [(b"host", b"testserver"), (b"accept-encoding", b"identity")]
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "https",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 1),
+        "server": ("testserver", 443),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
+
+
+async def drive(app: FastAPI, request, duration: float) -> Dict[str, float]:
+    """Issue the request back to back for ``duration`` seconds."""
+    assert await call(app, *request) == 200
+    latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await call(app, *request)
+        latencies.append(time.perf_counter() - started)
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": len(latencies) / sum(latencies),
+        "mean": statistics.fmean(latencies) * 1e6,
+        "p50": quantiles[49] * 1e6,
+        "p99": quantiles[98] * 1e6,
+    }
+
+
+async def run(duration: float):
+    apps = {"no middleware": make_app(False), "full stack": make_app(True)}
+    print(f"{duration:.0f}s per measurement")
+    print(f"{'request':<15} {'stack':<14} {'req/s':>8} {'p50 us':>8} {'p99 us':>8} {'overhead us':>12}")
+    for name, request in REQUESTS.items():
+        baseline = None
+        for label, app in apps.items():
+            result = await drive(app, request, duration)
+            baseline = baseline or result["mean"]
+            print(
+                f"{name:<15} {label:<14} {result['rps']:>8.0f} {result['p50']:>8.0f} {result['p99']:>8.0f} "
+                f"{result['mean'] - baseline:>12.0f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=5, help="Seconds per measurement")
+    args = parser.parse_args()
+    asyncio.run(run(args.duration))
+
+
+if __name__ == "__main__":
+    main()
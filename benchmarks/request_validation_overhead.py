@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Request Validation Overhead Benchmark
+Times POST requests with JSON bodies of about 1KB, 100KB and 1MB through an
+in-process app with and without RequestValidationMiddleware, and reports the
+middleware's overhead per request.
+
+Three setups are compared: no middleware; the middleware with the single
+combined pattern, scan limits and the body handed to the route; and the
+previous inspection, which lowercased every string, ran each pattern
+separately over the whole body and let the route parse the body again.
+
+Usage: python benchmarks/request_validation_overhead.py [--requests N]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from fastapi import APIRouter, Body, FastAPI
+
+# The API modules import each other from the source root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "bossnet"))
+
+from middleware.request_validation import ParsedBodyRoute, RequestValidationMiddleware  # noqa: E402
+
+SIZES = {"1KB": 1024, "100KB": 100 * 1024, "1MB": 1024 * 1024}
+
+
+class PreviousRequestValidationMiddleware(RequestValidationMiddleware):
+    """Previous inspection: one search per pattern over every lowercased string, without limits."""
+
+    patterns = [
+        re.compile(r"<script[^>]*>.*?</script>", re.IGNORECASE | re.DOTALL),
+        re.compile(
+            r"\b(?:select|insert|update|delete|drop|truncate|--|/\*|\*/|@@|@|char\(|or\s+1=1|waitfor\s+delay)\b",
+            re.IGNORECASE,
+        ),
+        re.compile(r"\b(?:document\.cookie|eval\(|alert\(|onload=|onerror=|onclick=)", re.IGNORECASE),
+        re.compile(r"\b(?:union\s+select|exec\s*\(|sp_|xp_|;--|/\*!|@@version)\b", re.IGNORECASE),
+    ]
+
+    def _check_dict_for_malicious_input(self, data: Any) -> bool:
+        if isinstance(data, dict):
+            return any(
+                self._is_malicious(str(key)) or self._check_dict_for_malicious_input(value) for key, value in data.items()
+            )
+        elif isinstance(data, (list, tuple)):
+            return any(self._check_dict_for_malicious_input(item) for item in data)
+        elif isinstance(data, str):
+            return self._is_malicious(data)
+        return False
+
+    def _is_malicious(self, input_str: str) -> bool:
+        if not input_str:
+            return False
+        input_lower = input_str.lower()
+        for pattern in self.patterns:
+            if pattern.search(input_lower):
+                return True
+        if re.search(r"\b(?:javascript|data|vbscript):", input_lower):
+            return True
+        if re.search(r"\bon\w+\s*=", input_lower):
+            return True
+        return False
+
+
+def make_body(size: int) -> bytes:
+    """JSON list of student-like records of about ``size`` bytes."""
+    record = {
+        "first_name": "Abdul",
+        "last_name": "Rahim",
+        "division": "Dhaka",
+        "district": "Gazipur",
+        "guardian": {"name": "Karim Uddin", "phone": "01711000000", "address": "House 12, Road 5, Tongi"},
+        "subjects": ["Bangla", "English", "Mathematics", "Science"],
+    }
+    record_size = len(json.dumps(record))
+    return json.dumps([{**record, "roll": index} for index in range(max(1, size // record_size))]).encode()
+
+
+def make_app(middleware=None, route_class=None) -> FastAPI:
+    router = APIRouter(route_class=route_class) if route_class else APIRouter()
+
+    @router.post("/students/import")
+    async def import_students(records: list = Body(...)):
+        return {"received": len(records)}
+
+    app = FastAPI()
+    app.include_router(router)
+    if middleware:
+        app.add_middleware(middleware)
+    return app
+
+
+async def call(app: FastAPI, body: bytes) -> int:
+    """Send one POST request through the ASGI app and return its status code."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/students/import",
+        "raw_path": b"/students/import",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 1),
+        "server": ("testserver", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
+
+
+async def time_requests(app: FastAPI, body: bytes, count: int) -> float:
+    """Mean time per request in microseconds."""
+    assert await call(app, body) == 200
+    started = time.perf_counter()
+    for _ in range(count):
+        await call(app, body)
+    return (time.perf_counter() - started) / count * 1e6
+
+
+async def run(requests: int):
+    apps = {
+        "none": make_app(),
+        "current": make_app(RequestValidationMiddleware, ParsedBodyRoute),
+        "previous": make_app(PreviousRequestValidationMiddleware),
+    }
+    print(f"{'body':>6} {'no middleware':>15} {'overhead':>12} {'previous overhead':>19}")
+    for label, size in SIZES.items():
+        body = make_body(size)
+        count = max(5, requests * 1024 // size) if size > 1024 else requests
+        timings = {name: await time_requests(app, body, count) for name, app in apps.items()}
+        print(
+            f"{label:>6} {timings['none']:>12.0f} us {timings['current'] - timings['none']:>9.0f} us "
+            f"{timings['previous'] - timings['none']:>16.0f} us"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per measurement for 1KB bodies")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Student List Serialization Benchmark
+Times how long an in-process app takes to turn a page of 1000 students into a
+JSON response, with the rows already loaded so only serialization is measured.
+
+Four ways of producing the list_students response are compared:
+  ORM + JSONResponse     the previous endpoint: ORM objects validated against the
+                         response model, dumped and encoded with json
+  ORM + ORJSONResponse   the same with orjson as the default response class
+  column tuples          model_validate on the selected columns of each row
+  row fast path          rows of the selected columns written out by rows_response
+
+The students table and StudentResponse are mirrored here, as the models
+package cannot be imported without a configured database.
+
+Usage: python benchmarks/student_list_serialization.py [--limit 1000] [--requests 50]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date, datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import List, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, EmailStr
+from sqlalchemy import Column, Date, DateTime, Integer, String, create_engine, select
+from sqlalchemy.orm import Session, declarative_base
+
+# The API modules import each other from the source root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "bossnet"))
+
+from api.responses import ORJSONResponse, rows_response  # noqa: E402
+
+Base = declarative_base()
+
+
+class Gender(str, Enum):
+    MALE = "male"
+    FEMALE = "female"
+    OTHER = "other"
+
+
+class StudentDB(Base):
+    __tablename__ = "students"
+
+    id = Column(Integer, primary_key=True)
+    student_id = Column(String(50), nullable=False)
+    first_name = Column(String(100), nullable=False)
+    last_name = Column(String(100), nullable=False)
+    date_of_birth = Column(Date, nullable=False)
+    gender = Column(String(10), nullable=False)
+    email = Column(String(255))
+    phone = Column(String(20))
+    address = Column(String(255))
+    city = Column(String(100))
+    district = Column(String(100))
+    division = Column(String(100))
+    postal_code = Column(String(20))
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+
+
+class StudentResponse(BaseModel):
+    student_id: str
+    first_name: str
+    last_name: str
+    date_of_birth: date
+    gender: Gender
+    email: Optional[EmailStr] = None
+    phone: Optional[str] = None
+    address: Optional[str] = None
+    city: Optional[str] = None
+    district: Optional[str] = None
+    division: Optional[str] = None
+    postal_code: Optional[str] = None
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+
+class PaginatedStudentResponse(BaseModel):
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    limit: int
+    next_cursor: Optional[str] = None
+    items: List[StudentResponse]
+
+
+FIELDS = tuple(StudentResponse.model_fields)
+COLUMNS = [getattr(StudentDB, field) for field in FIELDS]
+
+
+def load_students(count: int):
+    """Load ``count`` students both as ORM objects and as rows of the response columns."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    now = datetime.now(timezone.utc)
+    session.add_all(
+        StudentDB(
+            student_id=f"STU{index:08d}",
+            first_name="Abdul",
+            last_name=f"Rahim {index}",
+            date_of_birth=date(2010, 1 + index % 12, 1 + index % 28),
+            gender=("male", "female")[index % 2],
+            email=f"student{index}@example.com",
+            phone="+8801712345678",
+            address="House 12, Road 5",
+            city="Tongi",
+            district="Gazipur",
+            division="Dhaka",
+            postal_code="1710",
+            created_at=now,
+            updated_at=now if index % 3 else None,
+        )
+        for index in range(count)
+    )
+    session.commit()
+    objects = session.execute(select(StudentDB).order_by(StudentDB.id)).scalars().all()
+    rows = session.execute(select(*COLUMNS).order_by(StudentDB.id)).all()
+    return objects, rows
+
+
+def make_apps(objects, rows, limit: int):
+    envelope = {"total": None, "total_is_estimate": False, "limit": limit, "next_cursor": "eyJzIjoiaWQ6YXNjIn0"}
+    apps = {}
+    for name, response_class in (("ORM + JSONResponse", JSONResponse), ("ORM + ORJSONResponse", ORJSONResponse)):
+        app = FastAPI(default_response_class=response_class)
+
+        @app.get("/students", response_model=PaginatedStudentResponse)
+        async def list_orm():
+            return {**envelope, "items": objects}
+
+        apps[name] = app
+
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.get("/students", response_model=PaginatedStudentResponse)
+    async def list_validated():
+        return {**envelope, "items": [StudentResponse.model_validate(row) for row in rows]}
+
+    apps["column tuples"] = app
+
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.get("/students", response_model=PaginatedStudentResponse)
+    async def list_rows():
+        return rows_response(rows, FIELDS, **envelope)
+
+    apps["row fast path"] = app
+    return apps
+
+
+async def call(app: FastAPI) -> bytes:
+    """Send one GET request through the ASGI app and return the response body."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/students",
+        "raw_path": b"/students",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 1),
+        "server": ("testserver", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def time_requests(app: FastAPI, count: int) -> float:
+    """Mean time per request in milliseconds."""
+    await call(app)
+    started = time.perf_counter()
+    for _ in range(count):
+        await call(app)
+    return (time.perf_counter() - started) / count * 1000
+
+
+async def run(limit: int, requests: int):
+    objects, rows = load_students(limit)
+    apps = make_apps(objects, rows, limit)
+    bodies = {name: PaginatedStudentResponse.model_validate_json(await call(app)) for name, app in apps.items()}
+    assert all(body == bodies["ORM + JSONResponse"] for body in bodies.values()), "responses differ"
+
+    print(f"{limit} students per page, {requests} requests each")
+    print(f"{'response':<22} {'ms/request':>11} {'speedup':>8}")
+    baseline = None
+    for name, app in apps.items():
+        elapsed = await time_requests(app, requests)
+        baseline = baseline or elapsed
+        print(f"{name:<22} {elapsed:>11.2f} {baseline / elapsed:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=1000, help="Students per page")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per measurement")
+    args = parser.parse_args()
+    asyncio.run(run(args.limit, args.requests))
+
+
+if __name__ == "__main__":
+    main()
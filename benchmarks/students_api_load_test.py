@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Students API Load Test
+Drives the student endpoints of a running API from many concurrent clients
+and reports throughput and latency percentiles.
+
+Each client loops over a mix of list and detail requests for the duration of
+the run. Pass several ``--target`` options to compare servers side by side,
+for example the same build before and after a change:
+
+Usage: python benchmarks/students_api_load_test.py --target before=http://localhost:8001 --target after=http://localhost:8000
+       [--username admin --password secret | --token JWT] [--concurrency 100] [--duration 30]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+STUDENTS_PATH = "/api/v1/api/students/"
+TOKEN_PATH = "/api/v1/auth/token"
+
+
+async def get_token(client: httpx.AsyncClient, username: str, password: str) -> str:
+    """Log in and get a bearer token."""
+    response = await client.post(TOKEN_PATH, data={"username": username, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def sample_student_ids(client: httpx.AsyncClient, count: int = 100) -> List[str]:
+    """Get student IDs to request details for."""
+    response = await client.get(STUDENTS_PATH, params={"limit": count})
+    response.raise_for_status()
+    return [item["student_id"] for item in response.json()["items"]]
+
+
+async def run_client(
+    client: httpx.AsyncClient,
+    student_ids: List[str],
+    page_size: int,
+    deadline: float,
+    latencies: Dict[str, List[float]],
+    errors: Dict[str, int],
+):
+    """Issue requests back to back until the deadline, alternating list and detail calls."""
+    while time.perf_counter() < deadline:
+        if student_ids and random.random() < 0.5:
+            name, path, params = "read", f"{STUDENTS_PATH}{random.choice(student_ids)}", None
+        else:
+            name, path, params = "list", STUDENTS_PATH, {"skip": random.randint(0, 10) * page_size, "limit": page_size}
+
+        started = time.perf_counter()
+        try:
+            response = await client.get(path, params=params)
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            latencies[name].append(time.perf_counter() - started)
+        else:
+            errors[name] += 1
+
+
+async def load_test(
+    url: str, token: Optional[str], username: str, password: str, concurrency: int, duration: float, page_size: int
+) -> Tuple[float, Dict[str, List[float]], Dict[str, int]]:
+    """Run the load test against one server and get the elapsed time, latencies and errors per request kind."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        if token is None:
+            token = await get_token(client, username, password)
+        client.headers["Authorization"] = f"Bearer {token}"
+        student_ids = await sample_student_ids(client)
+
+        latencies: Dict[str, List[float]] = {"list": [], "read": []}
+        errors = {"list": 0, "read": 0}
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(
+            *(run_client(client, student_ids, page_size, deadline, latencies, errors) for _ in range(concurrency))
+        )
+        return time.perf_counter() - started, latencies, errors
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000
+
+
+def report(label: str, elapsed: float, latencies: Dict[str, List[float]], errors: Dict[str, int]) -> float:
+    """Print the results of one server and get its overall requests per second."""
+    total = sum(len(values) for values in latencies.values())
+    throughput = total / elapsed
+    print(f"\n{label}: {throughput:.1f} req/s ({total} ok, {sum(errors.values())} errors in {elapsed:.1f}s)")
+    print(f"  {'endpoint':<8} {'requests':>9} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, values in latencies.items():
+        if values:
+            print(
+                f"  {name:<8} {len(values):>9} {statistics.mean(values) * 1000:>9.1f} "
+                f"{percentile(values, 50):>9.1f} {percentile(values, 99):>9.1f} {errors[name]:>7}"
+            )
+        else:
+            print(f"  {name:<8} {0:>9} {'-':>9} {'-':>9} {'-':>9} {errors[name]:>7}")
+    return throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the student API endpoints")
+    parser.add_argument(
+        "--target",
+        action="append",
+        default=[],
+        metavar="LABEL=URL",
+        help="Server to test, repeatable (default: current=http://localhost:8000)",
+    )
+    parser.add_argument("--token", help="Bearer token to use instead of logging in")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--concurrency", type=int, default=100, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run against each server")
+    parser.add_argument("--page-size", type=int, default=50, help="Page size of list requests")
+    args = parser.parse_args()
+
+    targets = [target.split("=", 1) if "=" in target else (target, target) for target in args.target]
+    if not targets:
+        targets = [("current", "http://localhost:8000")]
+
+    print(f"{args.concurrency} concurrent clients, {args.duration:.0f}s per server")
+    results = []
+    for label, url in targets:
+        elapsed, latencies, errors = asyncio.run(
+            load_test(url, args.token, args.username, args.password, args.concurrency, args.duration, args.page_size)
+        )
+        results.append((label, report(f"{label} ({url})", elapsed, latencies, errors)))
+
+    if len(results) > 1:
+        baseline_label, baseline = results[0]
+        print()
+        for label, throughput in results[1:]:
+            print(f"{label} vs {baseline_label}: {throughput / baseline:.2f}x requests/sec")
+
+
+if __name__ == "__main__":
+    main()
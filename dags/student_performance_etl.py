@@ -351,5 +351,12 @@ clear_cache_task = PythonOperator(
     dag=dag,
 )
 
+# Refill the enrollment forecast cache cleared above, so dashboard requests are cache hits
+precompute_forecasts_task = BashOperator(
+    task_id="precompute_forecasts",
+    bash_command="cd /app && python scripts/precompute_forecasts.py",
+    dag=dag,
+)
+
 # Define task dependencies
-extract_task >> transform_task >> load_task >> dbt_task >> validate_task >> clear_cache_task
+extract_task >> transform_task >> load_task >> dbt_task >> validate_task >> clear_cache_task >> precompute_forecasts_task
@@ -0,0 +1,253 @@
+"""
+Data Change Feed for the Dashboards
+Pushes data version changes to dashboard servers instead of polling the database.
+
+Writers bump a data version when dashboard data changes: the Postgres triggers
+of the ``performance_data`` lookup version send ``NOTIFY`` with the new
+version, and loaders that write elsewhere call :func:`publish_data_version`,
+which publishes it on Redis. Each dashboard process keeps one listener that
+tracks the latest version, and results are computed once per version and
+shared by every connected client.
+"""
+
+import logging
+import os
+import select
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+# "postgres" listens for NOTIFY, "redis" subscribes to the pub/sub channel
+CHANGE_FEED_BACKEND = os.getenv("DASHBOARD_CHANGE_FEED", "postgres")
+
+# Seconds between keep-alive wakeups of waiting subscribers
+HEARTBEAT_SECONDS = 15
+
+
+def redis_version_key(name: str) -> str:
+    """Redis key holding the current version of a dataset."""
+    return f"dashboard:data_version:{name}"
+
+
+# Current version of a dataset, bumped by the triggers of the tables it reads
+DATA_VERSION_QUERY = "SELECT version FROM lookup_versions WHERE name = %s"
+
+
+def redis_channel(name: str) -> str:
+    """Redis pub/sub channel announcing new versions of a dataset."""
+    return f"dashboard:data_changed:{name}"
+
+
+def publish_data_version(name: str, redis_client) -> Optional[int]:
+    """Bump the version of a dataset and announce it to the dashboards over Redis.
+
+    For loaders that do not write through the tables whose triggers notify
+    Postgres listeners. Returns the new version, or None when Redis is down.
+    """
+    if not redis_client:
+        return None
+    try:
+        version = int(redis_client.incr(redis_version_key(name)))
+        redis_client.publish(redis_channel(name), version)
+        return version
+    except Exception as e:
+        logger.error(f"Error publishing {name} data version: {e}")
+        return None
+
+
+class DataVersionFeed:
+    """Tracks the latest version of a dataset from its change notifications.
+
+    A single daemon thread per feed holds the LISTEN connection or the Redis
+    subscription, so the number of database connections does not grow with
+    the number of dashboard clients. The listener reconnects with backoff;
+    while it is down the version stays at its last known value.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        backend: str = CHANGE_FEED_BACKEND,
+        database_url: Optional[str] = None,
+        redis_client=None,
+    ):
+        self.name = name
+        self.backend = backend
+        self.database_url = database_url
+        self.redis_client = redis_client
+        self._version = 0
+        # Whether a version was read or notified yet, as 0 is also a valid version
+        self.synced = False
+        self._changed = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> int:
+        """The latest known data version."""
+        return self._version
+
+    def start(self) -> "DataVersionFeed":
+        """Start the listener thread unless it is running, e.g. again in a forked worker."""
+        if self._thread is None or not self._thread.is_alive():
+            target = self._listen_redis if self.backend == "redis" else self._listen_postgres
+            self._thread = threading.Thread(target=self._run, args=(target,), name=f"{self.name}-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def set_version(self, version: int):
+        """Record a version and wake waiting subscribers if it is newer."""
+        with self._changed:
+            self.synced = True
+            if version > self._version:
+                self._version = version
+                self._changed.notify_all()
+
+    def wait_for_change(self, known_version: int, timeout: float = HEARTBEAT_SECONDS) -> int:
+        """Block until the version differs from ``known_version`` or the timeout passes; return the version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self._version != known_version, timeout=timeout)
+            return self._version
+
+    def wait_for_version(self, version: int, timeout: float) -> int:
+        """Block until the version is at least ``version`` or the timeout passes; return the version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self._version >= version, timeout=timeout)
+            return self._version
+
+    def read_version(self) -> int:
+        """Read the current version from Postgres or Redis right away, e.g. before warming caches.
+
+        Keeps the last known version when it cannot be read.
+        """
+        try:
+            if self.backend == "redis":
+                current = self.redis_client.get(redis_version_key(self.name)) if self.redis_client else None
+            else:
+                connection = self._connect_postgres()
+                try:
+                    with connection.cursor() as cursor:
+                        current = self._postgres_version(cursor)
+                finally:
+                    connection.close()
+            if current is not None:
+                self.set_version(int(current))
+        except Exception as e:
+            logger.warning(f"Could not read the {self.name} data version: {e}")
+        return self._version
+
+    def _run(self, listen: Callable[[], None]):
+        backoff = 1
+        while True:
+            try:
+                listen()
+                backoff = 1
+            except Exception as e:
+                logger.warning(f"{self.name} change feed disconnected: {e}")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+
+    def _connect_postgres(self):
+        import psycopg2
+
+        # libpq does not understand SQLAlchemy driver suffixes such as "postgresql+psycopg"
+        dsn = make_url(self.database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        connection = psycopg2.connect(dsn)
+        connection.autocommit = True
+        return connection
+
+    def _postgres_version(self, cursor) -> Optional[int]:
+        # The row is updated by the writing transaction, so its version is only seen once the change commits
+        cursor.execute(DATA_VERSION_QUERY, (self.name,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def _listen_postgres(self):
+        connection = self._connect_postgres()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.name}"')
+                current = self._postgres_version(cursor)
+                if current is not None:
+                    self.set_version(int(current))
+
+            while True:
+                if select.select([connection], [], [], HEARTBEAT_SECONDS) == ([], [], []):
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    notify = connection.notifies.pop(0)
+                    self.set_version(int(notify.payload))
+        finally:
+            connection.close()
+
+    def _listen_redis(self):
+        if not self.redis_client:
+            raise ConnectionError("Redis is not configured")
+
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(redis_channel(self.name))
+            current = self.redis_client.get(redis_version_key(self.name))
+            if current is not None:
+                self.set_version(int(current))
+
+            for message in pubsub.listen():
+                self.set_version(int(message["data"]))
+        finally:
+            pubsub.close()
+
+
+class VersionedResults:
+    """Results computed at most once per data version and shared between clients.
+
+    Keeps the latest version of each result, for a bounded number of keys.
+    Concurrent requests for the same key and version wait for the one
+    computation instead of each running the query.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._results: "OrderedDict[Hashable, Tuple[int, Any]]" = OrderedDict()
+        self._key_locks: "dict[Hashable, threading.Lock]" = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, key: Hashable, version: int) -> Optional[Tuple[int, Any]]:
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None and entry[0] == version:
+                self._results.move_to_end(key)
+                return entry
+            return None
+
+    def get(self, key: Hashable, version: int, compute: Callable[[], Any], refresh: bool = False) -> Any:
+        """Get the result for ``key`` at ``version``, computing it only if nobody has yet.
+
+        ``refresh`` recomputes even when the version is unchanged, e.g. on an
+        explicit refresh while the change feed is down.
+        """
+        if not refresh:
+            entry = self._cached(key, version)
+            if entry is not None:
+                return entry[1]
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            entry = None if refresh else self._cached(key, version)
+            if entry is not None:
+                return entry[1]
+
+            result = compute()
+            with self._lock:
+                self._results[key] = (version, result)
+                self._results.move_to_end(key)
+                while len(self._results) > self.max_entries:
+                    evicted, _ = self._results.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+            return result
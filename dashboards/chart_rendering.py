@@ -0,0 +1,176 @@
+"""
+Chart Rendering Strategy for the Dashboards
+Server-side downsampling and WebGL trace selection for large charts.
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+logger = logging.getLogger(__name__)
+
+# Traces drawing more points than this use WebGL instead of SVG
+WEBGL_THRESHOLD = int(os.getenv("DASHBOARD_WEBGL_THRESHOLD", "1000"))
+
+# Points sent to the browser per chart before downsampling kicks in
+DEFAULT_POINT_BUDGET = int(os.getenv("DASHBOARD_POINT_BUDGET", "2000"))
+
+
+def _parse_point_budgets(value: str) -> Dict[str, int]:
+    """Parse ``chart=budget`` pairs such as ``"time_series_analysis=5000,performance_distribution=1000"``."""
+    budgets = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        chart, _, budget = item.partition("=")
+        try:
+            budgets[chart.strip()] = int(budget)
+        except ValueError:
+            logger.warning(f"Ignoring invalid point budget: {item}")
+    return budgets
+
+
+# Per-chart overrides of the default point budget
+CHART_POINT_BUDGETS = _parse_point_budgets(os.getenv("DASHBOARD_POINT_BUDGETS", ""))
+
+
+def point_budget(chart: str, override: Optional[int] = None) -> int:
+    """Get the point budget of a chart: an explicit override, its configured budget, or the default."""
+    if override:
+        return override
+    return CHART_POINT_BUDGETS.get(chart, DEFAULT_POINT_BUDGET)
+
+
+def _numeric_positions(x: Sequence) -> np.ndarray:
+    """Get numeric x positions for area computations; non-numeric axes use the point order."""
+    values = np.asarray(x)
+    if np.issubdtype(values.dtype, np.number):
+        return values.astype("float64")
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype("int64").astype("float64")
+    return np.arange(len(values), dtype="float64")
+
+
+def lttb_indices(x: Sequence, y: Sequence, n_out: int) -> np.ndarray:
+    """Select ``n_out`` points of a series with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. Between them the series is
+    split into ``n_out - 2`` buckets and each bucket keeps the point forming
+    the largest triangle with the previously kept point and the average of
+    the next bucket, which preserves the visual shape of the line.
+    """
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = _numeric_positions(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], max(edges[bucket + 1], edges[bucket] + 1)
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], max(edges[bucket + 2], edges[bucket + 1] + 1)
+            next_x, next_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous]) - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    return selected
+
+
+def downsample_indices(x: Sequence, y: Sequence, budget: int) -> np.ndarray:
+    """LTTB-downsample a series to about ``budget`` points, always keeping its minimum and maximum."""
+    y = np.asarray(y, dtype="float64")
+    if len(y) <= budget:
+        return np.arange(len(y))
+
+    selected = lttb_indices(x, y, max(budget - 2, 3))
+    extremes = [int(np.nanargmin(y)), int(np.nanargmax(y))]
+    return np.union1d(selected, extremes)
+
+
+def scatter_trace(x: Sequence, y: Sequence, budget: Optional[int] = None, **kwargs) -> go.Scatter:
+    """Build a scatter/line trace, downsampled to ``budget`` points and drawn with WebGL when large."""
+    x, y = np.asarray(x), np.asarray(y)
+    budget = budget or DEFAULT_POINT_BUDGET
+    if len(y) > budget:
+        keep = downsample_indices(x, y, budget)
+        x, y = x[keep], y[keep]
+
+    trace_type = go.Scattergl if len(y) > WEBGL_THRESHOLD else go.Scatter
+    return trace_type(x=x, y=y, **kwargs)
+
+
+def _spread_sample(values: np.ndarray, size: int) -> np.ndarray:
+    """Evenly spaced order statistics of ``values`` including the minimum and maximum."""
+    if len(values) <= size:
+        return values
+    ordered = np.sort(values)
+    return ordered[np.unique(np.linspace(0, len(ordered) - 1, size).astype(np.int64))]
+
+
+def box_traces(values: Sequence, name: Any, budget: Optional[int] = None, **kwargs) -> List[Any]:
+    """Build box plot traces for one group.
+
+    Small groups are sent as raw values. Larger ones send only precomputed
+    quartiles and fences plus a downsampled set of outliers that keeps the
+    most extreme values, so the browser never receives every point.
+    """
+    values = pd.Series(values, dtype="float64").dropna().to_numpy()
+    budget = budget or DEFAULT_POINT_BUDGET
+    if len(values) <= budget:
+        return [go.Box(y=values, name=name, boxpoints="outliers", **kwargs)]
+
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    outliers = _spread_sample(values[(values < inside.min()) | (values > inside.max())], budget)
+
+    traces = [
+        go.Box(
+            x=[name],
+            q1=[q1],
+            median=[median],
+            q3=[q3],
+            lowerfence=[inside.min()],
+            upperfence=[inside.max()],
+            mean=[values.mean()],
+            name=name,
+            boxpoints=False,
+            **kwargs,
+        )
+    ]
+    if len(outliers):
+        marker_type = go.Scattergl if len(outliers) > WEBGL_THRESHOLD else go.Scatter
+        traces.append(
+            marker_type(x=[name] * len(outliers), y=outliers, mode="markers", name=name, showlegend=False, marker=dict(size=4))
+        )
+    return traces
+
+
+def box_figure(df: pd.DataFrame, x: str, y: str, budget: Optional[int] = None, **layout) -> go.Figure:
+    """Box plot of ``y`` per ``x`` group that stays light on the client for large frames.
+
+    The point budget is shared between the groups.
+    """
+    budget = budget or DEFAULT_POINT_BUDGET
+    groups = [(name, group[y]) for name, group in df.groupby(x, sort=False) if pd.notna(name)]
+    group_budget = max(budget // max(len(groups), 1), 1)
+
+    fig = go.Figure()
+    for name, values in groups:
+        for trace in box_traces(values, name, group_budget):
+            fig.add_trace(trace)
+    fig.update_layout(showlegend=False, **layout)
+    return fig
@@ -0,0 +1,120 @@
+"""
+Search Index for the Demographic Insights Dashboard
+Prebuilt trigram and prefix index over the text columns of the detail table.
+"""
+
+import bisect
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Columns indexed for detail table search: the student ID and every text column the table shows
+SEARCH_COLUMNS = [
+    "student_name",
+    "student_code",
+    "gender",
+    "school_name",
+    "school_type",
+    "division",
+    "district",
+    "performance_category",
+]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(value: str) -> str:
+    """Normalize text for indexing and querying: casefold and collapse whitespace."""
+    return _WHITESPACE.sub(" ", str(value).casefold()).strip()
+
+
+def trigrams(value: str) -> set:
+    """Get the set of character trigrams of a normalized string."""
+    return {value[i : i + 3] for i in range(len(value) - 2)}
+
+
+class StudentSearchIndex:
+    """In-memory search index over the text columns of a demographics frame.
+
+    Queries of three or more characters are answered from a trigram inverted
+    index: the posting lists of the query's trigrams are intersected and the
+    few surviving candidates are verified with a substring check. Shorter
+    queries use a sorted token list and match word prefixes with a binary
+    search. Both paths avoid converting or scanning every cell per keystroke.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Sequence[str] = SEARCH_COLUMNS):
+        self.columns = [col for col in columns if col in df.columns]
+        self.row_ids = df.index.to_numpy()
+
+        # One normalized document per row, fields separated so that a match
+        # cannot span two columns.
+        documents = [""] * len(df)
+        for col in self.columns:
+            values = df[col].fillna("").astype(str).tolist()
+            documents = [f"{doc}\x1f{normalize(value)}" if doc else normalize(value) for doc, value in zip(documents, values)]
+        self.documents = documents
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+        tokens: List[Tuple[str, int]] = []
+        for position, document in enumerate(documents):
+            for gram in trigrams(document):
+                postings[gram].append(position)
+            for token in set(re.split(r"[\s\x1f]+", document)):
+                if token:
+                    tokens.append((token, position))
+
+        self.postings = {gram: np.asarray(rows, dtype=np.int64) for gram, rows in postings.items()}
+        tokens.sort()
+        self.tokens = [token for token, _ in tokens]
+        self.token_rows = np.asarray([position for _, position in tokens], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _candidate_positions(self, query: str) -> np.ndarray:
+        """Get row positions matching a normalized query, in index order."""
+        if len(query) < 3:
+            start = bisect.bisect_left(self.tokens, query)
+            end = bisect.bisect_left(self.tokens, query + "\uffff")
+            return np.unique(self.token_rows[start:end])
+
+        grams = trigrams(query)
+        lists = [self.postings.get(gram) for gram in grams]
+        if any(rows is None for rows in lists):
+            return np.empty(0, dtype=np.int64)
+
+        lists.sort(key=len)
+        candidates = lists[0]
+        for rows in lists[1:]:
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+            if not len(candidates):
+                return candidates
+
+        # Trigrams only prove the query's pieces occur; confirm the whole string does.
+        return np.asarray([pos for pos in candidates if query in self.documents[pos]], dtype=np.int64)
+
+    def search(self, query: str, limit: Optional[int] = None, offset: int = 0) -> Tuple[np.ndarray, int]:
+        """Search the index.
+
+        Returns a ``(row_ids, total)`` tuple where ``row_ids`` are the index
+        labels of the requested page of matches and ``total`` is the number of
+        matches across all pages.
+        """
+        query = normalize(query)
+        if not query:
+            positions = np.arange(len(self.documents))
+        else:
+            positions = self._candidate_positions(query)
+
+        total = len(positions)
+        end = None if limit is None else offset + limit
+        return self.row_ids[positions[offset:end]], total
+
+    def search_within(self, query: str, row_ids: Iterable) -> np.ndarray:
+        """Get the row ids among ``row_ids`` that match ``query``, in index order."""
+        matches, _ = self.search(query)
+        return matches[np.isin(matches, np.asarray(row_ids))]
@@ -0,0 +1,212 @@
+"""
+Enrollment Analytics for the Enrollment Trends Dashboard
+Vectorized computations over columnar enrollment frames.
+"""
+
+import calendar
+import re
+from typing import Any, Dict, List, Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Columns of the shared enrollment trends frame, one row per period
+TRENDS_COLUMNS = ["period", "enrollment_count", "unique_students", "active_schools", "retention_rate"]
+
+PUBLIC_SCHOOL_TYPES = ["Government Primary", "Government Secondary", "Madrasa"]
+
+FrameLike = Union[pd.DataFrame, List[Dict[str, Any]]]
+
+_TRAILING_NUMBER = re.compile(r"(\d+)\s*$")
+
+
+def as_frame(data: FrameLike) -> pd.DataFrame:
+    """Get a DataFrame from a frame or a list of records without copying frames."""
+    return data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+
+
+def normalize_trends(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize a raw trends query result to ``TRENDS_COLUMNS`` with native dtypes."""
+    if "period_label" in df.columns:
+        df = df.drop(columns="period").rename(columns={"period_label": "period"})
+    if df.empty:
+        return pd.DataFrame(columns=TRENDS_COLUMNS)
+
+    return pd.DataFrame(
+        {
+            "period": df["period"].astype(str),
+            "enrollment_count": df["enrollment_count"].astype("int64"),
+            "unique_students": df["unique_students"].astype("int64"),
+            "active_schools": df["active_schools"].astype("int64"),
+            "retention_rate": df["retention_rate"].astype("float64"),
+        }
+    ).reset_index(drop=True)
+
+
+def enrollment_volatility(trends: FrameLike, window: int = 12) -> List[Dict[str, Any]]:
+    """Rolling coefficient of variation and period-over-period change of enrollment."""
+    df = as_frame(trends)
+    if len(df) < window:
+        return []
+
+    counts = df["enrollment_count"].to_numpy(dtype="float64")
+    windows = sliding_window_view(counts, window)
+    volatility = windows.std(axis=1, ddof=1) / windows.mean(axis=1) * 100
+    mom_change = np.diff(counts[window - 2 :]) / counts[window - 2 : -1] * 100 if window > 1 else np.zeros(len(counts))
+
+    return pd.DataFrame(
+        {
+            "period": df["period"].to_numpy()[window - 1 :],
+            "enrollment_count": counts[window - 1 :].astype("int64"),
+            "volatility": volatility,
+            "mom_change": mom_change,
+        }
+    ).to_dict("records")
+
+
+def growth_rate_distribution(trends: FrameLike, bins: int = 10) -> List[Dict[str, Any]]:
+    """Histogram of period-over-period growth rates."""
+    df = as_frame(trends)
+    if len(df) < 2:
+        return []
+
+    counts = df["enrollment_count"].to_numpy(dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth_rates = np.diff(counts) / counts[:-1] * 100
+    growth_rates = growth_rates[~np.isnan(growth_rates)]
+    if len(growth_rates) == 0:
+        return []
+
+    hist, bin_edges = np.histogram(growth_rates, bins=np.linspace(growth_rates.min(), growth_rates.max(), bins))
+    return pd.DataFrame(
+        {
+            "bin_start": bin_edges[:-1],
+            "bin_end": bin_edges[1:],
+            "bin_center": (bin_edges[:-1] + bin_edges[1:]) / 2,
+            "frequency": hist.astype("int64"),
+            "percentage": hist / len(growth_rates) * 100,
+        }
+    ).to_dict("records")
+
+
+def _grouped_stats(keys: np.ndarray, size: int, enrollment: np.ndarray, retention: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per-key mean and sample standard deviation of enrollment and mean retention, keys in ``1..size``."""
+    n = np.bincount(keys, minlength=size + 1)[1:].astype("float64")
+    total = np.bincount(keys, weights=enrollment, minlength=size + 1)[1:]
+    squares = np.bincount(keys, weights=enrollment**2, minlength=size + 1)[1:]
+    retention_total = np.bincount(keys, weights=retention, minlength=size + 1)[1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / n
+        std = np.sqrt(np.maximum(squares - n * mean**2, 0) / (n - 1))
+        std[n < 2] = np.nan
+        return {"present": n > 0, "avg_enrollment": mean, "std_enrollment": std, "avg_retention": retention_total / n}
+
+
+def seasonal_patterns(trends: FrameLike) -> List[Dict[str, Any]]:
+    """Average enrollment and retention by calendar month and by quarter."""
+    df = as_frame(trends)
+    if df.empty:
+        return []
+
+    months = pd.to_datetime(df["period"]).dt.month.to_numpy()
+    enrollment = df["enrollment_count"].to_numpy(dtype="float64")
+    retention = df["retention_rate"].to_numpy(dtype="float64")
+
+    frames = []
+    for period_type, keys, names in (
+        ("monthly", months, list(calendar.month_name)[1:]),
+        ("quarterly", (months - 1) // 3 + 1, ["Q1", "Q2", "Q3", "Q4"]),
+    ):
+        stats = _grouped_stats(keys, len(names), enrollment, retention)
+        present = stats.pop("present")
+        frames.append(
+            pd.DataFrame(
+                {
+                    "period_type": period_type,
+                    "period": np.arange(1, len(names) + 1)[present],
+                    "period_name": np.asarray(names)[present],
+                    "avg_enrollment": stats["avg_enrollment"][present].astype("int64"),
+                    "std_enrollment": stats["std_enrollment"][present],
+                    "avg_retention": stats["avg_retention"][present],
+                }
+            )
+        )
+
+    return pd.concat(frames, ignore_index=True).to_dict("records")
+
+
+def regional_insights(regional: FrameLike) -> Dict[str, Any]:
+    """Top and bottom growing regions in the latest year and the spread between regions."""
+    df = as_frame(regional)
+    if df.empty:
+        return {}
+
+    latest_data = df[df["year"] == df["year"].max()]
+    growth_rates = latest_data["growth_rate"].to_numpy(dtype=float)
+    top, lowest = latest_data.iloc[growth_rates.argmax()], latest_data.iloc[growth_rates.argmin()]
+
+    mean_growth, std_growth = growth_rates.mean(), growth_rates.std()
+    return {
+        "top_region": top["division"],
+        "top_growth": float(top["growth_rate"]),
+        "lowest_region": lowest["division"],
+        "lowest_growth": float(lowest["growth_rate"]),
+        "variation": float(std_growth / mean_growth * 100) if mean_growth != 0 else 0.0,
+        "std_dev": float(std_growth),
+    }
+
+
+def grade_order_key(grades: pd.Index) -> pd.Index:
+    """Sort key ordering grades by their trailing number ("Class 2" before "Class 10")."""
+    numbers = grades.astype(str).str.extract(_TRAILING_NUMBER, expand=False).astype("float64")
+    return pd.Index(numbers.fillna(np.inf))
+
+
+def grade_transition_rates(grades: FrameLike) -> List[Dict[str, Any]]:
+    """Ratio of enrollment in each grade to the grade below it in the latest year."""
+    df = as_frame(grades)
+    if df.empty:
+        return []
+
+    latest_year = df["year"].max()
+    totals = (
+        df[df["year"] == latest_year]
+        .groupby("grade_level")["enrollment_count"]
+        .sum()
+        .reindex(df["grade_level"].unique(), fill_value=0)
+    )
+    totals = totals.sort_index(key=grade_order_key)
+    if len(totals) < 2:
+        return []
+
+    current_enrollment = totals.to_numpy()[:-1]
+    next_enrollment = totals.to_numpy()[1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = np.where(current_enrollment > 0, next_enrollment / current_enrollment * 100, 0.0)
+
+    return pd.DataFrame(
+        {
+            "from_grade": totals.index[:-1],
+            "to_grade": totals.index[1:],
+            "transition_rate": np.minimum(rates, 100.0),  # Cap at 100%
+            "current_enrollment": current_enrollment.astype("int64"),
+            "next_enrollment": next_enrollment.astype("int64"),
+        }
+    ).to_dict("records")
+
+
+def public_private_trends(school_types: FrameLike) -> List[Dict[str, Any]]:
+    """Enrollment totals per year for public and private schools."""
+    df = as_frame(school_types)
+    if df.empty:
+        return []
+
+    category = np.where(df["school_type"].isin(PUBLIC_SCHOOL_TYPES), "Public", "Private")
+    return (
+        df.assign(category=category)
+        .groupby(["year", "category"], as_index=False)[["enrollment_count", "unique_students", "school_count"]]
+        .sum()
+        .astype({"year": "int64", "enrollment_count": "int64", "unique_students": "int64", "school_count": "int64"})
+        .to_dict("records")
+    )
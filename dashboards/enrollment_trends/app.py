@@ -26,6 +26,7 @@ sys.path.insert(0, str(project_root))
 
 # Import services
 from dashboards.enrollment_trends.data_service import EnrollmentDataService
+from dashboards.enrollment_trends.report_jobs import report_jobs
 from dashboards.enrollment_trends.visualization_service import EnrollmentVisualizationService
 
 # Configure logging
@@ -664,9 +665,10 @@ class EnrollmentTrendsDashboard:
         with col3:
             forecast_method = st.selectbox(
                 "Forecasting Method",
-                options=["ARIMA", "Exponential Smoothing", "Linear Trend", "Seasonal Decomposition"],
+                options=["ARIMA", "Exponential Smoothing", "Linear Trend", "Seasonal Decomposition", "Auto"],
                 index=0,
                 key="forecast_method",
+                help="Auto backtests every method and uses the fastest one with adequate accuracy",
             )
 
         # Generate forecast
@@ -691,7 +693,7 @@ class EnrollmentTrendsDashboard:
                             f"""
                         <div class="insight-box">
                             <h4>📊 Forecast Summary</h4>
-                            <p><strong>Method:</strong> {forecast_method}</p>
+                            <p><strong>Method:</strong> {forecast_data.get('fitted_method', forecast_method)}</p>
                             <p><strong>Forecast Period:</strong> {forecast_periods} periods</p>
                             <p><strong>Expected Growth:</strong> {forecast_insights['expected_growth']:+.1f}%</p>
                             <p><strong>Trend Direction:</strong> {forecast_insights['trend_direction']}</p>
@@ -756,13 +758,42 @@ class EnrollmentTrendsDashboard:
 
         with export_col3:
             if st.button("📈 Export Full Report", key="export_report"):
-                report_data = self.data_service.generate_comprehensive_report(filters)
-                if report_data:
+                st.session_state.report_job_id = report_jobs.submit(filters)
+            self.render_report_job_status()
+
+    def render_report_job_status(self):
+        """Show the progress of the requested report, and its downloads once generated."""
+        job_id = st.session_state.get("report_job_id")
+        job = report_jobs.get_job(job_id) if job_id else None
+        if job is None:
+            return
+
+        if job.status == "failed":
+            st.error(f"Report generation failed: {job.error}")
+        elif job.status != "done":
+            st.info("⏳ Generating report in the background...")
+            st.button("Check Report Status", key="check_report")
+        else:
+            report_date = datetime.fromtimestamp(job.finished_at).strftime("%Y%m%d")
+            downloads = [("html", "Download Report (HTML)", "text/html"), ("txt", "Download Report (Text)", "text/plain")]
+            downloads += [
+                (
+                    artifact,
+                    f"Download {artifact.split('.')[0].replace('_', ' ').title()} (Parquet)",
+                    "application/octet-stream",
+                )
+                for artifact in job.artifacts
+                if artifact.endswith(".parquet")
+            ]
+            for artifact, label, mime in downloads:
+                path = job.artifacts.get(artifact)
+                if path and Path(path).exists():
                     st.download_button(
-                        label="Download Full Report",
-                        data=report_data,
-                        file_name=f"enrollment_report_{datetime.now().strftime('%Y%m%d')}.pdf",
-                        mime="application/pdf",
+                        label=label,
+                        data=Path(path).read_bytes(),
+                        file_name=f"enrollment_{report_date}_{Path(path).name}",
+                        mime=mime,
+                        key=f"download_report_{artifact}",
                     )
 
     def run(self):
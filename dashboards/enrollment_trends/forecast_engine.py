@@ -0,0 +1,284 @@
+"""
+Forecast Engine for Enrollment Trends Dashboard
+Fits, caches and backtests enrollment forecasting models.
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_absolute_percentage_error
+from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.holtwinters import ExponentialSmoothing
+from statsmodels.tsa.seasonal import seasonal_decompose
+
+logger = logging.getLogger(__name__)
+
+FORECAST_METHODS = ["ARIMA", "Exponential Smoothing", "Linear Trend", "Seasonal Decomposition"]
+
+# Pseudo-method that backtests every method and picks the fastest adequate one
+AUTO_FORECAST_METHOD = "Auto"
+
+# Model parameters per method; part of the fitted-model cache key
+MODEL_PARAMETERS = {
+    "ARIMA": {"order": (1, 1, 1)},
+    "Exponential Smoothing": {"trend": "add", "seasonal": "add", "seasonal_periods": 12},
+    "Linear Trend": {},
+    "Seasonal Decomposition": {"model": "additive", "period": 12},
+}
+
+
+def series_hash(data: Sequence[float]) -> str:
+    """Hash a time series by value so identical series share fitted models."""
+    return hashlib.md5(np.asarray(data, dtype=float).tobytes()).hexdigest()
+
+
+def z_score(confidence_level: int) -> float:
+    """Get the normal z-score used for a confidence level."""
+    return 1.96 if confidence_level == 95 else 1.645 if confidence_level == 90 else 1.28
+
+
+@dataclass
+class FittedForecast:
+    """A fitted forecasting model that can forecast any horizon and confidence level."""
+
+    method: str
+    n_obs: int
+    fit_seconds: float
+    residual_std: float
+    model: Any = None
+    state: Dict[str, Any] = field(default_factory=dict)
+
+    def forecast(self, periods: int, confidence_level: int) -> Dict[str, np.ndarray]:
+        """Forecast ``periods`` steps ahead without refitting."""
+        if self.method == "ARIMA":
+            prediction = self.model.get_forecast(steps=periods)
+            conf_int = np.asarray(prediction.conf_int(alpha=(100 - confidence_level) / 100))
+            return {
+                "forecast": np.asarray(prediction.predicted_mean),
+                "lower_bound": conf_int[:, 0],
+                "upper_bound": conf_int[:, 1],
+            }
+
+        if self.method == "Exponential Smoothing":
+            forecast = np.asarray(self.model.forecast(periods))
+        elif self.method == "Seasonal Decomposition":
+            n_trend = self.state["n_trend"]
+            future_X = np.arange(n_trend, n_trend + periods).reshape(-1, 1)
+            seasonal_pattern = self.state["seasonal_pattern"]
+            seasonal_forecast = np.tile(seasonal_pattern, (periods // len(seasonal_pattern)) + 1)[:periods]
+            forecast = self.model.predict(future_X) + seasonal_forecast
+        elif self.method == "Linear Trend":
+            future_X = np.arange(self.n_obs, self.n_obs + periods).reshape(-1, 1)
+            forecast = self.model.predict(future_X)
+        else:  # Mean fallback
+            forecast = np.full(periods, self.state["mean"])
+            return {"forecast": forecast, "lower_bound": forecast * 0.9, "upper_bound": forecast * 1.1}
+
+        margin_of_error = z_score(confidence_level) * self.residual_std
+        return {"forecast": forecast, "lower_bound": forecast - margin_of_error, "upper_bound": forecast + margin_of_error}
+
+
+def _fit_linear_trend(data: np.ndarray) -> FittedForecast:
+    X = np.arange(len(data)).reshape(-1, 1)
+    model = LinearRegression()
+    model.fit(X, data)
+    residuals = data - model.predict(X)
+    return FittedForecast("Linear Trend", len(data), 0.0, float(np.std(residuals)), model=model)
+
+
+def _fit_model(data: np.ndarray, method: str) -> FittedForecast:
+    """Fit one model, falling back to a linear trend (then the mean) when it fails."""
+    started = time.perf_counter()
+    params = MODEL_PARAMETERS.get(method, {})
+
+    try:
+        if method == "ARIMA":
+            results = ARIMA(data, order=params["order"]).fit()
+            fitted = FittedForecast(method, len(data), 0.0, float(np.std(results.resid)), model=results)
+
+        elif method == "Exponential Smoothing":
+            results = ExponentialSmoothing(data, **params).fit()
+            fitted = FittedForecast(method, len(data), 0.0, float(np.std(results.resid)), model=results)
+
+        elif method == "Seasonal Decomposition":
+            if len(data) < 2 * params["period"]:  # Need at least 2 cycles for seasonal decomposition
+                fitted = _fit_linear_trend(data)
+            else:
+                decomposition = seasonal_decompose(data, model=params["model"], period=params["period"])
+                trend_values = decomposition.trend[~np.isnan(decomposition.trend)]
+                trend_model = LinearRegression()
+                trend_model.fit(np.arange(len(trend_values)).reshape(-1, 1), trend_values)
+                residuals = decomposition.resid[~np.isnan(decomposition.resid)]
+                fitted = FittedForecast(
+                    method,
+                    len(data),
+                    0.0,
+                    float(np.std(residuals)),
+                    model=trend_model,
+                    state={"n_trend": len(trend_values), "seasonal_pattern": decomposition.seasonal[-params["period"] :]},
+                )
+
+        else:
+            fitted = _fit_linear_trend(data)
+
+    except Exception as e:
+        logger.error(f"{method} fit error: {e}")
+        try:
+            fitted = _fit_linear_trend(data)
+        except Exception as e:
+            logger.error(f"Linear trend fit error: {e}")
+            fitted = FittedForecast("Mean", len(data), 0.0, 0.0, state={"mean": float(np.mean(data))})
+
+    fitted.fit_seconds = time.perf_counter() - started
+    return fitted
+
+
+def _fit_job(job: Tuple[np.ndarray, str]) -> FittedForecast:
+    """Process pool entry point."""
+    data, method = job
+    return _fit_model(data, method)
+
+
+class ForecastEngine:
+    """Fits and caches enrollment forecasting models.
+
+    Fitted models are kept in a bounded in-process LRU keyed by
+    ``(series hash, method, parameters)``, so changing only the horizon or the
+    confidence level reuses the fitted model instead of refitting. Dashboard
+    requests fit inline; batch jobs such as the nightly precompute can run
+    their fits in one long-lived process pool. The pool starts its workers
+    with ``spawn``, since forking the multithreaded dashboard servers can
+    deadlock the children.
+    """
+
+    def __init__(self, max_models: int = 256, max_workers: Optional[int] = None):
+        self.max_models = max_models
+        self.max_workers = max_workers or int(os.getenv("FORECAST_WORKERS", min(4, os.cpu_count() or 1)))
+        self._models: "OrderedDict[Tuple[str, str, str], FittedForecast]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def shutdown(self):
+        """Stop the process pool, if one was started."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    @staticmethod
+    def model_key(data: Sequence[float], method: str) -> Tuple[str, str, str]:
+        """Get the cache key of a fitted model."""
+        return series_hash(data), method, json.dumps(MODEL_PARAMETERS.get(method, {}), sort_keys=True)
+
+    def _get_cached(self, key: Tuple[str, str, str]) -> Optional[FittedForecast]:
+        with self._lock:
+            fitted = self._models.get(key)
+            if fitted is not None:
+                self._models.move_to_end(key)
+            return fitted
+
+    def _store(self, key: Tuple[str, str, str], fitted: FittedForecast):
+        with self._lock:
+            self._models[key] = fitted
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+
+    def get_model(self, data: Sequence[float], method: str) -> FittedForecast:
+        """Get a fitted model for a series, fitting it only on a cache miss."""
+        data = np.asarray(data, dtype=float)
+        key = self.model_key(data, method)
+        fitted = self._get_cached(key)
+        if fitted is None:
+            fitted = _fit_model(data, method)
+            self._store(key, fitted)
+        return fitted
+
+    def fit_many(self, jobs: Sequence[Tuple[Sequence[float], str]], parallel: bool = False) -> List[FittedForecast]:
+        """Fit many ``(series, method)`` jobs, fitting cache misses inline or, with ``parallel``, in the process pool."""
+        jobs = [(np.asarray(data, dtype=float), method) for data, method in jobs]
+        keys = [self.model_key(data, method) for data, method in jobs]
+        results: List[Optional[FittedForecast]] = [self._get_cached(key) for key in keys]
+
+        # Fit each distinct missing model once
+        missing = OrderedDict()
+        for job, key, fitted in zip(jobs, keys, results):
+            if fitted is None and key not in missing:
+                missing[key] = job
+
+        if missing:
+            if not parallel or len(missing) == 1 or self.max_workers <= 1:
+                fitted_models = [_fit_job(job) for job in missing.values()]
+            else:
+                fitted_models = list(self._get_pool().map(_fit_job, missing.values()))
+
+            for key, fitted in zip(missing, fitted_models):
+                self._store(key, fitted)
+            fitted_by_key = dict(zip(missing, fitted_models))
+            results = [fitted if fitted is not None else fitted_by_key[key] for key, fitted in zip(keys, results)]
+
+        return results
+
+    def forecast(self, data: Sequence[float], method: str, periods: int, confidence_level: int) -> Dict[str, np.ndarray]:
+        """Forecast a series with a (cached) fitted model."""
+        return self.get_model(data, method).forecast(periods, confidence_level)
+
+    def backtest(
+        self, data: Sequence[float], methods: Sequence[str] = FORECAST_METHODS, holdout: int = 6
+    ) -> List[Dict[str, Any]]:
+        """Score each method by fitting all but the last ``holdout`` points and forecasting them.
+
+        Returns one score per method with its MAPE, accuracy (100 - MAPE) and fit time.
+        """
+        data = np.asarray(data, dtype=float)
+        if len(data) <= holdout + 12:
+            return []
+
+        train, actual = data[:-holdout], data[-holdout:]
+        fitted_models = self.fit_many([(train, method) for method in methods])
+
+        scores = []
+        for method, fitted in zip(methods, fitted_models):
+            predicted = fitted.forecast(holdout, 95)["forecast"]
+            mape = float(mean_absolute_percentage_error(actual, predicted) * 100)
+            scores.append(
+                {
+                    "method": method,
+                    "mape": mape,
+                    "accuracy": max(0.0, 100 - mape),
+                    "fit_seconds": float(fitted.fit_seconds),
+                }
+            )
+        return scores
+
+    @staticmethod
+    def select_method(scores: List[Dict[str, Any]], max_mape: float = 10.0) -> Optional[str]:
+        """Choose the fastest method whose backtest MAPE is adequate, else the most accurate one."""
+        if not scores:
+            return None
+        adequate = [score for score in scores if score["mape"] <= max_mape]
+        if adequate:
+            return min(adequate, key=lambda score: score["fit_seconds"])["method"]
+        return min(scores, key=lambda score: score["mape"])["method"]
+
+
+# Shared engine so fitted models outlive individual dashboard sessions
+forecast_engine = ForecastEngine()
@@ -0,0 +1,264 @@
+"""
+Report Jobs for Enrollment Trends Dashboard
+Generates comprehensive reports as background jobs on an asyncio worker.
+
+A job is identified by a hash of its filters and the enrollment data version,
+so requesting the same report again returns the finished (or running) job
+until the data changes. Report sections are computed concurrently, and the
+artifacts (text, HTML and per-section Parquet files) are written to a shared
+directory, with job records in Redis so every dashboard process can serve them.
+"""
+
+import asyncio
+import hashlib
+import html
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from dashboards.enrollment_trends.data_service import REPORT_SECTIONS, EnrollmentDataService, enrollment_data_service
+
+logger = logging.getLogger(__name__)
+
+# Directory holding report artifacts, shared by the dashboard processes
+REPORT_ARTIFACT_DIR = Path(os.getenv("REPORT_ARTIFACT_DIR", "reports/enrollment_trends"))
+
+# Job records expire after this many seconds; their artifacts are reused until then
+REPORT_JOB_TTL = int(os.getenv("REPORT_JOB_TTL", str(7 * 86400)))
+
+# Unfinished jobs older than this many seconds are assumed lost and resubmitted
+REPORT_JOB_TIMEOUT = 30 * 60
+
+# Finished jobs kept in memory when Redis cannot store them
+MAX_LOCAL_FINISHED_JOBS = 64
+
+# Reports generated at the same time; further jobs wait for a slot
+MAX_CONCURRENT_REPORTS = int(os.getenv("REPORT_MAX_CONCURRENT", "2"))
+
+# Sections with tabular data exported as Parquet, with the path to their rows
+TABULAR_SECTIONS = {
+    "trends": ("trends",),
+    "regional": ("regional", "trends"),
+    "volatility": ("volatility",),
+    "forecast": ("forecast", "forecast_data"),
+    "gender_trends": ("demographics", "gender_trends"),
+    "grade_trends": ("demographics", "grade_trends"),
+    "school_type_trends": ("demographics", "school_type_trends"),
+}
+
+
+def report_job_id(filters: Optional[Dict[str, Any]], data_version: int) -> str:
+    """Identify a report by its filters and the data version it is computed from."""
+    filter_str = json.dumps(filters or {}, sort_keys=True, default=str)
+    return hashlib.sha256(f"{data_version}:{filter_str}".encode()).hexdigest()[:32]
+
+
+@dataclass
+class ReportJob:
+    """State of one report generation job."""
+
+    job_id: str
+    filters: Dict[str, Any]
+    data_version: int
+    status: str = "queued"  # queued, running, done or failed
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    artifacts: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+
+def _section_rows(sections: Dict[str, Any], path) -> List[Dict[str, Any]]:
+    value: Any = sections
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value if isinstance(value, list) else []
+
+
+def _is_empty(value: Any) -> bool:
+    """Whether a section holds nothing, as the data service returns when it could not compute one."""
+    if isinstance(value, dict):
+        return all(_is_empty(item) for item in value.values())
+    return value is None or (isinstance(value, (list, str)) and not value)
+
+
+def render_report_html(text_report: str, sections: Dict[str, Any]) -> str:
+    """Render a report as a standalone HTML page with one table per tabular section."""
+    parts = [
+        "<!DOCTYPE html>",
+        "<html><head><meta charset='utf-8'><title>Enrollment Trends Report</title>",
+        "<style>body{font-family:sans-serif;margin:2rem}table{border-collapse:collapse;margin-bottom:2rem}"
+        "td,th{border:1px solid #ddd;padding:4px 8px}</style></head><body>",
+        f"<pre>{html.escape(text_report)}</pre>",
+    ]
+    for name, path in TABULAR_SECTIONS.items():
+        rows = _section_rows(sections, path)
+        if rows:
+            parts.append(f"<h2>{html.escape(name.replace('_', ' ').title())}</h2>")
+            parts.append(pd.DataFrame(rows).to_html(index=False, border=0))
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+class ReportJobManager:
+    """Runs report jobs on an asyncio event loop in a background thread.
+
+    Each job computes the report sections concurrently in worker threads,
+    since the sections are independent database and cache round trips.
+    Jobs are kept in memory while they run; finished ones are read back from
+    Redis, or without it the latest ``MAX_LOCAL_FINISHED_JOBS`` are kept.
+    """
+
+    def __init__(
+        self,
+        data_service: EnrollmentDataService,
+        artifact_dir: Path = REPORT_ARTIFACT_DIR,
+        max_concurrent: int = MAX_CONCURRENT_REPORTS,
+    ):
+        self.data_service = data_service
+        self.artifact_dir = Path(artifact_dir)
+        self.max_concurrent = max_concurrent
+        self._jobs: "OrderedDict[str, ReportJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._submit_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _job_key(self, job_id: str) -> str:
+        return f"enrollment_trends:report_job:{job_id}"
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="report-jobs", daemon=True).start()
+                self._slots = asyncio.Semaphore(self.max_concurrent)
+                self._loop = loop
+            return self._loop
+
+    def _save(self, job: ReportJob):
+        stored = False
+        redis_client = self.data_service.redis_client
+        if redis_client:
+            try:
+                redis_client.setex(self._job_key(job.job_id), REPORT_JOB_TTL, json.dumps(asdict(job), default=str))
+                stored = True
+            except Exception as e:
+                logger.warning(f"Report job storage failed: {e}")
+
+        with self._lock:
+            if job.finished and stored:
+                self._jobs.pop(job.job_id, None)
+                return
+            self._jobs[job.job_id] = job
+            self._jobs.move_to_end(job.job_id)
+            finished = [job_id for job_id, kept in self._jobs.items() if kept.finished]
+            for job_id in finished[: max(len(finished) - MAX_LOCAL_FINISHED_JOBS, 0)]:
+                del self._jobs[job_id]
+
+    def get_job(self, job_id: str) -> Optional[ReportJob]:
+        """Get a job of this or another dashboard process."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+
+        redis_client = self.data_service.redis_client
+        if redis_client:
+            try:
+                record = redis_client.get(self._job_key(job_id))
+                if record:
+                    return ReportJob(**json.loads(record))
+            except Exception as e:
+                logger.warning(f"Report job retrieval failed: {e}")
+        return None
+
+    def _reusable(self, job: Optional[ReportJob]) -> bool:
+        if job is None or job.status == "failed":
+            return False
+        if job.status == "done":
+            return all(Path(path).exists() for path in job.artifacts.values())
+        return time.time() - job.created_at < REPORT_JOB_TIMEOUT  # Jobs of a process that died are resubmitted
+
+    def submit(self, filters: Optional[Dict[str, Any]] = None) -> str:
+        """Request a report and return its job id.
+
+        Returns the id of an existing job when the same report was already
+        generated or is being generated from the current data.
+        """
+        filters = dict(filters or {})
+        data_version = self.data_service.get_data_version()
+        job_id = report_job_id(filters, data_version)
+
+        with self._submit_lock:
+            if self._reusable(self.get_job(job_id)):
+                return job_id
+
+            job = ReportJob(job_id=job_id, filters=filters, data_version=data_version)
+            self._save(job)
+        asyncio.run_coroutine_threadsafe(self._run(job), self._ensure_loop())
+        return job_id
+
+    async def _run(self, job: ReportJob):
+        async with self._slots:
+            job.status = "running"
+            self._save(job)
+            try:
+                sections = await self.compute_sections(job.filters)
+                # A report missing sections is not kept as done, so it is computed again when requested
+                missing = [name for name, value in sections.items() if _is_empty(value)]
+                if missing:
+                    raise ValueError(f"No data for report sections: {', '.join(missing)}")
+                job.artifacts = await asyncio.to_thread(self.write_artifacts, job, sections)
+                job.status = "done"
+            except Exception as e:
+                logger.error(f"Error generating report {job.job_id}: {e}")
+                job.status, job.error = "failed", str(e)
+            job.finished_at = time.time()
+            self._save(job)
+
+    async def compute_sections(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute every report section concurrently."""
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self.data_service.get_report_section, section, filters) for section in REPORT_SECTIONS)
+        )
+        return dict(zip(REPORT_SECTIONS, results))
+
+    def write_artifacts(self, job: ReportJob, sections: Dict[str, Any]) -> Dict[str, str]:
+        """Write the report artifacts of a job and return their paths by format."""
+        job_dir = self.artifact_dir / job.job_id
+        job_dir.mkdir(parents=True, exist_ok=True)
+
+        text_report = self.data_service.render_report_text(sections)
+        artifacts = {"txt": job_dir / "report.txt", "html": job_dir / "report.html"}
+        artifacts["txt"].write_text(text_report, encoding="utf-8")
+        artifacts["html"].write_text(render_report_html(text_report, sections), encoding="utf-8")
+
+        for name, path in TABULAR_SECTIONS.items():
+            rows = _section_rows(sections, path)
+            if not rows:
+                continue
+            try:
+                parquet_path = job_dir / f"{name}.parquet"
+                pd.DataFrame(rows).to_parquet(parquet_path, index=False)
+                artifacts[f"{name}.parquet"] = parquet_path
+            except ImportError:
+                logger.warning("Parquet export needs pyarrow; skipping tabular artifacts")
+                break
+
+        return {name: str(path) for name, path in artifacts.items()}
+
+
+# Shared so that every session of the process sees the same jobs
+report_jobs = ReportJobManager(enrollment_data_service)
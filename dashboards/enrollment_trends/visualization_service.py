@@ -15,6 +15,8 @@ import plotly.figure_factory as ff
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from dashboards.figure_cache import memoize_figure
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,6 +48,7 @@ class EnrollmentVisualizationService:
             "dark": px.colors.qualitative.Dark24,
         }
 
+    @memoize_figure("enrollment.enrollment_trends_chart")
     def create_enrollment_trends_chart(
         self, trends_data: List[Dict[str, Any]], aggregation_level: str = "Monthly"
     ) -> go.Figure:
@@ -124,6 +127,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating enrollment trends chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.monthly_seasonality_chart")
     def create_monthly_seasonality_chart(self, seasonal_data: List[Dict[str, Any]]) -> go.Figure:
         """Create monthly seasonality chart."""
         if not seasonal_data:
@@ -167,6 +171,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating seasonality chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.quarterly_patterns_chart")
     def create_quarterly_patterns_chart(self, seasonal_data: List[Dict[str, Any]]) -> go.Figure:
         """Create quarterly patterns chart."""
         if not seasonal_data:
@@ -226,6 +231,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating quarterly patterns chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.academic_calendar_chart")
     def create_academic_calendar_chart(self, seasonal_data: List[Dict[str, Any]]) -> go.Figure:
         """Create academic calendar alignment chart."""
         if not seasonal_data:
@@ -292,6 +298,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating academic calendar chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.regional_comparison_chart")
     def create_regional_comparison_chart(self, regional_data: List[Dict[str, Any]]) -> go.Figure:
         """Create regional enrollment comparison chart."""
         if not regional_data:
@@ -348,6 +355,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating regional comparison chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.regional_growth_chart")
     def create_regional_growth_chart(self, regional_data: List[Dict[str, Any]]) -> go.Figure:
         """Create regional growth rates chart."""
         if not regional_data:
@@ -402,6 +410,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating regional growth chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.regional_heatmap")
     def create_regional_heatmap(self, regional_data: List[Dict[str, Any]]) -> go.Figure:
         """Create regional enrollment heatmap over time."""
         if not regional_data:
@@ -440,6 +449,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating regional heatmap: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.gender_trends_chart")
     def create_gender_trends_chart(self, gender_data: List[Dict[str, Any]]) -> go.Figure:
         """Create gender enrollment trends chart."""
         if not gender_data:
@@ -485,6 +495,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating gender trends chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.gender_parity_chart")
     def create_gender_parity_chart(self, gender_data: List[Dict[str, Any]]) -> go.Figure:
         """Create gender parity index chart."""
         if not gender_data:
@@ -561,6 +572,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating gender parity chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.grade_level_trends_chart")
     def create_grade_level_trends_chart(self, grade_data: List[Dict[str, Any]]) -> go.Figure:
         """Create grade level enrollment trends chart."""
         if not grade_data:
@@ -611,6 +623,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating grade level trends chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.transition_rates_chart")
     def create_transition_rates_chart(self, transition_data: List[Dict[str, Any]]) -> go.Figure:
         """Create grade transition rates chart."""
         if not transition_data:
@@ -661,6 +674,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating transition rates chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.grade_distribution_chart")
     def create_grade_distribution_chart(self, grade_data: List[Dict[str, Any]]) -> go.Figure:
         """Create grade level distribution pie chart."""
         if not grade_data:
@@ -703,6 +717,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating grade distribution chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.school_type_trends_chart")
     def create_school_type_trends_chart(self, school_type_data: List[Dict[str, Any]]) -> go.Figure:
         """Create school type enrollment trends chart."""
         if not school_type_data:
@@ -753,6 +768,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating school type trends chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.public_private_chart")
     def create_public_private_chart(self, public_private_data: List[Dict[str, Any]]) -> go.Figure:
         """Create public vs private enrollment chart."""
         if not public_private_data:
@@ -802,6 +818,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating public/private chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.school_type_market_share_chart")
     def create_school_type_market_share_chart(self, school_type_data: List[Dict[str, Any]]) -> go.Figure:
         """Create school type market share chart."""
         if not school_type_data:
@@ -870,6 +887,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating market share chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.volatility_chart")
     def create_volatility_chart(self, volatility_data: List[Dict[str, Any]]) -> go.Figure:
         """Create enrollment volatility chart."""
         if not volatility_data:
@@ -921,6 +939,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating volatility chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.growth_distribution_chart")
     def create_growth_distribution_chart(self, growth_data: List[Dict[str, Any]]) -> go.Figure:
         """Create growth rate distribution histogram."""
         if not growth_data:
@@ -963,6 +982,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating growth distribution chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.forecast_chart")
     def create_forecast_chart(
         self, historical_data: List[Dict[str, Any]], forecast_data: Dict[str, Any], confidence_level: int
     ) -> go.Figure:
@@ -1058,6 +1078,7 @@ class EnrollmentVisualizationService:
             logger.error(f"Error creating forecast chart: {e}")
             return self._create_empty_chart(f"Error creating chart: {str(e)}")
 
+    @memoize_figure("enrollment.scenario_chart")
     def create_scenario_chart(self, scenario_data: List[Dict[str, Any]]) -> go.Figure:
         """Create scenario analysis chart."""
         if not scenario_data:
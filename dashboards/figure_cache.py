@@ -0,0 +1,131 @@
+"""
+Figure Cache for the Dashboards
+Memoizes Plotly figures by a hash of their input data and chart type.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def _update_digest(digest, value: Any):
+    """Feed one chart input into a hash."""
+    if isinstance(value, pd.DataFrame):
+        digest.update(json.dumps([str(col) for col in value.columns]).encode())
+        try:
+            digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        except TypeError:  # Unhashable cells such as lists
+            digest.update(value.to_json(date_format="iso").encode())
+    elif isinstance(value, pd.Series):
+        digest.update(str(value.name).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        digest.update(str(value.dtype).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+
+
+def figure_signature(chart_type: str, *inputs: Any) -> str:
+    """Hash a chart type together with the data it is drawn from.
+
+    Inputs may be DataFrames, Series, NumPy arrays or JSON-serializable values.
+    Two calls return the same signature exactly when the chart would be drawn
+    from the same data.
+    """
+    digest = hashlib.md5(chart_type.encode())
+    for value in inputs:
+        digest.update(b"\x1e")
+        _update_digest(digest, value)
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """Bounded LRU of built figures keyed by figure signature.
+
+    Cached figures are shared between callers and sessions, so callers must
+    not modify a figure they get from the cache.
+    """
+
+    def __init__(self, max_figures: int = 128):
+        self.max_figures = max_figures
+        self._figures: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, signature: str) -> Optional[Any]:
+        """Get a cached figure, or None."""
+        with self._lock:
+            figure = self._figures.get(signature)
+            if figure is not None:
+                self._figures.move_to_end(signature)
+                self.hits += 1
+            return figure
+
+    def put(self, signature: str, figure: Any):
+        """Cache a figure."""
+        if figure is None:
+            return
+        with self._lock:
+            self._figures[signature] = figure
+            self._figures.move_to_end(signature)
+            while len(self._figures) > self.max_figures:
+                self._figures.popitem(last=False)
+
+    def get_or_build(self, signature: str, builder: Callable[[], Any]) -> Any:
+        """Get a cached figure, building and caching it on a miss."""
+        figure = self.get(signature)
+        if figure is None:
+            with self._lock:
+                self.misses += 1
+            figure = builder()
+            self.put(signature, figure)
+        return figure
+
+    def clear(self):
+        """Drop every cached figure."""
+        with self._lock:
+            self._figures.clear()
+
+
+# Shared by the visualization services of every dashboard in the process
+figure_cache = FigureCache(max_figures=int(os.getenv("DASHBOARD_FIGURE_CACHE_SIZE", "128")))
+
+
+def memoize_figure(chart_type: str, cache: FigureCache = figure_cache):
+    """Decorate a chart builder so that unchanged inputs return the cached figure.
+
+    Works for plain functions, static methods and instance methods; ``self``
+    is not part of the key. Every other argument is hashed with
+    :func:`figure_signature`.
+    """
+
+    def decorator(builder: Callable) -> Callable:
+        parameters = list(inspect.signature(builder).parameters)
+        skip_self = 1 if parameters[:1] == ["self"] else 0
+
+        @functools.wraps(builder)
+        def wrapper(*args, **kwargs):
+            inputs = args[skip_self:]
+            try:
+                signature = figure_signature(chart_type, *inputs, sorted(kwargs.items()))
+            except Exception as e:
+                logger.warning(f"Could not hash inputs of {chart_type} chart: {e}")
+                return builder(*args, **kwargs)
+            return cache.get_or_build(signature, lambda: builder(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,223 @@
+"""
+Shared Cache for the Streamlit Dashboards
+Caches loader results in Redis, with DataFrames stored as Arrow IPC and other
+values as JSON, so every Streamlit process reuses one copy instead of loading
+its own. Nothing read from Redis is unpickled.
+"""
+
+import datetime
+import functools
+import io
+import json
+import logging
+import os
+import struct
+import time
+from typing import Any, Callable, Optional
+
+import pandas as pd
+import redis
+
+from dashboards.figure_cache import figure_signature
+
+logger = logging.getLogger(__name__)
+
+# "redis" shares results between processes; "local" keeps Streamlit's per-process cache
+CACHE_BACKEND = os.getenv("DASHBOARD_CACHE_BACKEND", "local")
+
+KEY_PREFIX = "dashboard:cache:"
+
+# One-byte tags of the serialized formats
+_FRAME, _FRAME_DICT, _JSON = b"F", b"D", b"J"
+
+# Seconds a result stays in each process's own cache in front of Redis
+LOCAL_TTL = 60
+
+# Seconds before reconnecting after Redis was found unreachable
+RECONNECT_SECONDS = 30
+
+_redis_client = None
+_unavailable_since = 0.0
+
+
+def get_cache_client() -> Optional[redis.Redis]:
+    """Get the binary Redis client of the shared cache, or None when Redis is down."""
+    global _redis_client, _unavailable_since
+    if _redis_client is None:
+        if time.monotonic() - _unavailable_since < RECONNECT_SECONDS:
+            return None
+        try:
+            client = redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"), socket_connect_timeout=2)
+            client.ping()
+            _redis_client = client
+        except Exception as e:
+            logger.warning(f"Shared cache unavailable, using per-process cache: {e}")
+            _unavailable_since = time.monotonic()
+            return None
+    return _redis_client
+
+
+def _frame_to_arrow(df: pd.DataFrame) -> bytes:
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _frame_from_arrow(data: bytes) -> pd.DataFrame:
+    import pyarrow as pa
+
+    return pa.ipc.open_stream(data).read_all().to_pandas()
+
+
+def _to_json(value: Any) -> Any:
+    """Tag the tuples and dates of a value, which JSON would otherwise turn into lists and strings."""
+    if isinstance(value, tuple):
+        return {"__tuple__": [_to_json(item) for item in value]}
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError("Only dicts with string keys can be cached")
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"__date__": value.isoformat()}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Cannot cache values of type {type(value).__name__}")
+
+
+def _from_json(value: dict) -> Any:
+    if "__tuple__" in value:
+        return tuple(value["__tuple__"])
+    if "__datetime__" in value:
+        return datetime.datetime.fromisoformat(value["__datetime__"])
+    if "__date__" in value:
+        return datetime.date.fromisoformat(value["__date__"])
+    return value
+
+
+def serialize(value: Any) -> bytes:
+    """Serialize a loader result: Arrow IPC for DataFrames and dicts of them, JSON otherwise.
+
+    Raises TypeError for values neither format can hold.
+    """
+    if isinstance(value, pd.DataFrame):
+        return _FRAME + _frame_to_arrow(value)
+    if isinstance(value, dict) and value and all(isinstance(item, pd.DataFrame) for item in value.values()):
+        # A JSON header of keys and stream lengths, then the Arrow streams back to back
+        frames = [_frame_to_arrow(frame) for frame in value.values()]
+        header = json.dumps([[_to_json(key), len(frame)] for key, frame in zip(value, frames)]).encode()
+        return _FRAME_DICT + struct.pack(">I", len(header)) + header + b"".join(frames)
+    return _JSON + json.dumps(_to_json(value)).encode()
+
+
+def deserialize(data: bytes) -> Any:
+    """Inverse of :func:`serialize`."""
+    tag, payload = data[:1], data[1:]
+    if tag == _FRAME:
+        return _frame_from_arrow(payload)
+    if tag == _FRAME_DICT:
+        (header_length,) = struct.unpack(">I", payload[:4])
+        offset = 4 + header_length
+        frames = {}
+        for key, length in json.loads(payload[4:offset], object_hook=_from_json):
+            frames[key] = _frame_from_arrow(payload[offset : offset + length])
+            offset += length
+        return frames
+    if tag == _JSON:
+        return json.loads(payload, object_hook=_from_json)
+    raise ValueError(f"Unknown shared cache format {tag!r}")
+
+
+def is_empty(value: Any) -> bool:
+    """Whether a loader result is empty, as the loaders return on errors, and must not be cached."""
+    if isinstance(value, (pd.DataFrame, dict, list, tuple)):
+        return len(value) == 0
+    return value is None
+
+
+class _Uncached(Exception):
+    """Carries an empty result out of ``st.cache_data``, which does not cache calls that raise."""
+
+    def __init__(self, value: Any):
+        super().__init__()
+        self.value = value
+
+
+def loader_prefix(func: Callable) -> str:
+    """Prefix of the Redis keys of every call of a loader."""
+    return f"{KEY_PREFIX}{func.__module__}.{func.__qualname__}:"
+
+
+def cache_key(func: Callable, *args, **kwargs) -> str:
+    """Redis key of a loader call, from the loader's qualified name and a hash of its arguments."""
+    return loader_prefix(func) + figure_signature("loader", *args, sorted(kwargs.items()))
+
+
+def shared_cache_data(ttl: int = 3600, backend: str = CACHE_BACKEND):
+    """Drop-in replacement for ``st.cache_data`` that shares results between processes.
+
+    With the ``redis`` backend results are read from and written to Redis,
+    behind a short-lived ``st.cache_data`` layer so reruns in one process do
+    not fetch and decode them again. Empty results, which the loaders return
+    when a query fails, are cached in neither. When Redis is unreachable the
+    loader runs behind the in-process layer alone.
+    With the ``local`` backend this is ``st.cache_data(ttl=ttl)``.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        import streamlit as st
+
+        if backend != "redis":
+            return st.cache_data(ttl=ttl)(func)
+
+        @functools.wraps(func)
+        def fetch(*args, **kwargs):
+            client = get_cache_client()
+            key = cache_key(func, *args, **kwargs)
+            if client is not None:
+                try:
+                    cached = client.get(key)
+                    if cached is not None:
+                        return deserialize(cached)
+                except Exception as e:
+                    logger.warning(f"Shared cache read failed for {func.__qualname__}: {e}")
+
+            value = func(*args, **kwargs)
+            if is_empty(value):
+                raise _Uncached(value)
+            if client is not None:
+                try:
+                    client.setex(key, ttl, serialize(value))
+                except Exception as e:
+                    logger.warning(f"Shared cache write failed for {func.__qualname__}: {e}")
+            return value
+
+        # Wrapping keeps the loader's name and source, which Streamlit keys its cache by
+        local = st.cache_data(ttl=min(ttl, LOCAL_TTL))(fetch)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return local(*args, **kwargs)
+            except _Uncached as uncached:
+                return uncached.value
+
+        def clear():
+            """Drop the cached results of every call, in this process and in Redis."""
+            local.clear()
+            client = get_cache_client()
+            if client is not None:
+                for key in client.scan_iter(match=loader_prefix(func) + "*"):
+                    client.delete(key)
+
+        wrapper.clear = clear
+        return wrapper
+
+    return decorator
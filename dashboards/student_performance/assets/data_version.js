@@ -0,0 +1,68 @@
+// Live updates for the Student Performance Dashboard.
+// Subscribes to the server's data version stream while "Live Updates" is on
+// and clicks the hidden trigger button when a newer version arrives, so the
+// data store only refreshes when the data actually changed. The version is
+// left in window.dashboardDataVersion for the callback to wait for. The server
+// ends each stream after a while and EventSource reconnects by itself,
+// keeping the known version.
+(function () {
+    var source = null;
+    var knownVersion = null;
+
+    function connect() {
+        if (source) {
+            return;
+        }
+        source = new EventSource("/_dashboard/data-version");
+        source.onmessage = function (event) {
+            var version = Number(event.data);
+            // A worker whose feed lags behind may report an older version after a reconnect
+            if (knownVersion !== null && version > knownVersion) {
+                window.dashboardDataVersion = version;
+                var trigger = document.getElementById("data-version-trigger");
+                if (trigger) {
+                    trigger.click();
+                }
+            }
+            knownVersion = knownVersion === null ? version : Math.max(knownVersion, version);
+        };
+    }
+
+    function disconnect() {
+        if (source) {
+            source.close();
+            source = null;
+            knownVersion = null;
+        }
+    }
+
+    // Follows the switch; false until Dash has rendered it
+    function followSwitch() {
+        var liveUpdates = document.getElementById("auto-refresh-switch");
+        if (!liveUpdates) {
+            return false;
+        }
+        if (liveUpdates.checked) {
+            connect();
+        } else {
+            disconnect();
+        }
+        return true;
+    }
+
+    document.addEventListener("change", function (event) {
+        if (event.target && event.target.id === "auto-refresh-switch") {
+            followSwitch();
+        }
+    });
+
+    // Connect on load too when the switch starts checked, once the layout is rendered
+    if (!followSwitch()) {
+        var observer = new MutationObserver(function () {
+            if (followSwitch()) {
+                observer.disconnect();
+            }
+        });
+        observer.observe(document.documentElement, { childList: true, subtree: true });
+    }
+})();
@@ -0,0 +1,41 @@
+"""
+Gunicorn configuration for serving the Student Performance Dashboard in production.
+
+Usage: gunicorn -c dashboards/student_performance/gunicorn.conf.py dashboards.student_performance.app:server
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('DASHBOARD_PORT', '8050')}"
+workers = int(os.getenv("DASHBOARD_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+
+# Threaded workers so that live update streams do not block callback requests
+worker_class = "gthread"
+threads = int(os.getenv("DASHBOARD_THREADS", "8"))
+timeout = int(os.getenv("DASHBOARD_TIMEOUT", "120"))
+graceful_timeout = 30
+
+# Import the app once in the master so workers share its warmed caches copy-on-write
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    """Warm the dashboard caches in the master before any worker is forked."""
+    from dashboards.student_performance.app import warm_caches
+
+    warm_caches()
+
+
+def post_fork(server, worker):
+    """Give each worker its own change feed listener.
+
+    Database connections inherited from the master are dropped by
+    :mod:`dashboards.database` itself after every fork.
+    """
+    from dashboards.student_performance.app import data_version_feed
+
+    data_version_feed.start()
@@ -13,6 +13,9 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from dashboards.chart_rendering import box_figure, point_budget, scatter_trace
+from dashboards.figure_cache import memoize_figure
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,6 +40,7 @@ class VisualizationService:
         }
 
     @staticmethod
+    @memoize_figure("performance.performance_heatmap")
     def create_performance_heatmap(df: pd.DataFrame) -> Optional[go.Figure]:
         """Create performance heatmap by region and subject."""
         if df.empty or "division" not in df.columns or "subject_name" not in df.columns:
@@ -63,8 +67,13 @@ class VisualizationService:
             return None
 
     @staticmethod
-    def create_time_series_analysis(df: pd.DataFrame) -> Optional[go.Figure]:
-        """Create time series analysis of performance trends."""
+    @memoize_figure("performance.time_series_analysis")
+    def create_time_series_analysis(df: pd.DataFrame, budget: Optional[int] = None) -> Optional[go.Figure]:
+        """Create time series analysis of performance trends.
+
+        Series longer than the chart's point budget are LTTB-downsampled and
+        drawn with WebGL (see ``dashboards.chart_rendering``).
+        """
         if df.empty:
             return None
 
@@ -90,11 +99,14 @@ class VisualizationService:
                 rows=2, cols=1, subplot_titles=("Average Performance Over Time", "Pass Rate Over Time"), vertical_spacing=0.1
             )
 
+            budget = point_budget("time_series_analysis", budget)
+
             # Performance trend
             fig.add_trace(
-                go.Scatter(
-                    x=monthly_performance["month"],
-                    y=monthly_performance["avg_percentage"],
+                scatter_trace(
+                    monthly_performance["month"],
+                    monthly_performance["avg_percentage"],
+                    budget,
                     mode="lines+markers",
                     name="Average Performance",
                     line=dict(color="blue", width=2),
@@ -105,9 +117,10 @@ class VisualizationService:
 
             # Pass rate trend
             fig.add_trace(
-                go.Scatter(
-                    x=monthly_performance["month"],
-                    y=monthly_performance["pass_rate"],
+                scatter_trace(
+                    monthly_performance["month"],
+                    monthly_performance["pass_rate"],
+                    budget,
                     mode="lines+markers",
                     name="Pass Rate",
                     line=dict(color="green", width=2),
@@ -124,6 +137,7 @@ class VisualizationService:
             return None
 
     @staticmethod
+    @memoize_figure("performance.comparative_analysis")
     def create_comparative_analysis(df: pd.DataFrame) -> Optional[go.Figure]:
         """Create comparative analysis dashboards."""
         if df.empty:
@@ -179,11 +193,19 @@ class VisualizationService:
             return None
 
     @staticmethod
-    def create_performance_distribution(df: pd.DataFrame) -> Dict[str, go.Figure]:
-        """Create performance distribution charts."""
+    @memoize_figure("performance.performance_distribution")
+    def create_performance_distribution(df: pd.DataFrame, budget: Optional[int] = None) -> Dict[str, go.Figure]:
+        """Create performance distribution charts.
+
+        Box plots over more rows than the chart's point budget send
+        precomputed quartiles and a downsampled set of outliers instead of
+        every score.
+        """
         charts = {}
 
         try:
+            budget = point_budget("performance_distribution", budget)
+
             # Histogram
             fig_hist = px.histogram(
                 df,
@@ -198,24 +220,28 @@ class VisualizationService:
 
             # Box plot by subject
             if "subject_name" in df.columns:
-                fig_box = px.box(
+                fig_box = box_figure(
                     df,
-                    x="subject_name",
-                    y="percentage",
+                    "subject_name",
+                    "percentage",
+                    budget,
                     title="Performance by Subject",
-                    labels={"subject_name": "Subject", "percentage": "Percentage Score"},
+                    xaxis_title="Subject",
+                    yaxis_title="Percentage Score",
                 )
                 fig_box.update_xaxes(tickangle=45)
                 charts["subject_box"] = fig_box
 
             # Performance by region
             if "division" in df.columns:
-                fig_region = px.box(
+                fig_region = box_figure(
                     df,
-                    x="division",
-                    y="percentage",
+                    "division",
+                    "percentage",
+                    budget,
                     title="Performance by Division",
-                    labels={"division": "Division", "percentage": "Percentage Score"},
+                    xaxis_title="Division",
+                    yaxis_title="Percentage Score",
                 )
                 fig_region.update_xaxes(tickangle=45)
                 charts["region_box"] = fig_region
@@ -226,6 +252,7 @@ class VisualizationService:
             return {}
 
     @staticmethod
+    @memoize_figure("performance.equity_analysis")
     def create_equity_analysis(df: pd.DataFrame) -> Optional[go.Figure]:
         """Create equity analysis visualization."""
         if df.empty:
@@ -277,6 +304,7 @@ class VisualizationService:
             logger.error(f"Error creating equity analysis: {e}")
             return None
 
+    @memoize_figure("performance.performance_trends")
     def create_performance_trends(self, data: List[Dict[str, Any]]) -> go.Figure:
         """Create performance trends over time."""
         if not data:
@@ -317,6 +345,7 @@ class VisualizationService:
 
         return fig
 
+    @memoize_figure("performance.regional_performance_chart")
     def create_regional_performance_chart(self, data: List[Dict[str, Any]]) -> go.Figure:
         """Create regional performance bar chart"""
         if not data:
@@ -355,6 +384,7 @@ class VisualizationService:
 
         return fig
 
+    @memoize_figure("performance.gender_performance_chart")
     def create_gender_performance_chart(self, data: List[Dict[str, Any]]) -> go.Figure:
         """Create gender performance comparison chart"""
         if not data:
@@ -395,6 +425,7 @@ class VisualizationService:
 
         return fig
 
+    @memoize_figure("performance.subject_performance_chart")
     def create_subject_performance_chart(self, data: List[Dict[str, Any]]) -> go.Figure:
         """Create subject performance horizontal bar chart"""
         if not data:
@@ -434,6 +465,7 @@ class VisualizationService:
 
         return fig
 
+    @memoize_figure("performance.attendance_heatmap")
     def create_attendance_heatmap(self, data: List[Dict[str, Any]]) -> go.Figure:
         """Create attendance heatmap"""
         if not data:
@@ -471,6 +503,7 @@ class VisualizationService:
 
         return fig
 
+    @memoize_figure("performance.performance_trends_chart")
     def create_performance_trends_chart(self, df: pd.DataFrame) -> go.Figure:
         """Create performance trends over time chart."""
         if df.empty or "assessment_date" not in df.columns:
@@ -550,6 +583,7 @@ class VisualizationService:
         except Exception as e:
             return self._create_empty_chart(f"Error creating trends chart: {str(e)}")
 
+    @memoize_figure("performance.regional_performance_chart")
     def create_regional_performance_chart(self, df: pd.DataFrame) -> go.Figure:
         """Create regional performance comparison chart."""
         if df.empty or "division" not in df.columns:
@@ -606,6 +640,7 @@ class VisualizationService:
         except Exception as e:
             return self._create_empty_chart(f"Error creating regional chart: {str(e)}")
 
+    @memoize_figure("performance.subject_performance_chart")
     def create_subject_performance_chart(self, df: pd.DataFrame) -> go.Figure:
         """Create subject-wise performance chart."""
         if df.empty or "subject_name" not in df.columns:
@@ -663,6 +698,7 @@ class VisualizationService:
         except Exception as e:
             return self._create_empty_chart(f"Error creating subject chart: {str(e)}")
 
+    @memoize_figure("performance.gender_performance_chart")
     def create_gender_performance_chart(self, df: pd.DataFrame) -> go.Figure:
         """Create gender performance comparison chart."""
         if df.empty or "gender" not in df.columns:
@@ -702,6 +738,7 @@ class VisualizationService:
         except Exception as e:
             return self._create_empty_chart(f"Error creating gender chart: {str(e)}")
 
+    @memoize_figure("performance.school_type_chart")
     def create_school_type_chart(self, df: pd.DataFrame) -> go.Figure:
         """Create school type performance chart."""
         if df.empty or "school_category" not in df.columns:
@@ -728,6 +765,7 @@ class VisualizationService:
         except Exception as e:
             return self._create_empty_chart(f"Error creating school type chart: {str(e)}")
 
+    @memoize_figure("performance.grade_distribution_chart")
     def create_grade_distribution_chart(self, df: pd.DataFrame) -> go.Figure:
         """Create grade distribution pie chart."""
         if df.empty or "letter_grade" not in df.columns:
@@ -782,6 +820,7 @@ class VisualizationService:
         except Exception as e:
             return self._create_empty_chart(f"Error creating grade distribution chart: {str(e)}")
 
+    @memoize_figure("performance.performance_heatmap")
     def create_performance_heatmap(self, df: pd.DataFrame) -> go.Figure:
         """Create performance heatmap by division and subject."""
         if df.empty or "division" not in df.columns or "subject_name" not in df.columns:
@@ -0,0 +1,35 @@
+"""Add trigram search indexes for dashboard student search
+
+Revision ID: 20250106_001
+Revises: 20250105_001
+Create Date: 2025-01-06 10:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20250106_001"
+down_revision = "20250105_001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Enable pg_trgm and index the columns searched by the dashboards."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # The expression must match the one used in search queries for the index to apply
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_students_full_name_trgm ON students "
+        "USING gin ((first_name || ' ' || last_name) gin_trgm_ops)"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_students_student_id_trgm ON students USING gin (student_id gin_trgm_ops)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_schools_name_trgm ON schools USING gin (name gin_trgm_ops)")
+
+
+def downgrade():
+    """Drop the trigram search indexes."""
+    op.execute("DROP INDEX IF EXISTS ix_schools_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_students_student_id_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_students_full_name_trgm")
@@ -0,0 +1,169 @@
+"""Add dimension-backed filter options view for the dashboards
+
+Revision ID: 20250107_001
+Revises: 20250106_001
+Create Date: 2025-01-07 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20250107_001"
+down_revision = "20250106_001"
+branch_labels = None
+depends_on = None
+
+# Tables whose changes invalidate cached filter options
+VERSIONED_TABLES = ["divisions", "subjects"]
+
+# Orders class names such as "Class 10" numerically
+GRADE_SORT_KEY = "COALESCE(substring(current_class FROM '[0-9]+')::int, 0)"
+
+
+def upgrade():
+    """Create the filter lookup tables, their maintenance triggers and the filter options view."""
+    # Values without a dimension table of their own, taken from the columns the dashboard filters compare
+    op.create_table(
+        "filter_lookup_values",
+        sa.Column("dimension", sa.String(length=30), nullable=False),
+        sa.Column("value", sa.String(length=100), nullable=False),
+        sa.Column("sort_key", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("dimension", "value"),
+    )
+
+    # Version counters read by the dashboards to invalidate cached options
+    op.create_table(
+        "lookup_versions",
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="1"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.execute("INSERT INTO lookup_versions (name) VALUES ('filter_options')")
+
+    # Seed lookup values once from existing data
+    op.execute(
+        "INSERT INTO filter_lookup_values (dimension, value) "
+        "SELECT DISTINCT 'school_types', type FROM schools WHERE type IS NOT NULL "
+        "ON CONFLICT DO NOTHING"
+    )
+    op.execute(
+        "INSERT INTO filter_lookup_values (dimension, value) "
+        "SELECT DISTINCT 'academic_years', academic_year FROM enrollments WHERE academic_year IS NOT NULL "
+        "ON CONFLICT DO NOTHING"
+    )
+    op.execute(
+        "INSERT INTO filter_lookup_values (dimension, value, sort_key) "
+        f"SELECT DISTINCT 'grade_levels', current_class, {GRADE_SORT_KEY} FROM students WHERE current_class IS NOT NULL "
+        "ON CONFLICT DO NOTHING"
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_filter_options_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE lookup_versions SET version = version + 1, updated_at = now() WHERE name = 'filter_options';
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in VERSIONED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_filter_options_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_filter_options_version()"
+        )
+    # Row level so that ON CONFLICT DO NOTHING inserts of known values do not bump the version
+    op.execute(
+        "CREATE TRIGGER filter_lookup_values_version "
+        "AFTER INSERT OR UPDATE OR DELETE ON filter_lookup_values "
+        "FOR EACH ROW EXECUTE FUNCTION bump_filter_options_version()"
+    )
+
+    # Keep lookup values current from the new rows of each write statement only
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_enrollment_academic_years() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO filter_lookup_values (dimension, value)
+            SELECT DISTINCT 'academic_years', academic_year FROM new_rows WHERE academic_year IS NOT NULL
+            ON CONFLICT DO NOTHING;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER enrollments_academic_years AFTER INSERT ON enrollments "
+        "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION record_enrollment_academic_years()"
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_school_types() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO filter_lookup_values (dimension, value)
+            SELECT DISTINCT 'school_types', type FROM new_rows WHERE type IS NOT NULL
+            ON CONFLICT DO NOTHING;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION record_grade_levels() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO filter_lookup_values (dimension, value, sort_key)
+            SELECT DISTINCT 'grade_levels', current_class, {GRADE_SORT_KEY} FROM new_rows WHERE current_class IS NOT NULL
+            ON CONFLICT DO NOTHING;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Transition tables allow one event per trigger, so inserts and updates get a trigger each
+    for event in ("INSERT", "UPDATE"):
+        op.execute(
+            f"CREATE TRIGGER schools_school_types_{event.lower()} AFTER {event} ON schools "
+            "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION record_school_types()"
+        )
+        op.execute(
+            f"CREATE TRIGGER students_grade_levels_{event.lower()} AFTER {event} ON students "
+            "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION record_grade_levels()"
+        )
+
+    op.execute(
+        """
+        CREATE VIEW filter_options_view AS
+        SELECT 'divisions' AS dimension, name AS value, id AS sort_key
+        FROM divisions WHERE is_deleted = false AND is_active = true
+        UNION ALL
+        SELECT 'subjects', name, id
+        FROM subjects WHERE is_deleted = false AND is_active = true
+        UNION ALL
+        SELECT dimension, value, sort_key
+        FROM filter_lookup_values
+        """
+    )
+
+
+def downgrade():
+    """Drop the filter options view, triggers and lookup tables."""
+    op.execute("DROP VIEW IF EXISTS filter_options_view")
+    for event in ("insert", "update"):
+        op.execute(f"DROP TRIGGER IF EXISTS students_grade_levels_{event} ON students")
+        op.execute(f"DROP TRIGGER IF EXISTS schools_school_types_{event} ON schools")
+    op.execute("DROP FUNCTION IF EXISTS record_grade_levels()")
+    op.execute("DROP TRIGGER IF EXISTS enrollments_academic_years ON enrollments")
+    op.execute("DROP FUNCTION IF EXISTS record_school_types()")
+    op.execute("DROP FUNCTION IF EXISTS record_enrollment_academic_years()")
+    op.execute("DROP TRIGGER IF EXISTS filter_lookup_values_version ON filter_lookup_values")
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_filter_options_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_filter_options_version()")
+    op.drop_table("lookup_versions")
+    op.drop_table("filter_lookup_values")
@@ -0,0 +1,56 @@
+"""Notify dashboards when student performance data changes
+
+Revision ID: 20250108_001
+Revises: 20250107_001
+Create Date: 2025-01-08 10:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20250108_001"
+down_revision = "20250107_001"
+branch_labels = None
+depends_on = None
+
+# Tables read by the student performance dashboard
+PERFORMANCE_TABLES = ["students", "enrollments", "schools", "assessments", "assessment_results", "subjects"]
+
+
+def upgrade():
+    """Version the performance data and NOTIFY listeners with each new version."""
+    op.execute("INSERT INTO lookup_versions (name) VALUES ('performance_data') ON CONFLICT DO NOTHING")
+
+    # The row is updated inside the writing transaction, so readers only see the new version once the
+    # change commits, and the NOTIFY carrying it is delivered at that commit too
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_performance_data_version() RETURNS trigger AS $$
+        DECLARE
+            new_version BIGINT;
+        BEGIN
+            UPDATE lookup_versions SET version = version + 1, updated_at = now()
+            WHERE name = 'performance_data'
+            RETURNING version INTO new_version;
+            PERFORM pg_notify('performance_data', new_version::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Statement level so that bulk loads notify once per statement rather than per row
+    for table in PERFORMANCE_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_performance_data_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_performance_data_version()"
+        )
+
+
+def downgrade():
+    """Drop the performance data notification triggers and version."""
+    for table in PERFORMANCE_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_performance_data_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_performance_data_version()")
+    op.execute("DELETE FROM lookup_versions WHERE name = 'performance_data'")
@@ -0,0 +1,95 @@
+"""Version enrollment data for cached dashboard reports
+
+Revision ID: 20250109_001
+Revises: 20250108_001
+Create Date: 2025-01-09 10:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20250109_001"
+down_revision = "20250108_001"
+branch_labels = None
+depends_on = None
+
+# Tables read by each versioned dataset
+PERFORMANCE_TABLES = ["students", "enrollments", "schools", "assessments", "assessment_results", "subjects"]
+ENROLLMENT_TABLES = ["enrollments", "students", "schools", "divisions", "districts", "upazilas"]
+DATASET_TABLES = {"performance_data": PERFORMANCE_TABLES, "enrollment_data": ENROLLMENT_TABLES}
+
+
+def datasets_by_table():
+    """Map each table to the datasets it feeds, in the order they are bumped."""
+    datasets = {}
+    for name, tables in DATASET_TABLES.items():
+        for table in tables:
+            datasets.setdefault(table, []).append(name)
+    return datasets
+
+
+def upgrade():
+    """Version the enrollment data, with one trigger per table bumping every dataset the table feeds."""
+    op.execute("INSERT INTO lookup_versions (name) VALUES ('enrollment_data') ON CONFLICT DO NOTHING")
+
+    # Each trigger argument names a dataset, its lookup_versions row and its NOTIFY channel. The rows are
+    # updated inside the writing transaction, so a new version is only seen, and notified, once it commits.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+        DECLARE
+            new_version BIGINT;
+        BEGIN
+            FOR i IN 0 .. TG_NARGS - 1 LOOP
+                UPDATE lookup_versions SET version = version + 1, updated_at = now()
+                WHERE name = TG_ARGV[i]
+                RETURNING version INTO new_version;
+                PERFORM pg_notify(TG_ARGV[i], new_version::text);
+            END LOOP;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in PERFORMANCE_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_performance_data_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_performance_data_version()")
+
+    for table, datasets in datasets_by_table().items():
+        arguments = ", ".join(f"'{name}'" for name in datasets)
+        op.execute(
+            f"CREATE TRIGGER {table}_data_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version({arguments})"
+        )
+
+
+def downgrade():
+    """Drop the data version triggers and the enrollment data version, restoring the performance data triggers."""
+    for table in datasets_by_table():
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_data_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_data_version()")
+    op.execute("DELETE FROM lookup_versions WHERE name = 'enrollment_data'")
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_performance_data_version() RETURNS trigger AS $$
+        DECLARE
+            new_version BIGINT;
+        BEGIN
+            UPDATE lookup_versions SET version = version + 1, updated_at = now()
+            WHERE name = 'performance_data'
+            RETURNING version INTO new_version;
+            PERFORM pg_notify('performance_data', new_version::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in PERFORMANCE_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_performance_data_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_performance_data_version()"
+        )
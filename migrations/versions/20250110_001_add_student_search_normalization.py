@@ -0,0 +1,73 @@
+"""Add normalized trigram search indexes for the student list API
+
+Revision ID: 20250110_001
+Revises: 20250109_001
+Create Date: 2025-01-10 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20250110_001"
+down_revision = "20250109_001"
+branch_labels = None
+depends_on = None
+
+# Location columns of the API's student model searched by the list endpoint
+LOCATION_COLUMNS = ["division", "district"]
+
+
+def _student_columns():
+    return {column["name"] for column in sa.inspect(op.get_bind()).get_columns("students")}
+
+
+def upgrade():
+    """Create search_normalize() and index the normalized student name and location columns."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Must stay in step with database.search.normalize_search_text: khanda ta and the
+    # nukta letters get one spelling, Bangla digits become ASCII, zero-width joiners
+    # are dropped, then the text is lowercased and whitespace collapsed.
+    op.execute(
+        r"""
+        CREATE OR REPLACE FUNCTION search_normalize(value text) RETURNS text
+        LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+            SELECT btrim(regexp_replace(lower(translate(
+                replace(replace(replace(replace(value,
+                    U&'\09A4\09CD\200D', U&'\09CE'),
+                    U&'\09DC', U&'\09A1\09BC'),
+                    U&'\09DD', U&'\09A2\09BC'),
+                    U&'\09DF', U&'\09AF\09BC'),
+                U&'\09E6\09E7\09E8\09E9\09EA\09EB\09EC\09ED\09EE\09EF\200C\200D', '0123456789'
+            )), '\s+', ' ', 'g'))
+        $$
+        """
+    )
+
+    # The expressions must match the ones built by database.search for the indexes to apply
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_students_name_search_trgm ON students "
+        "USING gin (search_normalize(first_name || ' ' || last_name) gin_trgm_ops)"
+    )
+
+    existing = _student_columns()
+    for column in LOCATION_COLUMNS:
+        if column in existing:
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_students_{column}_search_trgm ON students "
+                f"USING gin (search_normalize({column}) gin_trgm_ops)"
+            )
+            # Whole-name matches compare the normalized column against every known spelling
+            op.execute(f"CREATE INDEX IF NOT EXISTS ix_students_{column}_normalized ON students (search_normalize({column}))")
+
+
+def downgrade():
+    """Drop the normalized search indexes and search_normalize()."""
+    for column in LOCATION_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_students_{column}_normalized")
+        op.execute(f"DROP INDEX IF EXISTS ix_students_{column}_search_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_students_name_search_trgm")
+    op.execute("DROP FUNCTION IF EXISTS search_normalize(text)")
@@ -0,0 +1,27 @@
+"""Add a security version to users for cached principals
+
+Revision ID: 20250111_001
+Revises: 20250110_001
+Create Date: 2025-01-11 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20250111_001"
+down_revision = "20250110_001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add users.security_version, bumped on password, role and status changes."""
+    op.add_column("users", sa.Column("security_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade():
+    """Drop users.security_version."""
+    op.drop_column("users", "security_version")
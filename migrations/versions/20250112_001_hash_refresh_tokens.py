@@ -0,0 +1,69 @@
+"""Store refresh tokens as SHA-256 digests and index them for revocation and cleanup
+
+Revision ID: 20250112_001
+Revises: 20250111_001
+Create Date: 2025-01-12 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20250112_001"
+down_revision = "20250111_001"
+branch_labels = None
+depends_on = None
+
+
+def _refresh_token_columns():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("refresh_tokens"):
+        return None
+    return {column["name"] for column in inspector.get_columns("refresh_tokens")}
+
+
+def upgrade():
+    """Replace refresh_tokens.token with its digest and add the revocation and expiry indexes."""
+    columns = _refresh_token_columns()
+    if columns is None:
+        op.create_table(
+            "refresh_tokens",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("token_hash", sa.String(64), nullable=False),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=True),
+        )
+    elif "token" in columns:
+        op.add_column("refresh_tokens", sa.Column("token_hash", sa.String(64), nullable=True))
+        op.execute("UPDATE refresh_tokens SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex')")
+        op.alter_column("refresh_tokens", "token_hash", nullable=False)
+        op.drop_column("refresh_tokens", "token")
+
+    op.create_index("ix_refresh_tokens_token_hash", "refresh_tokens", ["token_hash"], unique=True)
+    op.create_index(
+        "ix_refresh_tokens_user_id_revoked_at",
+        "refresh_tokens",
+        ["user_id", "revoked_at"],
+        postgresql_include=["expires_at"],
+    )
+    op.create_index("ix_refresh_tokens_expires_at", "refresh_tokens", ["expires_at"])
+
+
+def downgrade():
+    """Drop the digest indexes and restore the token column.
+
+    Digests cannot be turned back into tokens, so existing refresh tokens are
+    revoked and their users have to sign in again.
+    """
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_user_id_revoked_at", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_token_hash", table_name="refresh_tokens")
+    op.add_column("refresh_tokens", sa.Column("token", sa.String(512), nullable=True))
+    op.execute("UPDATE refresh_tokens SET token = token_hash, revoked_at = coalesce(revoked_at, now())")
+    op.alter_column("refresh_tokens", "token", nullable=False)
+    op.drop_column("refresh_tokens", "token_hash")
+    op.create_index("ix_refresh_tokens_token", "refresh_tokens", ["token"], unique=True)
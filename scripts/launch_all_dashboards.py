@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 """
 Launch script for all dashboards simultaneously
+
+Development mode runs each dashboard on its dev server. ``--production`` serves
+the Dash app with Gunicorn workers that fork from a warmed master, and runs
+Streamlit against the shared Redis cache instead of per-process caches.
 """
+import argparse
 import os
 import signal
 import subprocess
@@ -16,9 +21,20 @@ sys.path.insert(0, str(project_root))
 
 
 class DashboardLauncher:
-    def __init__(self):
+    def __init__(self, production=False, workers=None):
         self.processes = []
         self.running = True
+        self.production = production
+        self.workers = workers
+
+    def dashboard_env(self):
+        """Environment of the dashboard processes."""
+        env = os.environ.copy()
+        if self.production:
+            env["DASHBOARD_CACHE_BACKEND"] = "redis"
+            if self.workers:
+                env["DASHBOARD_WORKERS"] = str(self.workers)
+        return env
 
     def check_dependencies(self):
         """Check if all required dependencies are installed."""
@@ -33,6 +49,8 @@ class DashboardLauncher:
             "streamlit",
             "numpy",
         ]
+        if self.production:
+            required_packages += ["gunicorn", "pyarrow"]
 
         missing_packages = []
         for package in required_packages:
@@ -98,9 +116,24 @@ class DashboardLauncher:
 
         try:
             print("🚀 Starting Student Performance Dashboard...")
-            os.chdir(dashboard_path.parent)
 
-            process = subprocess.Popen([sys.executable, "app.py"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            if self.production:
+                command = [
+                    sys.executable,
+                    "-m",
+                    "gunicorn",
+                    "-c",
+                    str(dashboard_path.parent / "gunicorn.conf.py"),
+                    "dashboards.student_performance.app:server",
+                ]
+                cwd = project_root
+            else:
+                command = [sys.executable, "app.py"]
+                cwd = dashboard_path.parent
+
+            process = subprocess.Popen(
+                command, cwd=cwd, env=self.dashboard_env(), stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
 
             self.processes.append(("Performance Dashboard", process))
 
@@ -141,7 +174,9 @@ class DashboardLauncher:
                     "false",
                     "--server.headless",
                     "true",
-                ],
+                ]
+                + (["--server.fileWatcherType", "none", "--server.runOnSave", "false"] if self.production else []),
+                env=self.dashboard_env(),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
             )
@@ -189,6 +224,8 @@ class DashboardLauncher:
         """Launch all dashboards."""
         print("🎓 Bangladesh Education Data Warehouse - Dashboard Launcher")
         print("=" * 60)
+        if self.production:
+            print(f"🏭 Production mode: Gunicorn ({self.workers or 'default'} workers), shared Redis cache")
 
         # Check dependencies
         if not self.check_dependencies():
@@ -198,8 +235,9 @@ class DashboardLauncher:
         if not self.check_database_connection():
             sys.exit(1)
 
-        # Check Redis (optional)
-        self.check_redis_connection()
+        # Check Redis (optional, except for the shared cache in production)
+        if not self.check_redis_connection() and self.production:
+            print("⚠️ Streamlit will fall back to per-process caches")
 
         # Set up signal handlers
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -234,7 +272,16 @@ class DashboardLauncher:
 
 def main():
     """Main function."""
-    launcher = DashboardLauncher()
+    parser = argparse.ArgumentParser(description="Launch all dashboards")
+    parser.add_argument(
+        "--production",
+        action="store_true",
+        help="Serve with Gunicorn workers and the shared Redis cache instead of dev servers",
+    )
+    parser.add_argument("--workers", type=int, help="Gunicorn workers for the Dash app in production mode")
+    args = parser.parse_args()
+
+    launcher = DashboardLauncher(production=args.production, workers=args.workers)
     launcher.launch_all()
 
 
@@ -0,0 +1,37 @@
+"""
+Nightly forecast precomputation for the Enrollment Trends Dashboard
+Fits every forecasting method for the standard filter combinations and caches
+each horizon and confidence level so dashboard requests are cache hits.
+
+Scheduled as the last task of the nightly ``student_performance_etl`` Airflow
+DAG, after the dashboard cache is cleared.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from dashboards.enrollment_trends.data_service import enrollment_data_service  # noqa: E402
+
+
+def main():
+    """Precompute enrollment forecasts."""
+    if not enrollment_data_service.redis_client:
+        logger.error("❌ Redis is not available; precomputed forecasts would not be shared with the dashboards")
+        return 1
+
+    cached = enrollment_data_service.precompute_forecasts()
+    logger.info(f"✅ Cached {cached} enrollment forecasts")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,18 @@
 from datetime import timedelta
 
-from auth.models import Token, UserCreate, UserResponse, UserRole
+from auth.dependencies import get_current_active_user
+from auth.models import Token, UserCreate, UserInDB, UserResponse, UserRole
+from auth.password_hasher import password_hasher
 from auth.service import AuthService
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from middleware.request_validation import ParsedBodyRoute
 from models.user_model import UserDB
 from sqlalchemy.orm import Session
 
 from database.base import get_db
 
-router = APIRouter(prefix="/auth", tags=["authentication"])
+router = APIRouter(prefix="/auth", tags=["authentication"], route_class=ParsedBodyRoute)
 
 
 def get_auth_service():
@@ -46,8 +49,8 @@ async def register_user(user_create: UserCreate, db: Session = Depends(get_db)):
     if db.query(UserDB).filter(UserDB.email == user_create.email).first():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
-    # Hash the password
-    hashed_password = get_password_hash(user_create.password)
+    # Hash the password off the event loop
+    hashed_password = await password_hasher.hash(user_create.password)
 
     # Create new user
     db_user = UserDB(
@@ -1,21 +1,53 @@
+import io
+import uuid
 from datetime import date
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from auth.dependencies import admin_required, get_current_active_user, teacher_or_admin_required
 from auth.models import UserInDB, UserRole
-from fastapi import APIRouter, Depends, HTTPException, Query, Security, status
-from models.student import PaginatedStudentResponse, StudentCreate, StudentResponse, StudentUpdate
+from api.responses import model_response, rows_response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Security, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from infrastructure.persistence.pagination import InvalidCursorError, paginate
+from middleware.request_validation import ParsedBodyRoute
+from models.student import (
+    PaginatedStudentResponse,
+    StudentCreate,
+    StudentImportJob,
+    StudentImportResult,
+    StudentResponse,
+    StudentUpdate,
+)
 from models.student_model import Gender, StudentDB
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from database.base import get_async_db
+from database.search import location_match, location_names, location_search, normalize_search_text, student_name_search
 
-from database.base import get_db
+# Columns of StudentResponse, selected in its field order instead of whole ORM objects
+STUDENT_RESPONSE_FIELDS = tuple(StudentResponse.model_fields)
+STUDENT_RESPONSE_COLUMNS = [getattr(StudentDB, field) for field in STUDENT_RESPONSE_FIELDS]
 
 router = APIRouter(
     prefix="/api/students",
     tags=["students"],
     responses={404: {"description": "Not found"}},
+    route_class=ParsedBodyRoute,
 )
 
+# Orderings offered by the list endpoint; each column is always populated so it can key a cursor.
+# "relevance" orders name searches by their search rank.
+StudentSortField = Literal["id", "student_id", "last_name", "created_at", "relevance"]
+STUDENT_SORT_COLUMNS = {
+    "id": StudentDB.id,
+    "student_id": StudentDB.student_id,
+    "last_name": StudentDB.last_name,
+    "created_at": StudentDB.created_at,
+}
+
 
 @router.post(
     "/",
@@ -24,14 +56,15 @@ router = APIRouter(
     summary="Create a new student record",
     dependencies=[Depends(teacher_or_admin_required)],
 )
-async def create_student(student: StudentCreate, db: Session = Depends(get_db)):
+async def create_student(student: StudentCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new student record with the provided information.
     """
     # Check if student with same ID or email already exists
-    db_student = (
-        db.query(StudentDB).filter((StudentDB.student_id == student.student_id) | (StudentDB.email == student.email)).first()
+    result = await db.execute(
+        select(StudentDB).where(or_(StudentDB.student_id == student.student_id, StudentDB.email == student.email)).limit(1)
     )
+    db_student = result.scalars().first()
 
     if db_student:
         if db_student.student_id == student.student_id:
@@ -42,26 +75,121 @@ async def create_student(student: StudentCreate, db: Session = Depends(get_db)):
     # Create new student
     db_student = StudentDB(**student.dict())
     db.add(db_student)
-    db.commit()
-    db.refresh(db_student)
+    # Commit before responding: get_async_db only commits after the response is sent
+    await db.commit()
+    await db.refresh(db_student)
 
     return db_student
 
 
+@router.post(
+    "/import",
+    response_model=StudentImportResult,
+    responses={202: {"model": StudentImportJob, "description": "Import queued for a background worker"}},
+    summary="Import students in bulk",
+    dependencies=[Depends(teacher_or_admin_required)],
+)
+async def import_students(
+    request: Request,
+    mode: Literal["auto", "sync", "async"] = Query(
+        "auto", description="Import during the request or in the background; auto decides by body size"
+    ),
+    errors_only: bool = Query(False, description="Only report rows that were skipped or failed"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Create or update students from an NDJSON, CSV or Parquet body.
+
+    Rows are cleaned by the ETL student transformer, validated like single records
+    and upserted on ``student_id`` in batches, and the outcome of each row is reported.
+    Bodies up to ``STUDENT_IMPORT_SYNC_MAX_BYTES`` are imported during the request;
+    larger ones are queued and their result is read from ``/import/{job_id}``.
+    """
+    # pandas, pyarrow and Celery load on the first import rather than with the API
+    from data_processing.student_import import ImportFormatError, StudentImporter, detect_format
+
+    file_format = detect_format(request.headers.get("content-type", ""))
+    if file_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send students as application/x-ndjson, text/csv or application/vnd.apache.parquet",
+        )
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > settings.MAX_FILE_SIZE:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Import file too large")
+
+    small = len(body) <= settings.STUDENT_IMPORT_SYNC_MAX_BYTES
+    if mode == "sync" and not small:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Imports over {settings.STUDENT_IMPORT_SYNC_MAX_BYTES} bytes must run in the background",
+        )
+
+    if mode == "async" or (mode == "auto" and not small):
+        from data_processing.tasks import IMPORT_SPOOL_DIR, import_students_task
+
+        job_id = uuid.uuid4().hex
+        path = IMPORT_SPOOL_DIR / f"{job_id}.{file_format}"
+
+        def spool():
+            IMPORT_SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(body)
+            import_students_task.apply_async(args=[str(path), file_format, errors_only], task_id=job_id)
+
+        await run_in_threadpool(spool)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED, content=StudentImportJob(job_id=job_id, status="pending").model_dump()
+        )
+
+    try:
+        result = await StudentImporter(db, errors_only=errors_only).run(io.BytesIO(body), file_format)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    # The outcomes reported must be committed before the response is sent
+    await db.commit()
+    return result
+
+
+@router.get(
+    "/import/{job_id}",
+    response_model=StudentImportJob,
+    summary="Get the status of a background student import",
+    dependencies=[Depends(teacher_or_admin_required)],
+)
+async def read_import_job(job_id: uuid.UUID):
+    """
+    Report a queued import's progress, and its per-row outcomes once it has finished.
+    """
+    from data_processing.tasks import import_students_task
+
+    task = import_students_task.AsyncResult(job_id.hex)
+    state = await run_in_threadpool(lambda: task.state)
+    job = StudentImportJob(job_id=job_id.hex, status=state.lower())
+    if state == "SUCCESS":
+        job.result = StudentImportResult.model_validate(task.result)
+    elif state == "FAILURE":
+        job.error = str(task.result)
+    return job
+
+
 @router.get(
     "/{student_id}",
     response_model=StudentResponse,
     summary="Get a student by ID",
     dependencies=[Depends(get_current_active_user)],
 )
-async def read_student(student_id: str, db: Session = Depends(get_db)):
+async def read_student(student_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Retrieve a student's information by their unique student ID.
     """
-    db_student = db.query(StudentDB).filter(StudentDB.student_id == student_id).first()
-    if db_student is None:
+    result = await db.execute(select(*STUDENT_RESPONSE_COLUMNS).where(StudentDB.student_id == student_id))
+    row = result.first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Student not found")
-    return db_student
+    return model_response(StudentResponse.model_validate(row))
 
 
 @router.get(
@@ -71,34 +199,78 @@ async def read_student(student_id: str, db: Session = Depends(get_db)):
     dependencies=[Depends(get_current_active_user)],
 )
 async def list_students(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(100, le=1000, description="Maximum number of records to return"),
-    name: Optional[str] = Query(None, description="Filter by student name"),
-    division: Optional[str] = Query(None, description="Filter by division"),
-    district: Optional[str] = Query(None, description="Filter by district"),
+    cursor: Optional[str] = Query(None, description="Continuation token from the previous page's next_cursor"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    sort: Optional[StudentSortField] = Query(
+        None, description="Field to order students by; defaults to relevance for name searches, otherwise id"
+    ),
+    order: Optional[Literal["asc", "desc"]] = Query(
+        None, description="Sort direction; defaults to best matches first for relevance, otherwise ascending"
+    ),
+    include_total: bool = Query(False, description="Count all matching students exactly"),
+    estimate_total: bool = Query(False, description="Estimate the number of matching students from planner statistics"),
+    name: Optional[str] = Query(None, description="Search student names, in English or Bangla"),
+    division: Optional[str] = Query(None, description="Filter by division name or part of it"),
+    district: Optional[str] = Query(None, description="Filter by district name or part of it"),
     gender: Optional[Gender] = Query(None, description="Filter by gender"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Retrieve a paginated list of students with optional filtering.
+    Retrieve a page of students with optional filtering.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the following page,
+    keeping the same filters and ordering. The total is only computed on request.
+    Name searches match substrings and close spellings and can be ordered by relevance;
+    whole division or district names match any known spelling of the place.
     """
-    query = db.query(StudentDB)
+    query = select(*STUDENT_RESPONSE_COLUMNS)
+    name = normalize_search_text(name) if name else ""
+    rank = None
 
     # Apply filters
     if name:
-        query = query.filter((StudentDB.first_name.ilike(f"%{name}%")) | (StudentDB.last_name.ilike(f"%{name}%")))
-    if division:
-        query = query.filter(StudentDB.division.ilike(f"%{division}%"))
-    if district:
-        query = query.filter(StudentDB.district.ilike(f"%{district}%"))
+        condition, rank = student_name_search(StudentDB.first_name, StudentDB.last_name, name)
+        query = query.where(condition)
+    for kind, column, value in (("division", StudentDB.division, division), ("district", StudentDB.district, district)):
+        if not value:
+            continue
+        spellings = await location_names.spellings(db, kind, value)
+        query = query.where(location_match(column, spellings) if spellings else location_search(column, value))
     if gender:
-        query = query.filter(StudentDB.gender == gender)
+        query = query.where(StudentDB.gender == gender)
 
-    # Get total count and paginated results
-    total = query.count()
-    students = query.offset(skip).limit(limit).all()
+    sort = sort or ("relevance" if rank is not None else "id")
+    if sort == "relevance" and rank is None:
+        raise HTTPException(status_code=400, detail="Sorting by relevance requires a name search")
+    order = order or ("desc" if sort == "relevance" else "asc")
+    sort_column = rank if sort == "relevance" else STUDENT_SORT_COLUMNS[sort]
 
-    return {"total": total, "skip": skip, "limit": limit, "items": students}
+    try:
+        page = await paginate(
+            db,
+            query,
+            # Relevance cursors are only valid for the search they were issued for
+            sort=f"{sort}:{order}:{name}" if sort == "relevance" else f"{sort}:{order}",
+            sort_column=sort_column,
+            id_column=StudentDB.id,
+            limit=limit,
+            cursor=cursor,
+            descending=order == "desc",
+            include_total=include_total,
+            estimate_total=estimate_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Rows of the selected columns are written out as they are, without validating each against StudentResponse
+    return rows_response(
+        page,
+        STUDENT_RESPONSE_FIELDS,
+        total=page.total,
+        total_is_estimate=page.total_is_estimate,
+        limit=limit,
+        next_cursor=page.next_cursor,
+    )
 
 
 @router.put(
@@ -107,11 +279,12 @@ async def list_students(
     summary="Update a student's information",
     dependencies=[Depends(teacher_or_admin_required)],
 )
-async def update_student(student_id: str, student_update: StudentUpdate, db: Session = Depends(get_db)):
+async def update_student(student_id: str, student_update: StudentUpdate, db: AsyncSession = Depends(get_async_db)):
     """
     Update a student's information by their ID.
     """
-    db_student = db.query(StudentDB).filter(StudentDB.student_id == student_id).first()
+    result = await db.execute(select(StudentDB).where(StudentDB.student_id == student_id))
+    db_student = result.scalars().first()
     if db_student is None:
         raise HTTPException(status_code=404, detail="Student not found")
 
@@ -120,9 +293,8 @@ async def update_student(student_id: str, student_update: StudentUpdate, db: Ses
     for field, value in update_data.items():
         setattr(db_student, field, value)
 
-    db.add(db_student)
-    db.commit()
-    db.refresh(db_student)
+    await db.commit()
+    await db.refresh(db_student)
 
     return db_student
 
@@ -133,15 +305,13 @@ async def update_student(student_id: str, student_update: StudentUpdate, db: Ses
     summary="Delete a student record",
     dependencies=[Depends(admin_required)],
 )
-async def delete_student(student_id: str, db: Session = Depends(get_db)):
+async def delete_student(student_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Delete a student record by ID.
     """
-    db_student = db.query(StudentDB).filter(StudentDB.student_id == student_id).first()
-    if db_student is None:
+    result = await db.execute(delete(StudentDB).where(StudentDB.student_id == student_id))
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Student not found")
-
-    db.delete(db_student)
-    db.commit()
+    await db.commit()
 
     return {"ok": True}
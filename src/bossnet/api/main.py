@@ -3,12 +3,16 @@ Main FastAPI application for Bangladesh Student Data API
 """
 
 import logging
-import os
+from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 # Import all routers
 from api.endpoints import auth, students
-from auth.service import AuthService
+from api.responses import ORJSONResponse
+from audit.audit_service import audit_writer
+from auth.password_hasher import password_hasher
+from auth.token_reaper import refresh_token_reaper
 from config.security import security_settings
 from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
@@ -16,15 +20,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.security import OAuth2PasswordBearer
 from fastapi.staticfiles import StaticFiles
-from middleware.request_validation import RequestValidationMiddleware
 
 # Import security middleware
-from middleware.security_headers import SecurityHeadersMiddleware, setup_security_middleware
+from middleware.security_headers import setup_security_middleware
 
 from config import settings
-from database.base import Base, engine, get_db
+from database.base import dispose_database, init_database
 
 # Configure logging
 logging.basicConfig(
@@ -34,39 +36,40 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create database tables
-try:
-    Base.metadata.create_all(bind=engine)
-except Exception as e:
-    logger.error(f"Error creating database tables: {str(e)}")
-    raise
+STATIC_DIR = Path("static")
 
-# Configure logging
-logging.basicConfig(level=settings.LOG_LEVEL)
-logger = logging.getLogger(__name__)
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
-# Initialize auth service
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token", auto_error=False)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect to the database and start the background tasks; the schema is migrated by Alembic beforehand"""
+    init_database()
+    STATIC_DIR.mkdir(exist_ok=True)
+    refresh_token_reaper.start()
+    audit_writer.start()
+    try:
+        yield
+    finally:
+        await refresh_token_reaper.stop()
+        # Write the queued audit events before the engines are closed
+        await audit_writer.stop()
+        await dispose_database()
 
-auth_service = AuthService(secret_key=settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 # Create FastAPI application
 app = FastAPI(
-    title=settings.APP_NAME,
+    title=settings.PROJECT_NAME,
     description="REST API for managing and analyzing student data in Bangladesh",
     version="1.0.0",
     docs_url=None,  # We'll serve custom docs
     redoc_url=None,  # We'll serve custom ReDoc
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     debug=settings.DEBUG,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# Configure static files
-os.makedirs("static", exist_ok=True)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Configure static files; the directory is created on startup
+app.mount("/static", StaticFiles(directory=STATIC_DIR, check_dir=False), name="static")
 
 # Configure CORS
 app.add_middleware(
@@ -78,14 +81,7 @@ app.add_middleware(
     expose_headers=["Content-Disposition"],
 )
 
-# Add security middleware
-if security_settings.ENABLE_SECURITY_HEADERS:
-    app.add_middleware(SecurityHeadersMiddleware)
-
-if security_settings.ENABLE_REQUEST_VALIDATION:
-    app.add_middleware(RequestValidationMiddleware)
-
-# Setup additional security middleware
+# Add security headers, request validation, rate limiting, compression and host checks
 setup_security_middleware(app)
 
 # Include routers
@@ -159,6 +155,24 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/password-hasher", tags=["health"])
+async def password_hasher_health():
+    """Queue depth, waits and refusals of the password hashing pool"""
+    return password_hasher.metrics.snapshot()
+
+
+@app.get("/health/refresh-tokens", tags=["health"])
+async def refresh_tokens_health():
+    """Size of the refresh token table and progress of the expired token cleanup"""
+    return await refresh_token_reaper.stats()
+
+
+@app.get("/health/audit-writer", tags=["health"])
+async def audit_writer_health():
+    """Queue depth, drops and spooled events of the audit log writer"""
+    return audit_writer.stats()
+
+
 # Root endpoint
 @app.get("/", include_in_schema=False)
 async def root():
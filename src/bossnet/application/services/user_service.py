@@ -2,10 +2,11 @@
 User service - Application layer
 """
 
-from typing import List, Optional
+from typing import Optional
 
 from src.core.domain.entities.user import User
 from src.core.domain.repositories.user_repository import UserRepositoryInterface
+from src.infrastructure.persistence.pagination import Page
 
 
 class UserService:
@@ -40,9 +41,18 @@ class UserService:
 
         return await self._user_repository.update(user)
 
-    async def list_users(self, skip: int = 0, limit: int = 100) -> List[User]:
+    async def list_users(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        estimate_total: bool = False,
+    ) -> Page[User]:
         """List users with pagination"""
-        return await self._user_repository.list_users(skip=skip, limit=limit)
+        return await self._user_repository.list_users(
+            skip=skip, limit=limit, cursor=cursor, include_total=include_total, estimate_total=estimate_total
+        )
 
     async def delete_user(self, user_id: int) -> bool:
         """Delete user"""
@@ -5,11 +5,13 @@ Tracks all security-relevant events and user actions
 
 import hashlib
 import json
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union
 from uuid import uuid4
 
+from audit.audit_writer import AuditWriter
 from config.settings import settings
 from fastapi import Request
 from pydantic import BaseModel, Field
@@ -103,6 +105,10 @@ class AuditEventModel(Base):
         return self.checksum == self.calculate_checksum()
 
 
+# Columns the audit writer inserts; ids are assigned by the database
+AUDIT_EVENT_COLUMNS = [column.key for column in AuditEventModel.__table__.columns if column.key != "id"]
+
+
 class AuditSearchRequest(BaseModel):
     """Audit search request parameters"""
 
@@ -223,11 +229,11 @@ class AuditService:
         request: Optional[Request] = None,
         db: Optional[Session] = None,
     ) -> AuditEventModel:
-        """Log an audit event"""
+        """Log an audit event
 
-        # Get database session
-        if not db:
-            db = next(get_db())
+        The event is queued and inserted by the audit writer with others, in its
+        own transaction; ``db`` is not used and only kept for existing callers.
+        """
 
         # Extract request context
         request_context = self._extract_request_context(request)
@@ -235,8 +241,9 @@ class AuditService:
         # Sanitize details
         sanitized_details = self._sanitize_data(details) if details else None
 
-        # Create audit event
+        # Create audit event, with the values the checksum covers set before it is computed
         audit_event = AuditEventModel(
+            event_id=uuid4(),
             event_type=event_type,
             action=action,
             severity=severity,
@@ -247,6 +254,7 @@ class AuditService:
             details=sanitized_details,
             success=success,
             error_message=error_message,
+            timestamp=datetime.utcnow(),
             correlation_id=correlation_id,
             **request_context,
         )
@@ -254,23 +262,14 @@ class AuditService:
         # Calculate checksum for integrity
         audit_event.checksum = audit_event.calculate_checksum()
 
-        # Save to database
-        try:
-            db.add(audit_event)
-            db.commit()
-            db.refresh(audit_event)
-
-            # Log critical events to external systems if configured
-            if severity == AuditSeverity.CRITICAL.value:
-                await self._send_critical_alert(audit_event)
+        # Queue for the next batch insert
+        audit_writer.submit({name: getattr(audit_event, name) for name in AUDIT_EVENT_COLUMNS})
 
-            return audit_event
+        # Log critical events to external systems if configured
+        if severity == AuditSeverity.CRITICAL.value:
+            await self._send_critical_alert(audit_event)
 
-        except Exception as e:
-            db.rollback()
-            # Log to application logs as fallback
-            print(f"Failed to save audit event: {e}")
-            raise
+        return audit_event
 
     async def _send_critical_alert(self, event: AuditEventModel):
         """Send alert for critical security events"""
@@ -479,7 +478,9 @@ class AuditService:
     ) -> AuditStatistics:
         """Get audit statistics for dashboard"""
         if not db:
-            db = next(get_db())
+            # Open a session for this call and close it afterwards
+            with contextmanager(get_db)() as db:
+                return self.get_audit_statistics(start_date, end_date, db)
 
         query = db.query(AuditEventModel)
 
@@ -532,7 +533,9 @@ class AuditService:
     async def cleanup_old_events(self, retention_days: int = 365, db: Session = None):
         """Clean up old audit events based on retention policy"""
         if not db:
-            db = next(get_db())
+            # Open a session for this call and close it afterwards
+            with contextmanager(get_db)() as db:
+                return await self.cleanup_old_events(retention_days, db)
 
         cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
 
@@ -551,7 +554,6 @@ class AuditService:
                 "cutoff_date": cutoff_date.isoformat(),
             },
             severity=AuditSeverity.LOW.value,
-            db=db,
         )
 
         return deleted_count
@@ -617,3 +619,7 @@ class AuditService:
             suspicious_activities.append({"type": "multiple_mfa_failures", "count": mfa_failures, "severity": "high"})
 
         return suspicious_activities
+
+
+# Shared writer inserting queued audit events in batches
+audit_writer = AuditWriter(AuditEventModel.__table__)
@@ -0,0 +1,294 @@
+"""
+Batched audit log writes in the background.
+
+Audit events are queued in memory and inserted by a background task, so
+logging one costs a request neither a commit nor a connection. The task
+writes what has queued with one multi-row INSERT as soon as
+``AUDIT_BATCH_SIZE`` events are waiting, or ``AUDIT_FLUSH_INTERVAL_MS`` after
+the first of them arrived. The queue holds at most ``AUDIT_QUEUE_SIZE``
+events; when it is full new events are dropped and counted rather than
+slowing every request down.
+
+Batches that cannot be written, e.g. while the database is down, are appended
+to ``AUDIT_SPOOL_FILE`` as JSON lines and synced to disk, and the spool is
+replayed once writes succeed again. Inserts skip event IDs already stored, so
+a batch written twice is only stored once. If the background task dies, the
+next event restarts it on the same queue, and the rows the dead task had
+taken or left queued are spooled first, so none are lost.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Table
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from config import settings
+from database import base as database
+
+logger = logging.getLogger(__name__)
+
+# Spooled values restored from their JSON strings by column type
+DECODERS = {uuid.UUID: uuid.UUID, datetime: datetime.fromisoformat}
+
+
+class AuditWriter:
+    """Inserts rows into a table in batches from a bounded in-memory queue."""
+
+    def __init__(
+        self,
+        table: Table,
+        unique_key: str = "event_id",
+        session_factory=None,
+        max_queue: int = settings.AUDIT_QUEUE_SIZE,
+        batch_size: int = settings.AUDIT_BATCH_SIZE,
+        flush_interval: float = settings.AUDIT_FLUSH_INTERVAL_MS / 1000,
+        spool_path: Path = Path(settings.AUDIT_SPOOL_FILE),
+    ):
+        self.table = table
+        self._session_factory = session_factory
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self._statement = pg_insert(table).on_conflict_do_nothing(index_elements=[unique_key])
+        self._decoders = {}
+        for column in table.columns:
+            try:
+                decoder = DECODERS.get(column.type.python_type)
+            except NotImplementedError:
+                decoder = None
+            if decoder:
+                self._decoders[column.name] = decoder
+
+        self.submitted = 0
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.spooled = 0
+        self.replayed = 0
+        self.failed_writes = 0
+        self.max_depth = 0
+        self.last_write_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._filled: Optional[asyncio.Event] = None
+        # Rows taken off the queue and not yet written
+        self._batch: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def session_factory(self):
+        if self._session_factory is not None:
+            return self._session_factory
+        if database.AsyncSessionLocal is None:
+            database.init_database()
+        return database.AsyncSessionLocal
+
+    def submit(self, row: Dict[str, Any]) -> bool:
+        """Queue a row to be written, starting the writer if needed; False if the queue is full and it was dropped."""
+        self.start()
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"Audit queue is full, {self.dropped} events dropped so far")
+            return False
+        self.submitted += 1
+        depth = self._queue.qsize()
+        self.max_depth = max(self.max_depth, depth)
+        if depth >= self.batch_size - 1:
+            self._filled.set()
+        return True
+
+    async def _collect(self) -> None:
+        """Wait for a row, then take more until a batch is full or the flush interval has passed."""
+        self._batch.append(await self._queue.get())
+        if self._queue.qsize() < self.batch_size - 1:
+            self._filled.clear()
+            try:
+                await asyncio.wait_for(self._filled.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+        while len(self._batch) < self.batch_size and not self._queue.empty():
+            self._batch.append(self._queue.get_nowait())
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> bool:
+        """Insert rows with one statement, spooling them if that fails."""
+        started = time.perf_counter()
+        try:
+            async with self.session_factory() as session:
+                async with session.begin():
+                    await session.execute(self._statement, rows)
+        except Exception as e:
+            self.failed_writes += 1
+            self.last_error = str(e)
+            logger.error(f"Could not write {len(rows)} audit events, spooling them: {e}")
+            await asyncio.get_running_loop().run_in_executor(None, self._spool, rows)
+            return False
+        self.written += len(rows)
+        self.batches += 1
+        self.last_write_ms = (time.perf_counter() - started) * 1000
+        return True
+
+    def _spool(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        try:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.spool_path, "a", encoding="utf-8") as spool:
+                spool.writelines(json.dumps(row, default=str) + "\n" for row in rows)
+                spool.flush()
+                os.fsync(spool.fileno())
+        except OSError as e:
+            self.dropped += len(rows)
+            logger.error(f"Could not spool {len(rows)} audit events, they are lost: {e}")
+        else:
+            self.spooled += len(rows)
+
+    def _decode(self, line: str) -> Dict[str, Any]:
+        row = json.loads(line)
+        for name, decoder in self._decoders.items():
+            if row.get(name) is not None:
+                row[name] = decoder(row[name])
+        return row
+
+    def _claim(self, path: Path) -> Optional[Tuple[Path, List[Dict[str, Any]]]]:
+        """Take a spool file for this process and read its rows, or None if another process took it first."""
+        claimed = path.with_name(f"{self.spool_path.name}.{uuid.uuid4().hex}.replay")
+        try:
+            os.replace(path, claimed)
+            with open(claimed, encoding="utf-8") as spool:
+                lines = [line for line in spool if line.strip()]
+        except FileNotFoundError:
+            return None
+        rows = []
+        for line in lines:
+            try:
+                rows.append(self._decode(line))
+            except ValueError:
+                # A line cut short when the process died while spooling
+                self.dropped += 1
+                logger.error(f"Skipping an unreadable spooled audit event: {line[:200]!r}")
+        return claimed, rows
+
+    async def _replay(self, recover: bool = False) -> None:
+        """Write the spooled rows; those that still fail go back to the spool.
+
+        A claimed file is deleted once its rows are written or spooled again, so
+        with ``recover`` the files left behind by a process that stopped mid-replay
+        are taken too.
+        """
+        paths = [self.spool_path]
+        if recover:
+            paths += self.spool_path.parent.glob(f"{self.spool_path.name}.*.replay")
+        loop = asyncio.get_running_loop()
+        for path in paths:
+            claim = await loop.run_in_executor(None, self._claim, path)
+            if claim is None:
+                continue
+            claimed, rows = claim
+            logger.info(f"Replaying {len(rows)} spooled audit events")
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start : start + self.batch_size]
+                if not await self._write(batch):
+                    await loop.run_in_executor(None, self._spool, rows[start + self.batch_size :])
+                    break
+                self.replayed += len(batch)
+            try:
+                claimed.unlink()
+            except FileNotFoundError:
+                pass  # taken over by another process recovering claims
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        rows, self._batch = self._batch, []
+        while self._queue is not None and not self._queue.empty():
+            rows.append(self._queue.get_nowait())
+        return rows
+
+    async def _run_forever(self, orphaned: Optional[List[Dict[str, Any]]] = None):
+        try:
+            if orphaned:
+                # Left behind by a task that died; the replay below writes them
+                await asyncio.get_running_loop().run_in_executor(None, self._spool, orphaned)
+            await self._replay(recover=True)
+            while True:
+                await self._collect()
+                written = await self._write(self._batch)
+                self._batch = []
+                if written and self.spool_path.exists():
+                    await self._replay()
+        except asyncio.CancelledError:
+            if not self._stopping:
+                # The event loop is closing without stop(): keep the queued events on disk
+                self._spool(self._drain())
+            raise
+
+    def start(self):
+        """Start writing in the background on the running event loop, restarting the task if it died."""
+        if self._task is not None and not self._task.done():
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._filled = asyncio.Event()
+
+        orphaned = None
+        if self._task is not None:
+            if self._task.cancelled():
+                logger.error("Audit writer task was cancelled, restarting it")
+            else:
+                error = self._task.exception()
+                logger.error(f"Audit writer task ended unexpectedly, restarting it: {error!r}", exc_info=error)
+            orphaned = self._drain()
+        self._task = asyncio.get_running_loop().create_task(self._run_forever(orphaned), name="audit-writer")
+
+    async def stop(self):
+        """Write the queued rows and stop the background task."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Audit writer task ended unexpectedly: {e!r}", exc_info=e)
+        finally:
+            self._task = None
+            self._stopping = False
+        rows = self._drain()
+        for start in range(0, len(rows), self.batch_size):
+            await self._write(rows[start : start + self.batch_size])
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the queue depth and how many rows were written, dropped and spooled."""
+        try:
+            spool_bytes = self.spool_path.stat().st_size
+        except FileNotFoundError:
+            spool_bytes = 0
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self.max_depth,
+            "queue_size": self.max_queue,
+            "submitted": self.submitted,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "spooled": self.spooled,
+            "replayed": self.replayed,
+            "failed_writes": self.failed_writes,
+            "spool_bytes": spool_bytes,
+            "last_write_ms": self.last_write_ms,
+            "last_error": self.last_error,
+        }
@@ -3,34 +3,27 @@ Authentication and authorization module for the application.
 
 This module provides user authentication, authorization, and user management functionality.
 It includes JWT token handling, password hashing, role-based access control, and email notifications.
+
+Components are imported on first use, so importing one auth module does not
+load the services, their database models and the email templates.
 """
 
-from .dependencies import (
-    get_current_active_superuser,
-    get_current_active_user,
-    get_current_user,
-    get_password_hash,
-    verify_password,
-)
-from .email_service import EmailService, EmailTemplate
+from importlib import import_module
 
-# Import key components for easier access
-from .models import (
-    EmailVerification,
-    Message,
-    NewPassword,
-    PasswordChange,
-    PasswordReset,
-    Token,
-    TokenData,
-    TokenPayload,
-    UserCreate,
-    UserInDB,
-    UserResponse,
-    UserRole,
-    UserUpdate,
-)
-from .service import AuthService
+_COMPONENTS = {
+    "AuthService": ".service",
+    "EmailService": ".email_service",
+    "EmailTemplate": ".email_service",
+    "Token": ".models",
+    "TokenData": ".models",
+    "TokenPayload": ".models",
+    "UserCreate": ".models",
+    "UserInDB": ".models",
+    "UserResponse": ".models",
+    "UserRole": ".models",
+    "get_current_user": ".dependencies",
+    "get_current_active_user": ".dependencies",
+}
 
 __all__ = [
     "AuthService",
@@ -42,16 +35,13 @@ __all__ = [
     "UserInDB",
     "UserResponse",
     "UserRole",
-    "UserUpdate",
-    "PasswordReset",
-    "PasswordChange",
-    "EmailVerification",
-    "Message",
-    "NewPassword",
     "TokenPayload",
     "get_current_user",
     "get_current_active_user",
-    "get_current_active_superuser",
-    "get_password_hash",
-    "verify_password",
 ]
+
+
+def __getattr__(name):
+    if name not in _COMPONENTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_COMPONENTS[name], __name__), name)
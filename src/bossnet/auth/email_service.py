@@ -6,8 +6,6 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-
 from config import settings
 
 
@@ -25,12 +23,11 @@ class EmailService:
     """Service for sending emails with templates"""
 
     def __init__(self):
-        # Set up Jinja2 environment
-        template_path = Path(__file__).parent / "templates"
-        self.env = Environment(loader=FileSystemLoader(template_path), autoescape=select_autoescape(["html", "xml"]))
+        # Jinja2 environment, set up when the first email is rendered
+        self._env = None
 
         # Email settings
-        self.smtp_server = settings.SMTP_SERVER
+        self.smtp_server = settings.SMTP_HOST
         self.smtp_port = settings.SMTP_PORT
         self.smtp_username = settings.SMTP_USERNAME
         self.smtp_password = settings.SMTP_PASSWORD
@@ -38,6 +35,16 @@ class EmailService:
         self.smtp_from = settings.EMAILS_FROM_EMAIL
         self.smtp_from_name = settings.EMAILS_FROM_NAME
 
+    @property
+    def env(self):
+        """Jinja2 environment loading the email templates"""
+        if self._env is None:
+            from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+            template_path = Path(__file__).parent / "templates"
+            self._env = Environment(loader=FileSystemLoader(template_path), autoescape=select_autoescape(["html", "xml"]))
+        return self._env
+
     def send_email(
         self,
         to_email: str,
@@ -163,3 +170,7 @@ class EmailService:
                 "support_email": settings.EMAILS_FROM_EMAIL,
             },
         )
+
+
+# Shared by the auth services, so the templates are loaded once rather than per request
+email_service = EmailService()
@@ -14,7 +14,7 @@ from urllib.parse import quote
 import pyotp
 import qrcode
 from audit.audit_service import AuditService
-from auth.email_service import EmailService
+from auth.email_service import email_service
 from config.settings import settings
 from fastapi import HTTPException, status
 from models.user import UserModel
@@ -111,7 +111,7 @@ class MFAService:
     """Multi-Factor Authentication service"""
 
     def __init__(self):
-        self.email_service = EmailService()
+        self.email_service = email_service
         self.audit_service = AuditService()
 
         # Initialize Twilio client if configured
@@ -2,12 +2,11 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union
 
-from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr, Field, HttpUrl, root_validator, validator
 from pydantic.class_validators import root_validator
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing runs in a bounded worker pool
+from .password_hasher import password_hasher, pwd_context  # noqa: F401
 
 
 class TokenBase(BaseModel):
@@ -100,11 +99,11 @@ class UserResponse(UserBase):
 class PasswordMixin:
     @classmethod
     def verify_password(cls, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+        return password_hasher.verify_sync(plain_password, hashed_password)
 
     @classmethod
     def get_password_hash(cls, password: str) -> str:
-        return pwd_context.hash(password)
+        return password_hasher.hash_sync(password)
 
     @classmethod
     def generate_reset_token(cls, user_id: int) -> str:
@@ -128,10 +127,6 @@ class PasswordMixin:
             return None
 
 
-# Initialize password context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)  # Increased for better security
-
-
 def create_access_token(
     data: dict, secret_key: str, expires_delta: Optional[timedelta] = None, algorithm: str = "HS256"
 ) -> str:
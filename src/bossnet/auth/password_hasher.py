@@ -0,0 +1,185 @@
+"""
+Password hashing off the event loop.
+
+bcrypt takes a few hundred milliseconds per hash at the configured cost, so
+hashing and verification run in a dedicated thread pool (bcrypt releases the
+GIL while it works) instead of on the event loop. The pool is small and its
+queue bounded: when more operations are pending than ``max_pending``, new ones
+are refused with 503 and a ``Retry-After`` header instead of piling up, and
+the pool reports queue waits, run times and refusals.
+
+Hashes below the configured cost are flagged by ``pwd_context`` as needing an
+update, so a successful login returns a fresh hash to store and cost factors
+can be raised without forcing password resets.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Shared password context; hashes with fewer rounds than configured are rehashed on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
+
+# Seconds clients are asked to wait when the pool is saturated
+RETRY_AFTER_SECONDS = 1
+
+
+class PasswordHasherMetrics:
+    """Queueing and run time statistics of the password hashing pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.cancelled = 0
+        self.pending = 0
+        self.max_pending_seen = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    def submitted(self) -> None:
+        with self._lock:
+            self.pending += 1
+            self.max_pending_seen = max(self.max_pending_seen, self.pending)
+
+    def finished(self, wait: float, run: float) -> None:
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.total_run += run
+
+    def withdrawn(self) -> None:
+        """Count an operation cancelled while it was still queued."""
+        with self._lock:
+            self.pending -= 1
+            self.cancelled += 1
+
+    def refused(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the current statistics."""
+        with self._lock:
+            return {
+                "pending": self.pending,
+                "max_pending": self.max_pending_seen,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "cancelled": self.cancelled,
+                "avg_wait_ms": self.total_wait / self.completed * 1000 if self.completed else 0.0,
+                "max_wait_ms": self.max_wait * 1000,
+                "avg_run_ms": self.total_run / self.completed * 1000 if self.completed else 0.0,
+            }
+
+
+class PasswordHasher:
+    """Runs password hashing and verification in a bounded worker pool."""
+
+    def __init__(
+        self,
+        context: CryptContext = pwd_context,
+        workers: int = settings.PASSWORD_HASH_WORKERS,
+        max_pending: int = settings.PASSWORD_HASH_MAX_PENDING,
+    ):
+        self.context = context
+        self.workers = workers
+        self.max_pending = max_pending
+        self.metrics = PasswordHasherMetrics()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hasher")
+        return self._executor
+
+    def _timed(self, queued_at: float, function, *args):
+        started = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.metrics.finished(started - queued_at, time.perf_counter() - started)
+            self._slots.release()
+
+    def _acquire_slot(self):
+        if not self._slots.acquire(blocking=False):
+            self.metrics.refused()
+            logger.warning(f"Password hashing pool saturated with {self.max_pending} pending operations")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent sign-ins, please retry shortly",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+        self.metrics.submitted()
+
+    def _release_unrun(self):
+        self.metrics.withdrawn()
+        self._slots.release()
+
+    def _release_if_cancelled(self, future: Future):
+        # A job cancelled before it started never reaches _timed, which releases the others
+        if future.cancelled():
+            self._release_unrun()
+
+    def _submit(self, function, *args) -> Future:
+        self._acquire_slot()
+        try:
+            future = self.executor.submit(self._timed, time.perf_counter(), function, *args)
+        except BaseException:
+            self._release_unrun()
+            raise
+        future.add_done_callback(self._release_if_cancelled)
+        return future
+
+    async def _run(self, function, *args):
+        # Cancelling the awaiting task cancels the job too if it has not started yet
+        return await asyncio.wrap_future(self._submit(function, *args))
+
+    def _run_sync(self, function, *args):
+        return self._submit(function, *args).result()
+
+    async def hash(self, password: str) -> str:
+        """Hash a password."""
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Check a password against its hash."""
+        return await self._run(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Check a password and get a new hash to store when the old one uses outdated settings."""
+        return await self._run(self.context.verify_and_update, password, hashed_password)
+
+    def hash_sync(self, password: str) -> str:
+        """Hash a password from synchronous code, still bounded by the pool."""
+        return self._run_sync(self.context.hash, password)
+
+    def verify_sync(self, password: str, hashed_password: str) -> bool:
+        """Check a password from synchronous code, still bounded by the pool."""
+        return self._run_sync(self.context.verify, password, hashed_password)
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,166 @@
+"""
+Cache of authenticated principals.
+
+Access tokens carry the user's security version (``sv`` claim). The user
+loaded for a token is cached under (user id, security version) in a small
+in-process LRU with a short TTL, backed by Redis with a longer one, so a
+request with a valid token authenticates without querying the database.
+
+Changing a user's password, role or active flag bumps their security version
+(see ``models.user_model``). After the change commits, the cached principal is
+evicted and the new version is recorded in Redis as the minimum accepted one,
+so tokens issued before the change stop working everywhere. Other processes'
+local entries live at most ``AUTH_PRINCIPAL_LOCAL_TTL`` seconds longer.
+Commits made while an event loop is running record the new version from a
+worker thread, so the blocking Redis call never stalls the loop.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from config import settings
+
+from .models import UserInDB
+
+logger = logging.getLogger(__name__)
+
+# Secrets never written to the cache; restored principals carry these blanks instead
+SECRET_FIELD_BLANKS = {"hashed_password": "", "email_verification_token": None, "reset_password_token": None}
+
+# Seconds to wait before retrying an unreachable Redis server
+RECONNECT_BACKOFF = 30
+
+
+def principal_key(user_id: int, security_version: int) -> str:
+    return f"auth:principal:{user_id}:{security_version}"
+
+
+def min_version_key(user_id: int) -> str:
+    return f"auth:principal:{user_id}:min_version"
+
+
+class PrincipalCache:
+    """Two-level cache of the principals of valid access tokens."""
+
+    def __init__(
+        self,
+        max_entries: int = settings.AUTH_PRINCIPAL_CACHE_SIZE,
+        local_ttl: float = settings.AUTH_PRINCIPAL_LOCAL_TTL,
+        redis_ttl: int = settings.AUTH_PRINCIPAL_REDIS_TTL,
+        redis_url: Optional[str] = settings.REDIS_URL,
+    ):
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.redis_url = redis_url
+        self._local: "OrderedDict[Tuple[int, int], Tuple[float, UserInDB]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._clients: dict = {}
+        self._retry_at = 0.0
+
+    def _client(self, asyncio: bool) -> Any:
+        """Get the Redis client, or None while Redis is unreachable or not configured."""
+        if not self.redis_url or time.monotonic() < self._retry_at:
+            return None
+        client = self._clients.get(asyncio)
+        if client is None:
+            try:
+                if asyncio:
+                    import redis.asyncio as redis
+                else:
+                    import redis
+                client = self._clients[asyncio] = redis.Redis.from_url(self.redis_url, socket_timeout=0.5)
+            except Exception as e:
+                self._disconnected(e)
+        return client
+
+    def _disconnected(self, error: Exception):
+        logger.warning(f"Principal cache falling back to in-process only, Redis unavailable: {error}")
+        self._retry_at = time.monotonic() + RECONNECT_BACKOFF
+
+    def _get_local(self, key: Tuple[int, int]) -> Optional[UserInDB]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return entry[1]
+
+    def _set_local(self, key: Tuple[int, int], principal: UserInDB):
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.local_ttl, principal)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    async def get(self, user_id: int, security_version: int) -> Optional[UserInDB]:
+        """Get the cached principal of a token's user and security version."""
+        key = (user_id, security_version)
+        principal = self._get_local(key)
+        if principal is not None:
+            return principal
+
+        client = self._client(asyncio=True)
+        if client is None:
+            return None
+        try:
+            payload, min_version = await client.mget(principal_key(*key), min_version_key(user_id))
+        except Exception as e:
+            self._disconnected(e)
+            return None
+        if payload is None or (min_version is not None and security_version < int(min_version)):
+            return None
+
+        principal = UserInDB.model_validate_json(payload)
+        self._set_local(key, principal)
+        return principal
+
+    async def set(self, user_id: int, security_version: int, principal: UserInDB):
+        """Cache the principal loaded for a token's user and security version."""
+        principal = principal.model_copy(update=SECRET_FIELD_BLANKS)
+        self._set_local((user_id, security_version), principal)
+
+        client = self._client(asyncio=True)
+        if client is None:
+            return
+        try:
+            await client.set(principal_key(user_id, security_version), principal.model_dump_json(), ex=self.redis_ttl)
+        except Exception as e:
+            self._disconnected(e)
+
+    def invalidate(self, user_id: int, security_version: int):
+        """Evict a user's cached principals and reject tokens older than their new security version."""
+        with self._lock:
+            for key in [key for key in self._local if key[0] == user_id]:
+                del self._local[key]
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._record_min_version(user_id, security_version)
+        else:
+            # Sync sessions commit inside async handlers; keep the Redis round trip off the loop
+            loop.run_in_executor(None, self._record_min_version, user_id, security_version)
+
+    def _record_min_version(self, user_id: int, security_version: int):
+        client = self._client(asyncio=False)
+        if client is None:
+            return
+        try:
+            pipeline = client.pipeline()
+            # Kept as long as tokens of the old versions can still be presented
+            pipeline.set(min_version_key(user_id), security_version, ex=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+            pipeline.delete(principal_key(user_id, security_version - 1))
+            pipeline.execute()
+        except Exception as e:
+            self._disconnected(e)
+
+
+principal_cache = PrincipalCache()
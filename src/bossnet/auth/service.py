@@ -8,8 +8,6 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from models.user_model import RefreshToken, UserDB
 
-# Import password hashing utilities
-from passlib.context import CryptContext
 from pydantic import EmailStr, ValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
@@ -18,11 +16,10 @@ from config import settings
 from database.base import get_db
 
 # Import email service
-from .email_service import EmailService, EmailTemplate
+from .email_service import EmailTemplate, email_service
 from .models import PasswordMixin, Token, TokenData, TokenPayload, UserCreate, UserInDB, UserResponse, UserRole
-
-# Initialize password context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
+from .password_hasher import password_hasher
+from .principal_cache import principal_cache
 
 # OAuth2 scheme with token URL
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token", auto_error=False)
@@ -37,7 +34,7 @@ class AuthService(PasswordMixin):
         self.algorithm = settings.ALGORITHM
         self.access_token_expire_minutes = settings.ACCESS_TOKEN_EXPIRE_MINUTES
         self.refresh_token_expire_days = settings.REFRESH_TOKEN_EXPIRE_DAYS
-        self.email_service = EmailService()
+        self.email_service = email_service
 
     async def authenticate_user(self, username: str, password: str) -> Optional[UserDB]:
         """Authenticate a user with username and password"""
@@ -54,13 +51,18 @@ class AuthService(PasswordMixin):
                     detail="Account is temporarily locked due to too many failed login attempts",
                 )
 
-            # Verify password
-            if not user.check_password(password):
+            # Verify password off the event loop
+            verified, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+            if not verified:
                 # Record failed login attempt
                 user.record_login_attempt(success=False)
                 self.db.commit()
                 return None
 
+            # Store a hash with the current cost factor
+            if new_hash:
+                user.upgrade_password_hash(new_hash)
+
             # Record successful login
             user.record_login_attempt(success=True)
             self.db.commit()
@@ -71,8 +73,8 @@ class AuthService(PasswordMixin):
             self.db.rollback()
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error authenticating user")
 
-    def create_access_token(self, user_id: int, scopes: List[str] = None) -> str:
-        """Create a JWT access token"""
+    def create_access_token(self, user_id: int, scopes: List[str] = None, *, security_version: int) -> str:
+        """Create a JWT access token bound to the user's current security version (``UserDB.security_version``)"""
         if scopes is None:
             scopes = []
 
@@ -83,6 +85,7 @@ class AuthService(PasswordMixin):
             "sub": str(user_id),
             "scopes": scopes,
             "type": "access",
+            "sv": security_version,
             "exp": expire,
             "iat": datetime.utcnow(),
             "jti": secrets.token_urlsafe(16),
@@ -96,8 +99,8 @@ class AuthService(PasswordMixin):
         token = secrets.token_urlsafe(32)
         expires_at = datetime.utcnow() + timedelta(days=self.refresh_token_expire_days)
 
-        # Store the refresh token in the database
-        db_token = RefreshToken(token=token, user_id=user_id, expires_at=expires_at)
+        # Store only the digest of the refresh token in the database
+        db_token = RefreshToken(token_hash=RefreshToken.hash_token(token), user_id=user_id, expires_at=expires_at)
 
         self.db.add(db_token)
         self.db.commit()
@@ -105,12 +108,12 @@ class AuthService(PasswordMixin):
 
         return token
 
-    def create_tokens(self, user_id: int, scopes: List[str] = None) -> Token:
+    def create_tokens(self, user_id: int, scopes: List[str] = None, *, security_version: int) -> Token:
         """Create both access and refresh tokens"""
         if scopes is None:
             scopes = []
 
-        access_token = self.create_access_token(user_id, scopes)
+        access_token = self.create_access_token(user_id, scopes, security_version=security_version)
         refresh_token = self.create_refresh_token(user_id)
 
         return Token(
@@ -126,7 +129,7 @@ class AuthService(PasswordMixin):
         db_token = (
             self.db.query(RefreshToken)
             .filter(
-                RefreshToken.token == refresh_token,
+                RefreshToken.token_hash == RefreshToken.hash_token(refresh_token),
                 RefreshToken.revoked_at.is_(None),
                 RefreshToken.expires_at > datetime.utcnow(),
             )
@@ -143,7 +146,7 @@ class AuthService(PasswordMixin):
 
         # Create new access token
         scopes = self.get_user_scopes(user)
-        access_token = self.create_access_token(user.id, scopes)
+        access_token = self.create_access_token(user.id, scopes, security_version=user.security_version)
 
         return Token(
             access_token=access_token,
@@ -154,7 +157,11 @@ class AuthService(PasswordMixin):
 
     def revoke_refresh_token(self, token: str) -> None:
         """Revoke a refresh token"""
-        db_token = self.db.query(RefreshToken).filter(RefreshToken.token == token, RefreshToken.revoked_at.is_(None)).first()
+        db_token = (
+            self.db.query(RefreshToken)
+            .filter(RefreshToken.token_hash == RefreshToken.hash_token(token), RefreshToken.revoked_at.is_(None))
+            .first()
+        )
 
         if db_token:
             db_token.revoke()
@@ -196,20 +203,33 @@ class AuthService(PasswordMixin):
             user_id = payload.get("sub")
             if not user_id:
                 raise credentials_exception
+            user_id = int(user_id)
+            security_version = int(payload.get("sv", 0))
+
+            # Tokens of a cached principal authenticate without touching the database
+            principal = await principal_cache.get(user_id, security_version)
+            if principal is not None:
+                return principal
 
             # Get user from database
-            user = self.db.query(UserDB).get(int(user_id))
+            user = self.db.get(UserDB, user_id)
             if not user:
                 raise credentials_exception
 
+            # Reject tokens issued before a password, role or status change
+            if user.security_version != security_version:
+                raise credentials_exception
+
             # Check if user is active
             if not user.is_active:
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
 
             # Convert to Pydantic model
-            return UserInDB.from_orm(user)
+            principal = UserInDB.model_validate(user)
+            await principal_cache.set(user_id, security_version, principal)
+            return principal
 
-        except (JWTError, ValidationError) as e:
+        except (JWTError, ValidationError, ValueError) as e:
             raise credentials_exception from e
 
     async def get_current_active_user(
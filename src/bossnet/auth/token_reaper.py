@@ -0,0 +1,151 @@
+"""
+Background cleanup of expired refresh tokens.
+
+Refresh tokens are kept for ``REFRESH_TOKEN_RETENTION_HOURS`` after they
+expire, then deleted. Each run deletes in batches of
+``REFRESH_TOKEN_REAP_BATCH_SIZE`` rows, one short transaction per batch, found
+through the ``expires_at`` index. Rows are claimed with ``FOR UPDATE SKIP
+LOCKED`` so a batch never waits on tokens being refreshed or revoked, and
+several workers can run the reaper at once without deleting the same rows.
+
+The reaper reports the table's size and row estimate, and how many rows it
+deleted and how fast.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from models.user_model import RefreshToken
+from sqlalchemy import delete, select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from config import settings
+from database import base as database
+
+logger = logging.getLogger(__name__)
+
+# Postgres planner estimate of the row count and on-disk size including indexes
+TABLE_STATS_QUERY = text(
+    "SELECT reltuples::bigint AS rows, pg_total_relation_size(oid) AS bytes "
+    "FROM pg_class WHERE oid = to_regclass('refresh_tokens')"
+)
+
+
+class RefreshTokenReaper:
+    """Deletes expired refresh tokens in small batches on a timer."""
+
+    def __init__(
+        self,
+        session_factory=None,
+        interval: float = settings.REFRESH_TOKEN_REAP_INTERVAL,
+        batch_size: int = settings.REFRESH_TOKEN_REAP_BATCH_SIZE,
+        retention: timedelta = timedelta(hours=settings.REFRESH_TOKEN_RETENTION_HOURS),
+    ):
+        self._session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self.retention = retention
+        self.reaped_total = 0
+        self.runs = 0
+        self.last_run: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def session_factory(self):
+        if self._session_factory is not None:
+            return self._session_factory
+        if database.AsyncSessionLocal is None:
+            database.init_database()
+        return database.AsyncSessionLocal
+
+    def _batch_statement(self, cutoff: datetime):
+        expired = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < cutoff)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return delete(RefreshToken).where(RefreshToken.id.in_(expired.scalar_subquery()))
+
+    async def reap(self) -> int:
+        """Delete every refresh token expired for longer than the retention period."""
+        started = time.perf_counter()
+        cutoff = datetime.now(timezone.utc) - self.retention
+        statement = self._batch_statement(cutoff)
+        deleted = batches = 0
+        while True:
+            async with self.session_factory() as session:
+                async with session.begin():
+                    count = (await session.execute(statement)).rowcount
+            deleted += count
+            batches += 1
+            if count < self.batch_size:
+                break
+            # Let other work run between batches
+            await asyncio.sleep(0)
+
+        elapsed = time.perf_counter() - started
+        self.reaped_total += deleted
+        self.runs += 1
+        self.last_run = {
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "deleted": deleted,
+            "batches": batches,
+            "duration_ms": elapsed * 1000,
+            "rows_per_second": deleted / elapsed if elapsed > 0 else 0.0,
+        }
+        if deleted:
+            logger.info(f"Deleted {deleted} expired refresh tokens in {batches} batches ({elapsed:.2f}s)")
+        return deleted
+
+    async def table_stats(self) -> Dict[str, Optional[int]]:
+        """Get the estimated row count and total size in bytes of the refresh token table."""
+        try:
+            async with self.session_factory() as session:
+                row = (await session.execute(TABLE_STATS_QUERY)).first()
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not read refresh token table statistics: {e}")
+            row = None
+        return {"rows": row.rows if row else None, "bytes": row.bytes if row else None}
+
+    async def stats(self) -> Dict[str, Any]:
+        """Get the table statistics and the reaper's progress."""
+        return {
+            "table": await self.table_stats(),
+            "reaped_total": self.reaped_total,
+            "runs": self.runs,
+            "last_run": self.last_run,
+            "interval_seconds": self.interval,
+            "batch_size": self.batch_size,
+        }
+
+    async def _run_forever(self):
+        while True:
+            try:
+                await self.reap()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Refresh token cleanup failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start reaping in the background on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run_forever(), name="refresh-token-reaper")
+
+    async def stop(self):
+        """Stop the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+refresh_token_reaper = RefreshTokenReaper()
@@ -2,7 +2,7 @@
 Security configuration
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 
 class SecuritySettings:
@@ -19,6 +19,16 @@ class SecuritySettings:
         "Permissions-Policy": "camera=(), microphone=(), geolocation=()",
     }
 
+    # Security middleware
+    ENABLE_SECURITY_HEADERS = True
+    ENABLE_REQUEST_VALIDATION = True
+
+    # CORS; no other origins may call the API unless they are listed
+    CORS_ORIGINS: List[str] = []
+    CORS_CREDENTIALS = True
+    CORS_METHODS: List[str] = ["GET", "POST", "PUT", "PATCH", "DELETE"]
+    CORS_HEADERS: List[str] = ["Authorization", "Content-Type"]
+
     # Rate limiting
     RATE_LIMIT_REQUESTS = 100
     RATE_LIMIT_WINDOW = 60  # seconds
@@ -51,6 +51,48 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
 
+    # Password hashing: bcrypt cost, worker threads and the most operations allowed to queue
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Authenticated principal cache
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10000
+    AUTH_PRINCIPAL_LOCAL_TTL: int = 15  # seconds
+    AUTH_PRINCIPAL_REDIS_TTL: int = 300  # seconds
+
+    # Rate limiting, shared by all workers through Redis
+    RATE_LIMIT_ANONYMOUS: str = "100/minute"  # per client address
+    RATE_LIMIT_AUTHENTICATED: str = "600/minute"  # per user
+    RATE_LIMIT_ROUTES: Dict[str, str] = {
+        "POST /api/v1/auth/token": "10/minute",
+        "POST /api/v1/auth/register": "5/minute",
+        "POST /api/v1/api/students/import": "10/minute",
+    }
+    RATE_LIMIT_MAX_LEASE: int = 10  # tokens a hot key reserves per Redis round trip
+    RATE_LIMIT_LEASE_TTL: float = 1.0  # seconds leased tokens stay usable
+    RATE_LIMIT_LOCAL_KEYS: int = 10000  # keys tracked in-process
+
+    # Request inspection: characters of JSON keys and values scanned per body, and nesting depth
+    REQUEST_SCAN_MAX_CHARS: int = 262144
+    REQUEST_SCAN_MAX_DEPTH: int = 32
+
+    # Expired refresh token cleanup
+    REFRESH_TOKEN_REAP_INTERVAL: int = 300  # seconds between runs
+    REFRESH_TOKEN_REAP_BATCH_SIZE: int = 1000  # rows deleted per transaction
+    REFRESH_TOKEN_RETENTION_HOURS: int = 24  # kept this long after expiry
+
+    # Bulk student imports: rows upserted per statement, and bodies larger than this go to a Celery worker
+    STUDENT_IMPORT_BATCH_SIZE: int = 1000
+    STUDENT_IMPORT_SYNC_MAX_BYTES: int = 1024 * 1024  # 1MB
+
+    # Audit log writer: events queued before new ones are dropped, rows per INSERT, and the longest
+    # a partial batch waits; batches the database refuses are kept in the spool file until they can be written
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_MS: int = 200
+    AUDIT_SPOOL_FILE: str = "spool/audit_events.ndjson"
+
     # CORS
     ALLOWED_HOSTS: List[str] = ["*"]
 
@@ -60,6 +102,8 @@ class Settings(BaseSettings):
     SMTP_USERNAME: Optional[str] = None
     SMTP_PASSWORD: Optional[str] = None
     SMTP_USE_TLS: bool = True
+    EMAILS_FROM_EMAIL: Optional[str] = None
+    EMAILS_FROM_NAME: str = "Bangladesh Education Data API"
 
     # File Storage
     UPLOAD_DIR: str = "uploads"
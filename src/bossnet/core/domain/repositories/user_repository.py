@@ -178,6 +178,24 @@ class UserRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def list_users(self, skip: int = 0, limit: int = 100) -> List[User]:
-        """List users with pagination"""
+    async def list_users(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        estimate_total: bool = False,
+    ) -> List[User]:
+        """List users with pagination.
+
+        Args:
+            skip: Number of users to skip, for offset pagination.
+            limit: Maximum number of users to return.
+            cursor: Continuation token of the page to fetch, for keyset pagination.
+            include_total: Whether to count all users.
+            estimate_total: Whether to estimate the count from planner statistics instead.
+
+        Returns:
+            The users of the page; keyset pages also carry ``next_cursor``, ``total`` and ``total_is_estimate``.
+        """
         raise NotImplementedError
@@ -2,13 +2,24 @@
 Data Processing Module
 =====================
 ETL pipeline components for Bangladesh Education Data Warehouse
+
+Components are imported on first use, so the API can use the transformers
+without loading the pipeline, its extractors and Great Expectations.
 """
 
-from .extractors import CSVExtractor, DatabaseExtractor, ExcelExtractor
-from .loaders import DatabaseLoader, ValidationLoader
-from .pipeline import DataPipeline
-from .transformers import SchoolDataTransformer, StudentDataTransformer
-from .validators import DataQualityValidator
+from importlib import import_module
+
+_COMPONENTS = {
+    "CSVExtractor": ".extractors",
+    "ExcelExtractor": ".extractors",
+    "DatabaseExtractor": ".extractors",
+    "DatabaseLoader": ".loaders",
+    "ValidationLoader": ".loaders",
+    "DataPipeline": ".pipeline",
+    "SchoolDataTransformer": ".transformers",
+    "StudentDataTransformer": ".transformers",
+    "DataQualityValidator": ".validators",
+}
 
 __all__ = [
     "DataPipeline",
@@ -21,3 +32,9 @@ __all__ = [
     "ValidationLoader",
     "DataQualityValidator",
 ]
+
+
+def __getattr__(name):
+    if name not in _COMPONENTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_COMPONENTS[name], __name__), name)
@@ -0,0 +1,320 @@
+"""
+Bulk Student Import
+===================
+Import NDJSON, CSV or Parquet student files through the ETL transformer
+
+Files are read in batches of ``STUDENT_IMPORT_BATCH_SIZE`` rows. Each batch is
+cleaned by ``StudentDataTransformer``, validated against ``StudentCreate`` and
+upserted on ``student_id`` with one statement, after a single query for the
+student IDs and emails already taken. Reading and cleaning run on worker
+threads, so only the database round trips run on the event loop. Every row gets an outcome: created,
+updated, skipped as a repeat of an earlier row, or failed with its reasons.
+Updates only change the columns a file carries and the cells it fills in;
+blank cells keep the stored values.
+"""
+
+import asyncio
+import json
+import logging
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from data_processing.transformers import StudentDataTransformer
+from fastapi.concurrency import run_in_threadpool
+from models.student import ImportRowStatus, StudentCreate, StudentImportResult, StudentImportRow
+from models.student_model import StudentDB
+from pydantic import ValidationError
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet imports are unavailable without pyarrow
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+# Content types accepted for each format
+CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/vnd.apache.parquet": "parquet",
+    "application/x-parquet": "parquet",
+}
+
+# Columns of the cleaned data that map straight onto StudentCreate
+PASSTHROUGH_COLUMNS = ["student_id", "date_of_birth", "email", "city", "district", "division", "postal_code"]
+
+
+class ImportFormatError(ValueError):
+    """The file cannot be read as the declared format or lacks required columns."""
+
+
+def detect_format(content_type: str) -> Optional[str]:
+    """Get the import format for a content type, or None if it is not supported."""
+    return CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+
+
+def _failure(row: int, errors: List[str], student_id: Optional[str] = None) -> StudentImportRow:
+    return StudentImportRow(row=row, student_id=student_id, status=ImportRowStatus.FAILED, errors=errors)
+
+
+def _read_ndjson(source: BinaryIO, batch_size: int) -> Iterator[Tuple[pd.DataFrame, List[StudentImportRow]]]:
+    records, rows, failures = [], [], []
+    for row, line in enumerate((line for line in source if line.strip()), start=1):
+        try:
+            record = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            failures.append(_failure(row, ["Not a valid JSON line"]))
+        else:
+            if isinstance(record, dict):
+                records.append(record)
+                rows.append(row)
+            else:
+                failures.append(_failure(row, ["Expected a JSON object"]))
+        if len(records) + len(failures) >= batch_size:
+            yield pd.DataFrame(records, index=rows), failures
+            records, rows, failures = [], [], []
+    if records or failures:
+        yield pd.DataFrame(records, index=rows), failures
+
+
+def _read_csv(source: BinaryIO, batch_size: int) -> Iterator[Tuple[pd.DataFrame, List[StudentImportRow]]]:
+    try:
+        for chunk in pd.read_csv(source, dtype=str, chunksize=batch_size, skipinitialspace=True):
+            chunk.index += 1
+            yield chunk, []
+    except (pd.errors.ParserError, UnicodeDecodeError) as e:
+        raise ImportFormatError(f"Invalid CSV: {e}")
+    except pd.errors.EmptyDataError:
+        return
+
+
+def _read_parquet(source: BinaryIO, batch_size: int) -> Iterator[Tuple[pd.DataFrame, List[StudentImportRow]]]:
+    if pq is None:
+        raise ImportFormatError("Parquet imports require pyarrow")
+    try:
+        parquet = pq.ParquetFile(source)
+    except Exception as e:
+        raise ImportFormatError(f"Invalid Parquet file: {e}")
+    start = 1
+    for batch in parquet.iter_batches(batch_size=batch_size):
+        chunk = batch.to_pandas()
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk, []
+
+
+READERS = {"ndjson": _read_ndjson, "csv": _read_csv, "parquet": _read_parquet}
+
+
+class StudentImporter:
+    """Import a student file into the students table in batches."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        batch_size: int = settings.STUDENT_IMPORT_BATCH_SIZE,
+        errors_only: bool = False,
+        commit_batches: bool = False,
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.errors_only = errors_only
+        # Commit after each batch so a long import keeps its progress; otherwise the caller commits
+        self.commit_batches = commit_batches
+        self.transformer = StudentDataTransformer()
+        # Student IDs imported by earlier batches; the transformer only drops repeats within a batch
+        self._seen = set()
+
+    async def run(self, source: BinaryIO, file_format: str) -> StudentImportResult:
+        """Import every row of ``source`` and report the outcome of each."""
+        result = StudentImportResult()
+        batches = READERS[file_format](source, self.batch_size)
+        while True:
+            batch = await run_in_threadpool(next, batches, None)
+            if batch is None:
+                break
+            frame, outcomes = batch
+            if not frame.empty:
+                students, rejected = await run_in_threadpool(self.prepare, frame)
+                upserted = await self.upsert(students)
+                # Rows that failed do not make a later row with their student ID a repeat
+                self._seen.update(
+                    outcome.student_id
+                    for outcome in upserted
+                    if outcome.status in (ImportRowStatus.CREATED, ImportRowStatus.UPDATED)
+                )
+                outcomes += rejected + upserted
+            for outcome in sorted(outcomes, key=lambda outcome: outcome.row):
+                result.total += 1
+                setattr(result, outcome.status.value, getattr(result, outcome.status.value) + 1)
+                if not self.errors_only or outcome.errors:
+                    result.rows.append(outcome)
+            if self.commit_batches:
+                await self.db.commit()
+
+        logger.info(
+            f"Imported {result.total} student rows: {result.created} created, {result.updated} updated, "
+            f"{result.skipped} skipped, {result.failed} failed"
+        )
+        return result
+
+    def prepare(self, frame: pd.DataFrame) -> Tuple[List[Tuple[int, StudentCreate]], List[StudentImportRow]]:
+        """Clean a batch with the transformer and validate each row, keeping rows indexed by their position.
+
+        Runs on a worker thread; it does no database I/O.
+        """
+        frame = self.transformer.map_columns(frame)
+        frame = frame.replace(r"^\s*$", np.nan, regex=True)
+        names = {"first_name", "last_name"}
+        if "full_name" not in frame.columns and names <= set(frame.columns):
+            frame["full_name"] = frame["first_name"].fillna("").str.cat(frame["last_name"].fillna(""), sep=" ").str.strip()
+            frame["full_name"] = frame["full_name"].replace("", np.nan)
+
+        missing_columns = self.transformer.missing_required_columns(frame)
+        if missing_columns:
+            raise ImportFormatError(f"Missing required columns: {', '.join(missing_columns)}")
+
+        rejected = []
+        incomplete = frame[self.transformer.required_columns].isna()
+        for row, missing in incomplete[incomplete.any(axis=1)].iterrows():
+            student_id = None if missing["student_id"] else str(frame.at[row, "student_id"]).strip().upper()
+            rejected.append(_failure(row, [f"{column}: Field required" for column in missing[missing].index], student_id))
+        frame = frame[~incomplete.any(axis=1)]
+        if frame.empty:
+            return [], rejected
+
+        # The transformer's coroutines do no I/O, so they run to completion on this thread
+        cleaned = asyncio.run(self.transformer.transform(frame))
+        cleaned = cleaned[~cleaned["student_id"].isin(self._seen)]
+        for row in frame.index.difference(cleaned.index):
+            student_id = str(frame.at[row, "student_id"]).strip().upper()
+            rejected.append(
+                StudentImportRow(
+                    row=row,
+                    student_id=student_id,
+                    status=ImportRowStatus.SKIPPED,
+                    errors=[f"student_id: Repeats {student_id} from an earlier row"],
+                )
+            )
+
+        students = []
+        for row, record in self._records(frame.loc[cleaned.index], cleaned).items():
+            errors = record.pop("errors")
+            try:
+                student = StudentCreate.model_validate(record)
+            except ValidationError as e:
+                errors += [f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()]
+            if errors:
+                rejected.append(_failure(row, errors, record["student_id"]))
+            else:
+                students.append((row, student))
+        return students, rejected
+
+    def _records(self, source: pd.DataFrame, cleaned: pd.DataFrame) -> Dict[int, dict]:
+        """Shape the transformer's output into StudentCreate fields, flagging values it had to discard."""
+        fields = pd.DataFrame(index=cleaned.index)
+        for column in PASSTHROUGH_COLUMNS:
+            if column in cleaned.columns:
+                fields[column] = cleaned[column]
+        fields["date_of_birth"] = cleaned["date_of_birth"].dt.date
+        fields["gender"] = cleaned["gender"].str.lower()
+        if {"first_name", "last_name"} <= set(source.columns):
+            for column in ("first_name", "last_name"):
+                fields[column] = self.transformer.clean_text(source[column].fillna(""), case="title")
+        else:
+            names = cleaned["full_name"].str.rsplit(" ", n=1, expand=True).reindex(columns=[0, 1])
+            fields["first_name"], fields["last_name"] = names[0], names[1].fillna("")
+        if "phone_number" in cleaned.columns:
+            fields["phone"] = cleaned["phone_number"]
+        if "current_address" in cleaned.columns:
+            fields["address"] = cleaned["current_address"]
+        if "postal_code" in fields.columns:
+            fields["postal_code"] = fields["postal_code"].astype("string")
+
+        records = fields.astype(object).where(fields.notna(), None).to_dict("index")
+        for row, record in records.items():
+            record["errors"] = []
+            for field, column in (("email", "email"), ("phone", "phone_number")):
+                if column in source.columns and pd.notna(source.at[row, column]) and record.get(field) is None:
+                    record["errors"].append(f"{field}: Not a valid {'email address' if field == 'email' else 'phone number'}")
+        return records
+
+    async def upsert(self, students: List[Tuple[int, StudentCreate]]) -> List[StudentImportRow]:
+        """Insert or update a batch of validated students with one statement."""
+        if not students:
+            return []
+        ids = [student.student_id for _, student in students]
+        emails = [student.email for _, student in students if student.email]
+        taken = await self.db.execute(
+            select(StudentDB.student_id, StudentDB.email).where(
+                or_(StudentDB.student_id.in_(ids), StudentDB.email.in_(emails))
+            )
+        )
+        existing = set()
+        email_owners = {}
+        for student_id, email in taken:
+            existing.add(student_id)
+            if email:
+                email_owners[email] = student_id
+
+        outcomes, accepted = [], []
+        for row, student in students:
+            owner = email_owners.setdefault(student.email, student.student_id) if student.email else None
+            if owner is not None and owner != student.student_id:
+                outcomes.append(_failure(row, [f"email: {student.email} is already registered"], student.student_id))
+                continue
+            status = ImportRowStatus.UPDATED if student.student_id in existing else ImportRowStatus.CREATED
+            accepted.append((row, student, status))
+
+        if not accepted:
+            return outcomes
+        # Rows of one file carry the same fields; existing students keep the columns the file lacks
+        # and the values left blank
+        columns = sorted(accepted[0][1].model_fields_set)
+        try:
+            async with self.db.begin_nested():
+                await self.db.execute(
+                    self._upsert_statement(columns), [self._values(student, columns) for _, student, _ in accepted]
+                )
+        except IntegrityError:
+            # A concurrent write took one of the emails: find the offending rows one at a time
+            logger.warning("Batch upsert conflicted, retrying its rows one at a time")
+            return outcomes + [await self._upsert_one(row, student, status, columns) for row, student, status in accepted]
+        return outcomes + [
+            StudentImportRow(row=row, student_id=student.student_id, status=status) for row, student, status in accepted
+        ]
+
+    async def _upsert_one(
+        self, row: int, student: StudentCreate, status: ImportRowStatus, columns: List[str]
+    ) -> StudentImportRow:
+        try:
+            async with self.db.begin_nested():
+                await self.db.execute(self._upsert_statement(columns), [self._values(student, columns)])
+        except IntegrityError as e:
+            return _failure(row, [f"Conflicts with an existing student: {e.orig}"], student.student_id)
+        return StudentImportRow(row=row, student_id=student.student_id, status=status)
+
+    @staticmethod
+    def _values(student: StudentCreate, columns: List[str]) -> dict:
+        values = student.model_dump(include=set(columns))
+        values["gender"] = student.gender.value
+        return values
+
+    @staticmethod
+    def _upsert_statement(columns: List[str]):
+        stmt = pg_insert(StudentDB.__table__)
+        # Cells left blank in the file keep the stored value rather than clearing it
+        updated = {
+            name: func.coalesce(stmt.excluded[name], StudentDB.__table__.c[name]) for name in columns if name != "student_id"
+        }
+        return stmt.on_conflict_do_update(index_elements=["student_id"], set_={**updated, "updated_at": func.now()})
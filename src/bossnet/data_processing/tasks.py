@@ -0,0 +1,68 @@
+"""
+Background Data Processing Tasks
+================================
+Celery tasks for imports too large to process within a request
+
+Run a worker from the source root with ``celery -A data_processing.tasks worker``.
+Uploaded files are spooled under ``UPLOAD_DIR``, which the API and the workers
+must share.
+"""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+from celery import Celery
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from config import settings
+from data_processing.student_import import StudentImporter
+
+logger = logging.getLogger(__name__)
+
+# Directory that holds import files until a worker has processed them
+IMPORT_SPOOL_DIR = Path(settings.UPLOAD_DIR) / "imports"
+
+celery_app = Celery("education_etl", broker=settings.REDIS_URL, backend=settings.REDIS_URL)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    timezone="Asia/Dhaka",
+    enable_utc=True,
+    task_track_started=True,
+    task_time_limit=30 * 60,  # 30 minutes
+    task_soft_time_limit=25 * 60,  # 25 minutes
+    worker_prefetch_multiplier=1,
+    result_expires=24 * 3600,  # import results are kept for a day
+)
+
+
+async def _import_students(path: str, file_format: str, errors_only: bool) -> Dict[str, Any]:
+    # Each task runs in a new event loop, so it gets its own connections rather than the pooled ones
+    engine = create_async_engine(settings.ASYNC_DATABASE_URL, poolclass=NullPool)
+    try:
+        async with sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)() as db:
+            with open(path, "rb") as source:
+                importer = StudentImporter(db, errors_only=errors_only, commit_batches=True)
+                result = await importer.run(source, file_format)
+        return result.model_dump(mode="json")
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="data_processing.import_students")
+def import_students_task(path: str, file_format: str, errors_only: bool = False) -> Dict[str, Any]:
+    """Import a spooled student file and delete it afterwards."""
+    try:
+        return asyncio.run(_import_students(path, file_format, errors_only))
+    except Exception as e:
+        logger.error(f"Student import from {path} failed: {str(e)}")
+        raise
+    finally:
+        os.unlink(path)
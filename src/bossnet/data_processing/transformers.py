@@ -60,6 +60,18 @@ class BaseTransformer(ABC):
         """Set column name mapping"""
         self.column_mappings[source_column] = target_column
 
+    def map_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rename source columns to the names the transformer works with"""
+        return self._apply_column_mappings(df)
+
+    def missing_required_columns(self, df: pd.DataFrame) -> List[str]:
+        """Get the required columns a frame lacks, after mapping"""
+        return self._validate_required_columns(df)
+
+    def clean_text(self, series: pd.Series, **kwargs) -> pd.Series:
+        """Trim, collapse whitespace in and re-case a text column"""
+        return self._clean_text_column(series, **kwargs)
+
     def _apply_column_mappings(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply column name mappings"""
         if self.column_mappings:
@@ -1,13 +1,25 @@
 # Import database components
-from .base import AsyncSessionLocal, Base, SessionLocal, async_engine, get_async_db, get_db, get_db_session, sync_engine
+from . import base as _base
+from .base import Base, dispose_database, get_async_db, get_db, get_db_session, init_database
+
+# Engines and session factories are created on startup, so they are read from the base module when accessed
+_ENGINE_ATTRIBUTES = ("sync_engine", "async_engine", "SessionLocal", "AsyncSessionLocal")
 
 __all__ = [
     "Base",
     "get_db",
     "get_async_db",
     "get_db_session",
+    "init_database",
+    "dispose_database",
     "sync_engine",
     "async_engine",
     "SessionLocal",
     "AsyncSessionLocal",
 ]
+
+
+def __getattr__(name):
+    if name not in _ENGINE_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(_base, name)
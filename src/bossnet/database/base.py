@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session, declarative_base, sessionmaker
 from sqlalchemy.orm.decl_api import DeclarativeMeta
 from sqlalchemy.pool import NullPool
 
-from ..config import settings
+from config import settings
 
 # Naming convention for database constraints
 convention = {
@@ -21,7 +21,8 @@ convention = {
 # Create base class with naming convention
 Base: DeclarativeMeta = declarative_base(metadata=MetaData(naming_convention=convention))  # type: ignore
 
-# Database engines and session factories
+# Database engines and session factories, created by init_database() on application startup
+# or on first use. The schema is managed by Alembic migrations only.
 sync_engine = None
 async_engine: Optional[AsyncEngine] = None
 SessionLocal = None
@@ -32,6 +33,9 @@ def init_database():
     """Initialize database connections and session factories."""
     global sync_engine, async_engine, SessionLocal, AsyncSessionLocal
 
+    if SessionLocal is not None and AsyncSessionLocal is not None:
+        return
+
     if sync_engine is None:
         sync_engine = create_engine(
             settings.SYNC_DATABASE_URL,
@@ -72,8 +76,15 @@ def init_database():
     )
 
 
-# Initialize database on import
-init_database()
+async def dispose_database():
+    """Close the engines' pooled connections and drop the engines and session factories."""
+    global sync_engine, async_engine, SessionLocal, AsyncSessionLocal
+
+    if async_engine is not None:
+        await async_engine.dispose()
+    if sync_engine is not None:
+        sync_engine.dispose()
+    sync_engine = async_engine = SessionLocal = AsyncSessionLocal = None
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -4,7 +4,7 @@ from models.student_model import Base, Gender, StudentDB
 from sqlalchemy import create_engine
 from sqlalchemy.exc import SQLAlchemyError
 
-from database.base import engine
+from database import base
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,8 +13,9 @@ logger = logging.getLogger(__name__)
 def init_db():
     """Initialize the database with required tables"""
     try:
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        # Create all tables; the API never does, the schema is otherwise managed by Alembic
+        base.init_database()
+        Base.metadata.create_all(bind=base.sync_engine)
         logger.info("Database tables created successfully")
 
     except SQLAlchemyError as e:
@@ -25,7 +26,8 @@ def init_db():
 def drop_db():
     """Drop all database tables (use with caution in production)"""
     try:
-        Base.metadata.drop_all(bind=engine)
+        base.init_database()
+        Base.metadata.drop_all(bind=base.sync_engine)
         logger.warning("Dropped all database tables")
     except SQLAlchemyError as e:
         logger.error(f"Error dropping database tables: {e}")
@@ -0,0 +1,143 @@
+"""
+Trigram search helpers for student name and location filters.
+
+Searches run on ``search_normalize(...)`` expressions, which are backed by
+``pg_trgm`` GIN indexes (migration 20250110_001), so substring and fuzzy
+matches use the index instead of scanning every student. Text is normalized
+the same way in Python and in the database: Bangla digits become ASCII, the
+nukta letters and khanda ta get a single spelling, zero-width joiners are
+dropped, then text is lowercased and whitespace collapsed.
+"""
+
+import logging
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, String, func, literal_column, or_, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Character rewrites applied before lowercasing. Must stay in step with the
+# search_normalize() SQL function created by migration 20250110_001.
+BANGLA_REWRITES = (
+    # Khanda ta typed as ta + hasant + zero-width joiner
+    ("\u09a4\u09cd\u200d", "\u09ce"),
+    # Precomposed nukta letters, which Unicode normalizes to base letter + nukta
+    ("\u09dc", "\u09a1\u09bc"),
+    ("\u09dd", "\u09a2\u09bc"),
+    ("\u09df", "\u09af\u09bc"),
+)
+# Bangla digits become ASCII; zero-width non-joiners and joiners are dropped
+BANGLA_DIGITS = str.maketrans("\u09e6\u09e7\u09e8\u09e9\u09ea\u09eb\u09ec\u09ed\u09ee\u09ef", "0123456789", "\u200c\u200d")
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Seconds the division and district names are cached
+LOCATION_NAMES_TTL = 300
+
+LOCATION_NAMES_QUERIES = {
+    "division": text("SELECT name, name_bn FROM divisions"),
+    "district": text("SELECT name, name_bn FROM districts"),
+}
+
+# Words that may follow a division or district name, in English and Bangla
+LOCATION_SUFFIXES = {
+    "division": ("division", "\u09ac\u09bf\u09ad\u09be\u0997"),
+    "district": ("district", "\u099c\u09c7\u09b2\u09be"),
+}
+
+
+def normalize_search_text(value: str) -> str:
+    """Normalize text the way search_normalize() does in the database."""
+    for old, new in BANGLA_REWRITES:
+        value = value.replace(old, new)
+    return _WHITESPACE.sub(" ", value.translate(BANGLA_DIGITS).lower()).strip()
+
+
+def search_normalize(expression):
+    """SQL expression normalizing a column, matching the trigram indexes."""
+    return func.search_normalize(expression, type_=String)
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards in a search term."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def student_name_search(first_name, last_name, query: str):
+    """Get the condition and rank of a student name search.
+
+    Names match when they contain the query, or fuzzily when the query is
+    similar to a word of the name (``pg_trgm.word_similarity_threshold``).
+    Both forms are answered from the trigram index on the normalized full
+    name. The rank is the word similarity of the query to the name.
+    """
+    query = normalize_search_text(query)
+    # The separator is inlined, not bound, so the expression matches the index definition
+    document = search_normalize(first_name.op("||")(literal_column("' '")).op("||")(last_name))
+    condition = or_(document.like(f"%{escape_like(query)}%", escape="\\"), document.op("%>")(query))
+    rank = func.word_similarity(query, document, type_=Float)
+    return condition, rank
+
+
+class LocationNames:
+    """Known division and district names, for exact-match fast paths.
+
+    Filters naming a whole division or district, in English or Bangla, are
+    answered with an equality on the normalized column against every known
+    spelling of the place, which uses the B-tree expression indexes, instead
+    of a substring search.
+    """
+
+    def __init__(self, ttl: float = LOCATION_NAMES_TTL):
+        self.ttl = ttl
+        self._names: Dict[str, Tuple[float, Dict[str, Tuple[str, ...]]]] = {}
+
+    async def _load(self, session: AsyncSession, kind: str) -> Dict[str, Tuple[str, ...]]:
+        cached = self._names.get(kind)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+
+        names: Dict[str, Tuple[str, ...]] = {}
+        try:
+            # Savepoint, so a missing table does not abort the request's transaction
+            async with session.begin_nested():
+                result = await session.execute(LOCATION_NAMES_QUERIES[kind])
+                for row in result.all():
+                    spellings = location_spellings(kind, *row)
+                    for spelling in spellings:
+                        names[spelling] = spellings
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not load {kind} names for search: {e}")
+        self._names[kind] = (time.monotonic(), names)
+        return names
+
+    async def spellings(self, session: AsyncSession, kind: str, value: str) -> Optional[Tuple[str, ...]]:
+        """Get every normalized spelling of a division or district, or None if the value is not a whole name."""
+        return (await self._load(session, kind)).get(normalize_search_text(value))
+
+
+def location_spellings(kind: str, name: Optional[str], name_bn: Optional[str]) -> Tuple[str, ...]:
+    """Normalized spellings of a place: its English and Bangla names, bare and followed by the kind."""
+    spellings: List[str] = []
+    for spelling, suffix in ((name, LOCATION_SUFFIXES[kind][0]), (name_bn, LOCATION_SUFFIXES[kind][1])):
+        if spelling:
+            spelling = normalize_search_text(spelling)
+            spellings += [spelling, f"{spelling} {suffix}"]
+    return tuple(dict.fromkeys(spellings))
+
+
+def location_match(column, spellings: Tuple[str, ...]):
+    """Condition matching a location column spelled any of the given ways, answered from its B-tree expression index."""
+    return search_normalize(column).in_(spellings)
+
+
+def location_search(column, query: str):
+    """Condition matching a location column containing the query, answered from its trigram index."""
+    return search_normalize(column).like(f"%{escape_like(normalize_search_text(query))}%", escape="\\")
+
+
+location_names = LocationNames()
@@ -0,0 +1,197 @@
+"""
+Keyset (cursor) pagination for SQLAlchemy select statements.
+
+Pages are ordered by a sort column with the primary key as tie-breaker, and
+the next page starts strictly after the (sort value, id) pair of the last row,
+so every page costs one index range scan regardless of how deep it is.
+Continuation tokens are opaque URL-safe strings; clients must not build them.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Generic, Iterable, List, Optional, Sequence, TypeVar
+
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+T = TypeVar("T")
+
+ESTIMATED_COUNT_QUERY = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+
+
+class ExplainJSON(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, keeping its bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(ExplainJSON, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a continuation token is malformed or was issued for another ordering."""
+
+
+class Page(List[T], Generic[T]):
+    """One page of results.
+
+    A plain list of the rows, so callers that only iterate keep working, plus
+    the token of the next page and the optional total.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[T] = (),
+        next_cursor: Optional[str] = None,
+        total: Optional[int] = None,
+        total_is_estimate: bool = False,
+    ):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+        self.total = total
+        self.total_is_estimate = total_is_estimate
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "value"):  # Enums
+        return value.value
+    return value
+
+
+def _load_value(value: Any, column) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return value
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Build the continuation token after a row with the given (sort value, id)."""
+    payload = json.dumps({"s": sort, "v": [_dump_value(value) for value in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, columns: Sequence[Any]) -> List[Any]:
+    """Get the (sort value, id) a continuation token points after.
+
+    Raises:
+        InvalidCursorError: If the token is malformed or belongs to another sort order
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values = payload["v"]
+        valid = payload["s"] == sort and isinstance(values, list) and len(values) == len(columns)
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        raise InvalidCursorError("Invalid pagination cursor")
+    try:
+        return [_load_value(value, column) for value, column in zip(values, columns)]
+    except (TypeError, ValueError):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+
+async def count_rows(session: AsyncSession, stmt: Select) -> int:
+    """Count the rows of a statement exactly."""
+    return await session.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+
+
+async def estimate_rows(session: AsyncSession, stmt: Select, table_name: str) -> Optional[int]:
+    """Estimate the rows of a statement from planner statistics.
+
+    Unfiltered statements use ``pg_class.reltuples`` of the table, filtered
+    ones the planner's row estimate. Returns None when no estimate exists, such
+    as on databases other than PostgreSQL or tables never analyzed.
+    """
+    if session.bind.dialect.name != "postgresql":
+        return None
+    if stmt.whereclause is None:
+        estimate = await session.scalar(ESTIMATED_COUNT_QUERY, {"table": table_name})
+    else:
+        plan = await session.scalar(ExplainJSON(stmt.order_by(None)))
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        estimate = plan[0]["Plan"]["Plan Rows"]
+    return int(estimate) if estimate is not None and estimate >= 0 else None
+
+
+async def paginate(
+    session: AsyncSession,
+    stmt: Select,
+    sort: str,
+    sort_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    include_total: bool = False,
+    estimate_total: bool = False,
+) -> Page:
+    """Fetch one page of a statement ordered by (sort column, id).
+
+    Args:
+        session: Session to run the queries in
+        stmt: Filtered statement selecting the rows, without ordering or limits. Pages of a statement
+            selecting one entity or column hold its values; otherwise they hold tuples of the selected columns
+        sort: Name of the ordering, recorded in tokens so they cannot be replayed against another one
+        sort_column: Non-nullable column or expression to order by; may be the id column itself
+        id_column: Primary key column breaking ties in the sort column
+        limit: Maximum number of rows of the page
+        cursor: Token of the page to fetch, None for the first page
+        descending: Whether to order from the highest value down
+        include_total: Whether to count all matching rows exactly
+        estimate_total: Whether to estimate the count from planner statistics instead
+
+    Returns:
+        The page, with the token of the next page when more rows follow
+
+    Raises:
+        InvalidCursorError: If the cursor is not valid for this ordering
+    """
+    columns = [sort_column] if sort_column is id_column else [sort_column, id_column]
+    key = tuple_(*columns) if len(columns) > 1 else columns[0]
+
+    page_stmt = stmt
+    if cursor:
+        after = decode_cursor(cursor, sort, columns)
+        bound = tuple_(*after) if len(after) > 1 else after[0]
+        page_stmt = page_stmt.where(key < bound if descending else key > bound)
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    # The key is selected alongside each row so that computed sort keys, such as
+    # search ranks, can continue a page too. One extra row tells whether another
+    # page follows without counting.
+    result = await session.execute(page_stmt.add_columns(*columns).order_by(*ordering).limit(limit + 1))
+    rows = result.all()
+    width = len(stmt.column_descriptions)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(sort, list(rows[-1][width:]))
+
+    total, total_is_estimate = None, False
+    if estimate_total:
+        total = await estimate_rows(session, stmt, stmt.get_final_froms()[0].name)
+        total_is_estimate = total is not None
+    if include_total or (estimate_total and total is None):
+        total = await count_rows(session, stmt)
+
+    items = [row[0] for row in rows] if width == 1 else [row[:width] for row in rows]
+    return Page(items, next_cursor=next_cursor, total=total, total_is_estimate=total_is_estimate)
@@ -2,13 +2,14 @@
 SQLAlchemy User repository implementation
 """
 
-from typing import List, Optional
+from typing import Optional
 
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.domain.entities.user import User
 from src.core.domain.repositories.user_repository import UserRepositoryInterface
+from src.infrastructure.persistence.pagination import Page, paginate
 from src.infrastructure.persistence.sqlalchemy.models.user import UserModel
 
 
@@ -118,21 +119,46 @@ class SQLAlchemyUserRepository(UserRepositoryInterface):
         await self._session.delete(db_user)
         return True
 
-    async def list_users(self, skip: int = 0, limit: int = 100) -> List[User]:
-        """List users with pagination"""
-        stmt = select(UserModel).offset(skip).limit(limit)
-        result = await self._session.execute(stmt)
-        db_users = result.scalars().all()
-
-        return [
-            User(
-                id=db_user.id,
-                email=db_user.email,
-                hashed_password=db_user.hashed_password,
-                full_name=db_user.full_name,
-                is_active=db_user.is_active,
-                created_at=db_user.created_at,
-                updated_at=db_user.updated_at,
+    async def list_users(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        estimate_total: bool = False,
+    ) -> Page[User]:
+        """List users with pagination, by keyset on id unless an offset is given"""
+        if skip:
+            stmt = select(UserModel).order_by(UserModel.id).offset(skip).limit(limit)
+            result = await self._session.execute(stmt)
+            db_users = Page(result.scalars().all())
+        else:
+            db_users = await paginate(
+                self._session,
+                select(UserModel),
+                sort="id:asc",
+                sort_column=UserModel.id,
+                id_column=UserModel.id,
+                limit=limit,
+                cursor=cursor,
+                include_total=include_total,
+                estimate_total=estimate_total,
             )
-            for db_user in db_users
-        ]
+
+        return Page(
+            (
+                User(
+                    id=db_user.id,
+                    email=db_user.email,
+                    hashed_password=db_user.hashed_password,
+                    full_name=db_user.full_name,
+                    is_active=db_user.is_active,
+                    created_at=db_user.created_at,
+                    updated_at=db_user.updated_at,
+                )
+                for db_user in db_users
+            ),
+            next_cursor=db_users.next_cursor,
+            total=db_users.total,
+            total_is_estimate=db_users.total_is_estimate,
+        )
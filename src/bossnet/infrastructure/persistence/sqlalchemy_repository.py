@@ -1,8 +1,9 @@
 from datetime import datetime
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+from typing import Any, Dict, Generic, Optional, Type, TypeVar
 
 from core.entities.base import DomainModel
 from core.repositories.base import Repository
+from infrastructure.persistence.pagination import Page, paginate
 from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -30,11 +31,46 @@ class SQLAlchemyRepository(Repository[EntityType, int], Generic[EntityType, Mode
             return None
         return self.entity_type.model_validate(result.__dict__)
 
-    async def list(self, skip: int = 0, limit: int = 100) -> List[EntityType]:
-        """List entities with pagination."""
-        stmt = select(self.model).offset(skip).limit(limit)
-        result = await self.session.execute(stmt)
-        return [self.entity_type.model_validate(item.__dict__) for item in result.scalars().all()]
+    async def list(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        *,
+        cursor: Optional[str] = None,
+        sort_by: str = "id",
+        descending: bool = False,
+        include_total: bool = False,
+        estimate_total: bool = False,
+    ) -> Page[EntityType]:
+        """List entities with pagination.
+
+        Without ``skip`` the page is fetched by keyset on (``sort_by``, id): pass the
+        returned page's ``next_cursor`` as ``cursor`` to continue. ``skip`` keeps
+        offset pagination for existing callers.
+        """
+        if skip:
+            stmt = select(self.model).order_by(self.model.id).offset(skip).limit(limit)
+            result = await self.session.execute(stmt)
+            return Page(self.entity_type.model_validate(item.__dict__) for item in result.scalars().all())
+
+        page = await paginate(
+            self.session,
+            select(self.model),
+            sort=f"{sort_by}:{'desc' if descending else 'asc'}",
+            sort_column=getattr(self.model, sort_by),
+            id_column=self.model.id,
+            limit=limit,
+            cursor=cursor,
+            descending=descending,
+            include_total=include_total,
+            estimate_total=estimate_total,
+        )
+        return Page(
+            (self.entity_type.model_validate(item.__dict__) for item in page),
+            next_cursor=page.next_cursor,
+            total=page.total,
+            total_is_estimate=page.total_is_estimate,
+        )
 
     async def add(self, entity: EntityType) -> EntityType:
         """Add a new entity."""
@@ -1,4 +1,4 @@
-from typing import Any, List
+from typing import Any, Optional
 
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -6,7 +6,7 @@ from src.application.services.user_service import UserService
 from src.core.domain.entities.user import User
 from src.infrastructure.container import Container
 from src.interfaces.api.dependencies import get_current_active_user
-from src.interfaces.api.v1.schemas.user import UserResponse, UserUpdate
+from src.interfaces.api.v1.schemas.user import UserPageResponse, UserResponse, UserUpdate
 
 router = APIRouter()
 
@@ -48,28 +48,40 @@ async def update_user_me(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=UserPageResponse)
 @inject
 async def list_users(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Continuation token from the previous page's next_cursor"),
     limit: int = Query(100, ge=1, le=1000),
+    include_total: bool = Query(False, description="Count all users"),
+    estimate_total: bool = Query(False, description="Estimate the number of users from planner statistics"),
     current_user: User = Depends(get_current_active_user),
     user_service: UserService = Depends(Provide[Container.user_service]),
 ) -> Any:
     """List users (admin only)"""
     # In a real app, you'd check if user is admin
-    users = await user_service.list_users(skip=skip, limit=limit)
-    return [
-        UserResponse(
-            id=user.id,
-            email=user.email,
-            full_name=user.full_name,
-            is_active=user.is_active,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
+    try:
+        users = await user_service.list_users(
+            limit=limit, cursor=cursor, include_total=include_total, estimate_total=estimate_total
         )
-        for user in users
-    ]
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return UserPageResponse(
+        items=[
+            UserResponse(
+                id=user.id,
+                email=user.email,
+                full_name=user.full_name,
+                is_active=user.is_active,
+                created_at=user.created_at,
+                updated_at=user.updated_at,
+            )
+            for user in users
+        ],
+        next_cursor=users.next_cursor,
+        total=users.total,
+        total_is_estimate=users.total_is_estimate,
+    )
 
 
 @router.get("/{user_id}", response_model=UserResponse)
@@ -3,7 +3,7 @@ User-related Pydantic schemas
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, validator
 
@@ -52,6 +52,15 @@ class UserResponse(UserBase):
         orm_mode = True
 
 
+class UserPageResponse(BaseModel):
+    """Schema for one page of users"""
+
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+
 class UserInDB(UserBase):
     """Schema for user in database"""
 
@@ -0,0 +1,240 @@
+"""
+Distributed rate limiting with the generic cell rate algorithm (GCRA).
+
+Each limit ``N/period`` admits one request every ``period / N`` on average,
+with bursts of up to ``N``. The only state per key is its theoretical arrival
+time (TAT), kept in Redis and updated by a single Lua script, so every worker
+and pod shares one count and each check is one round trip. The script reads
+the clock from Redis so workers with skewed clocks agree.
+
+Hot keys lease tokens: when a key saw several requests in the current or the
+last lease window, the script is asked for that many tokens at once (up to
+``RATE_LIMIT_MAX_LEASE``), and the leftovers are spent in-process until they
+expire after ``RATE_LIMIT_LEASE_TTL`` seconds. Tokens are reserved in Redis before they are handed out locally, so
+leasing never admits more than the limit; unspent tokens simply expire.
+Rejected keys are also remembered locally until they may pass again.
+
+While Redis is unreachable, limits are enforced per process with the same
+algorithm, and Redis is retried after a back-off.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before retrying an unreachable Redis server
+RECONNECT_BACKOFF = 30
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+_LIMIT = re.compile(r"^\s*(\d+)\s*(?:/|per)\s*(second|minute|hour|day)s?\s*$", re.IGNORECASE)
+
+# KEYS[1]: the key's TAT in ms. ARGV: emission interval in ms, period in ms, tokens wanted.
+# Returns tokens granted (0 when rejected), tokens remaining, ms until fully reset, ms until retry.
+GCRA_SCRIPT = """
+local emission = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local wanted = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local granted = math.min(wanted, math.floor((now + period - tat) / emission))
+if granted < 1 then
+    return {0, 0, tat - now, tat + emission - period - now}
+end
+tat = tat + granted * emission
+redis.call('SET', KEYS[1], tat, 'PX', tat - now)
+return {granted, math.floor((now + period - tat) / emission), tat - now, 0}
+"""
+
+
+class RateLimit(NamedTuple):
+    """A limit of ``limit`` requests per ``period`` seconds."""
+
+    limit: int
+    period: int
+
+    @property
+    def emission_ms(self) -> int:
+        return max(1, round(self.period * 1000 / self.limit))
+
+    @property
+    def policy(self) -> str:
+        """Value of the ``RateLimit-Policy`` header."""
+        return f"{self.limit};w={self.period}"
+
+
+def parse_limit(value: str) -> RateLimit:
+    """Parse a limit such as ``100/minute``."""
+    match = _LIMIT.match(value)
+    if not match or int(match.group(1)) < 1:
+        raise ValueError(f"Invalid rate limit: {value!r}")
+    return RateLimit(int(match.group(1)), PERIODS[match.group(2).lower()])
+
+
+class RateLimitDecision(NamedTuple):
+    """Outcome of a rate limit check, with the values of the ``RateLimit-*`` headers."""
+
+    allowed: bool
+    limit: RateLimit
+    remaining: int
+    reset: float  # seconds until the full limit is available again
+    retry_after: float  # seconds until a rejected request may be retried
+
+    def headers(self) -> dict:
+        headers = {
+            "RateLimit-Limit": str(self.limit.limit),
+            "RateLimit-Remaining": str(max(0, self.remaining)),
+            "RateLimit-Reset": str(math.ceil(self.reset)),
+            "RateLimit-Policy": self.limit.policy,
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class _LocalKey:
+    """In-process state of a key: leased tokens, a cached rejection and recent traffic."""
+
+    __slots__ = ("tokens", "remaining", "reset_at", "expires_at", "blocked_until", "hits", "recent_hits", "window_start")
+
+    def __init__(self, now: float):
+        self.tokens = 0
+        self.remaining = 0
+        self.reset_at = now
+        self.expires_at = now
+        self.blocked_until = 0.0
+        self.hits = 0
+        self.recent_hits = 0
+        self.window_start = now
+
+
+class RateLimiter:
+    """Shared GCRA rate limiter backed by Redis."""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = settings.REDIS_URL,
+        max_lease: int = settings.RATE_LIMIT_MAX_LEASE,
+        lease_ttl: float = settings.RATE_LIMIT_LEASE_TTL,
+        max_keys: int = settings.RATE_LIMIT_LOCAL_KEYS,
+        prefix: str = "ratelimit:",
+    ):
+        self.redis_url = redis_url
+        self.max_lease = max(1, max_lease)
+        self.lease_ttl = lease_ttl
+        self.max_keys = max_keys
+        self.prefix = prefix
+        self._keys: "OrderedDict[str, _LocalKey]" = OrderedDict()
+        # TATs of the per-process fallback, in ms of time.monotonic()
+        self._fallback: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._client = None
+        self._script = None
+        self._retry_at = 0.0
+
+    def _redis_script(self) -> Any:
+        """Get the registered GCRA script, or None while Redis is unreachable or not configured."""
+        if not self.redis_url or time.monotonic() < self._retry_at:
+            return None
+        if self._script is None:
+            try:
+                import redis.asyncio as redis
+
+                self._client = redis.Redis.from_url(self.redis_url, socket_timeout=0.5)
+                self._script = self._client.register_script(GCRA_SCRIPT)
+            except Exception as e:
+                self._disconnected(e)
+        return self._script
+
+    def _disconnected(self, error: Exception):
+        logger.warning(f"Rate limiter falling back to per-process limits, Redis unavailable: {error}")
+        self._retry_at = time.monotonic() + RECONNECT_BACKOFF
+
+    def _local_key(self, key: str, now: float) -> _LocalKey:
+        entry = self._keys.get(key)
+        if entry is None:
+            entry = self._keys[key] = _LocalKey(now)
+            while len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        else:
+            self._keys.move_to_end(key)
+        if now - entry.window_start >= self.lease_ttl:
+            entry.recent_hits, entry.hits, entry.window_start = entry.hits, 0, now
+        entry.hits += 1
+        return entry
+
+    def _check_local(self, entry: _LocalKey, limit: RateLimit, now: float) -> Optional[RateLimitDecision]:
+        """Answer from the leased tokens or a cached rejection, if possible."""
+        if entry.blocked_until > now:
+            return RateLimitDecision(False, limit, 0, entry.reset_at - now, entry.blocked_until - now)
+        if entry.tokens > 0 and entry.expires_at > now:
+            entry.tokens -= 1
+            return RateLimitDecision(True, limit, entry.remaining + entry.tokens, entry.reset_at - now, 0.0)
+        return None
+
+    def _reserve_fallback(self, key: str, limit: RateLimit, wanted: int) -> Tuple[int, int, float, float]:
+        """Run the GCRA script's logic in-process."""
+        now = time.monotonic() * 1000
+        period = limit.period * 1000
+        emission = limit.emission_ms
+        with self._lock:
+            tat = max(self._fallback.get(key, now), now)
+            granted = min(wanted, math.floor((now + period - tat) / emission))
+            if granted < 1:
+                return 0, 0, tat - now, tat + emission - period - now
+            tat += granted * emission
+            self._fallback[key] = tat
+            self._fallback.move_to_end(key)
+            while len(self._fallback) > self.max_keys:
+                self._fallback.popitem(last=False)
+        return granted, math.floor((now + period - tat) / emission), tat - now, 0
+
+    async def _reserve(self, key: str, limit: RateLimit, wanted: int) -> Tuple[int, int, float, float]:
+        script = self._redis_script()
+        if script is not None:
+            try:
+                granted, remaining, reset_ms, retry_ms = await script(
+                    keys=[self.prefix + key], args=[limit.emission_ms, limit.period * 1000, wanted]
+                )
+                return int(granted), int(remaining), float(reset_ms), float(retry_ms)
+            except Exception as e:
+                self._disconnected(e)
+        return self._reserve_fallback(key, limit, wanted)
+
+    async def hit(self, key: str, limit: RateLimit) -> RateLimitDecision:
+        """Count a request against a key's limit."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local_key(key, now)
+            decision = self._check_local(entry, limit, now)
+            wanted = min(self.max_lease, max(entry.hits, entry.recent_hits), limit.limit)
+        if decision is not None:
+            return decision
+
+        granted, remaining, reset_ms, retry_ms = await self._reserve(key, limit, wanted)
+        now = time.monotonic()
+        with self._lock:
+            entry.reset_at = now + reset_ms / 1000
+            if not granted:
+                entry.blocked_until = now + retry_ms / 1000
+                return RateLimitDecision(False, limit, 0, reset_ms / 1000, retry_ms / 1000)
+            # The first token serves this request, the rest are spent locally
+            entry.tokens = granted - 1
+            entry.remaining = remaining
+            entry.expires_at = now + self.lease_ttl
+        return RateLimitDecision(True, limit, remaining + granted - 1, reset_ms / 1000, 0.0)
+
+
+rate_limiter = RateLimiter()
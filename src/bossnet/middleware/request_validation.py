@@ -1,36 +1,247 @@
 """
 Request validation middleware for FastAPI application.
 Implements request validation and sanitization.
+
+Query parameters and JSON bodies are checked against a single precompiled
+pattern covering every attack signature, so each string is scanned once.
+JSON bodies are parsed once: the parsed body is stored in the request state
+and routes using ``ParsedBodyRoute`` read it from there instead of parsing
+the body again. Scanning stops after ``REQUEST_SCAN_MAX_CHARS``
+characters of keys and values, or below ``REQUEST_SCAN_MAX_DEPTH`` levels of
+nesting, so large payloads cost a bounded amount of inspection.
+
+Multipart uploads are not buffered: ``UploadValidator`` checks each file's
+type and leading bytes and counts the body size as the application reads
+the stream.
 """
 
 import json
 import logging
 import re
-from typing import Any, Dict, List, Optional, Pattern
+from typing import Any, Callable, Dict, List, Optional, Pattern, Set, Tuple
 
 from fastapi import HTTPException, Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers, QueryParams
+from starlette.requests import ClientDisconnect
 from starlette.responses import JSONResponse
 
+from config import settings
+
+try:
+    import python_multipart as multipart
+    from python_multipart.multipart import parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    import multipart
+    from multipart.multipart import parse_options_header
+
 logger = logging.getLogger(__name__)
 
+# Attack signatures, matched against lowercased input. All but the script tag start at
+# a word boundary and share a single \b, so the combined pattern only tries them where a
+# word starts; lowercasing once is much cheaper than case-insensitive matching.
+SCRIPT_TAG_PATTERN = r"<script[^>]*>.*?</script>"  # XSS
+WORD_PATTERNS: List[str] = [
+    r"(?:select|insert|update|delete|drop|truncate|--|/\*|\*/|@@|@|char\(|or\s+1=1|waitfor\s+delay)\b",  # SQL Injection
+    r"(?:document\.cookie|eval\(|alert\(|onload=|onerror=|onclick=)",  # XSS
+    r"(?:union\s+select|exec\s*\(|sp_|xp_|;--|/\*!|@@version)\b",  # More SQLi
+    r"(?:javascript|data|vbscript):",  # Suspicious URL schemes
+    r"on\w+\s*=",  # HTML/JavaScript event handlers
+]
+
+MALICIOUS_INPUT: Pattern = re.compile(SCRIPT_TAG_PATTERN + r"|\b(?:" + "|".join(WORD_PATTERNS) + ")", re.DOTALL)
+
+# Leading bytes every file of a content type starts with; types not listed only need content
+FILE_SIGNATURES: Dict[str, Tuple[bytes, ...]] = {
+    "image/jpeg": (b"\xff\xd8\xff",),
+    "image/png": (b"\x89PNG\r\n\x1a\n",),
+    "image/gif": (b"GIF87a", b"GIF89a"),
+    "application/pdf": (b"%PDF-",),
+    "application/msword": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",),
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": (b"PK\x03\x04",),
+}
+
+# Text types, whose files must not contain NUL bytes
+TEXT_FILE_TYPES = {"text/csv"}
+
+# Bytes of each uploaded file inspected before it is let through
+SNIFF_SIZE = 1024
+
+# Request state attribute holding the parsed JSON body
+JSON_BODY_STATE = "json_body"
+
+_NOT_PARSED = object()
+
+
+class ParsedBodyRequest(Request):
+    """Request reusing the JSON body already parsed by RequestValidationMiddleware."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            body = self.scope.get("state", {}).get(JSON_BODY_STATE, _NOT_PARSED)
+            self._json = await super().json() if body is _NOT_PARSED else body
+        return self._json
+
+
+class ParsedBodyRoute(APIRoute):
+    """Route whose handler reads the JSON body parsed during request validation."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def parsed_body_handler(request: Request):
+            return await handler(ParsedBodyRequest(request.scope, request.receive))
+
+        return parsed_body_handler
+
+
+class RequestTooLarge(Exception):
+    """The request body is larger than allowed."""
+
+
+async def read_body(receive, max_size: int) -> bytes:
+    """Read the whole request body, refusing bodies larger than ``max_size`` bytes."""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise ClientDisconnect()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > max_size:
+            raise RequestTooLarge()
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def replay_body(body: bytes, receive):
+    """ASGI receive callable delivering an already read body, then the client's later messages."""
+    delivered = False
+
+    async def replay():
+        nonlocal delivered
+        if delivered:
+            return await receive()
+        delivered = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return replay
+
+
+class UploadValidator:
+    """Validates a multipart body chunk by chunk as the application reads it.
+
+    Each file part's declared content type is checked when its headers end,
+    and its first ``SNIFF_SIZE`` bytes as soon as they arrive, so a bad file
+    is refused before the rest of the upload is read. The body size is
+    counted as it streams, whether or not a content-length was sent. Nothing
+    is buffered besides the sniffed bytes; the chunks go on to the
+    application's own form parser.
+    """
+
+    def __init__(self, boundary: bytes, allowed_types: Set[str], max_size: int, check_content: Callable[[bytes, str], bool]):
+        self.allowed_types = allowed_types
+        self.max_size = max_size
+        self.check_content = check_content
+        self.size = 0
+        self._header_name = b""
+        self._header_value = b""
+        self._headers: Dict[bytes, bytes] = {}
+        self._content_type: Optional[str] = None
+        self._sniffed: Optional[bytearray] = None
+        self.parser = multipart.MultipartParser(
+            boundary,
+            callbacks={
+                "on_part_begin": self.on_part_begin,
+                "on_header_field": self.on_header_field,
+                "on_header_value": self.on_header_value,
+                "on_header_end": self.on_header_end,
+                "on_headers_finished": self.on_headers_finished,
+                "on_part_data": self.on_part_data,
+                "on_part_end": self.on_part_end,
+            },
+        )
+
+    def feed(self, chunk: bytes, more_body: bool):
+        """Validate the next chunk of the body, raising HTTPException if the upload is refused."""
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise HTTPException(status_code=413, detail=f"File size exceeds maximum allowed size of {self.max_size} bytes")
+        try:
+            self.parser.write(chunk)
+            if not more_body:
+                self.parser.finalize()
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error validating file upload: {str(e)}")
+            raise HTTPException(status_code=400, detail="Invalid file type or content")
+
+    def _refuse(self):
+        raise HTTPException(status_code=400, detail="Invalid file type or content")
+
+    def on_part_begin(self):
+        self._headers = {}
+        self._content_type = None
+        self._sniffed = None
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        self._headers[self._header_name.lower()] = self._header_value
+        self._header_name = self._header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        content_type = self._headers.get(b"content-type", b"").decode("latin-1").strip().lower()
+        # Only files with a declared type are checked, as form fields carry no content type
+        if b"filename" in options and content_type:
+            if content_type not in self.allowed_types:
+                self._refuse()
+            self._content_type = content_type
+            self._sniffed = bytearray()
 
-class RequestValidationMiddleware(BaseHTTPMiddleware):
-    """Middleware for validating and sanitizing incoming requests."""
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if self._sniffed is None:
+            return
+        self._sniffed += data[start : min(end, start + SNIFF_SIZE - len(self._sniffed))]
+        if len(self._sniffed) >= SNIFF_SIZE:
+            self._check_sniffed()
 
-    def __init__(self, app, **kwargs):
-        super().__init__(app)
+    def on_part_end(self):
+        if self._sniffed is not None:
+            self._check_sniffed()
 
-        # Common malicious patterns to block
-        self.malicious_patterns: List[Pattern] = [
-            re.compile(r"<script[^>]*>.*?</script>", re.IGNORECASE | re.DOTALL),  # XSS
-            re.compile(
-                r"\b(?:select|insert|update|delete|drop|truncate|--|/\*|\*/|@@|@|char\(|or\s+1=1|waitfor\s+delay)\b",
-                re.IGNORECASE,
-            ),  # SQL Injection
-            re.compile(r"\b(?:document\.cookie|eval\(|alert\(|onload=|onerror=|onclick=)", re.IGNORECASE),  # XSS
-            re.compile(r"\b(?:union\s+select|exec\s*\(|sp_|xp_|;--|/\*!|@@version)\b", re.IGNORECASE),  # More SQLi
-        ]
+    def _check_sniffed(self):
+        if not self.check_content(bytes(self._sniffed), self._content_type):
+            self._refuse()
+        self._sniffed = None
+
+
+class RequestValidationMiddleware:
+    """Middleware for validating and sanitizing incoming requests.
+
+    A pure ASGI middleware: the body is only read for JSON and multipart
+    requests that need inspecting, and responses pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app,
+        max_scanned_chars: int = settings.REQUEST_SCAN_MAX_CHARS,
+        max_scanned_depth: int = settings.REQUEST_SCAN_MAX_DEPTH,
+        max_file_size: int = 10 * 1024 * 1024,  # 10MB
+        **kwargs,
+    ):
+        self.app = app
+        self.max_scanned_chars = max_scanned_chars
+        self.max_scanned_depth = max_scanned_depth
 
         # File upload restrictions
         self.allowed_file_types = {
@@ -40,118 +251,150 @@ class RequestValidationMiddleware(BaseHTTPMiddleware):
             "application/pdf",
             "application/msword",
             "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            "text/csv",
         }
-        self.max_file_size = 10 * 1024 * 1024  # 10MB
+        self.max_file_size = max_file_size
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope, receive, send):
         # Skip validation for certain paths
-        if request.url.path.startswith("/docs") or request.url.path.startswith("/openapi.json"):
-            return await call_next(request)
+        if scope["type"] != "http" or scope["path"].startswith(("/docs", "/openapi.json")):
+            await self.app(scope, receive, send)
+            return
 
-        # Check content length
-        content_length = request.headers.get("content-length")
-        if content_length and int(content_length) > self.max_file_size:
-            return JSONResponse(
+        try:
+            receive, streaming_upload = await self._validate(scope, receive)
+        except HTTPException as e:
+            await JSONResponse(status_code=e.status_code, content={"detail": str(e.detail)})(scope, receive, send)
+            return
+        except RequestTooLarge:
+            response = JSONResponse(
                 status_code=413, content={"detail": f"File size exceeds maximum allowed size of {self.max_file_size} bytes"}
             )
+            await response(scope, receive, send)
+            return
+        except ClientDisconnect:
+            return
+        except Exception as e:
+            logger.error(f"Error during request validation: {str(e)}")
+            response = JSONResponse(status_code=500, content={"detail": "Internal server error during request validation"})
+            await response(scope, receive, send)
+            return
 
-        # Check content type for file uploads
-        content_type = request.headers.get("content-type", "").lower()
-        if "multipart/form-data" in content_type:
-            if not await self._validate_file_upload(request):
-                return JSONResponse(status_code=400, content={"detail": "Invalid file type or content"})
+        if streaming_upload:
+            await self._call_validating_upload(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
 
-        # Check for malicious input in query params and JSON body
-        try:
-            # Check query parameters
-            for param, value in request.query_params.items():
-                if self._is_malicious(str(value)):
-                    logger.warning(f"Potential malicious input detected in query param {param}")
-                    raise HTTPException(status_code=400, detail="Invalid input detected")
-
-            # Check JSON body
-            if request.method in ("POST", "PUT", "PATCH"):
-                if "application/json" in content_type:
-                    try:
-                        body = await request.json()
-                        if self._check_dict_for_malicious_input(body):
-                            logger.warning("Potential malicious input detected in request body")
-                            raise HTTPException(status_code=400, detail="Invalid input detected")
-                    except json.JSONDecodeError:
-                        pass  # Not JSON, skip
-
-            return await call_next(request)
+    async def _call_validating_upload(self, scope, receive, send):
+        """Run the application, answering upload refusals raised while it reads the body."""
+        response_started = False
 
-        except HTTPException as e:
-            return JSONResponse(status_code=e.status_code, content={"detail": str(e.detail)})
-        except Exception as e:
-            logger.error(f"Error during request validation: {str(e)}")
-            return JSONResponse(status_code=500, content={"detail": "Internal server error during request validation"})
+        async def send_tracking_start(message):
+            nonlocal response_started
+            response_started = response_started or message["type"] == "http.response.start"
+            await send(message)
 
-    async def _validate_file_upload(self, request: Request) -> bool:
-        """Validate file uploads for type and content."""
         try:
-            form_data = await request.form()
-            for _, file in form_data.multi_items():
-                if hasattr(file, "content_type") and file.content_type:
-                    if file.content_type not in self.allowed_file_types:
-                        return False
+            await self.app(scope, receive, send_tracking_start)
+        except HTTPException as e:
+            # FastAPI turns refusals into responses itself; other applications let them through
+            if response_started:
+                raise
+            await JSONResponse(status_code=e.status_code, content={"detail": str(e.detail)})(scope, receive, send)
 
-                    # Read first few bytes to validate file type
-                    content = await file.read(1024)
-                    if not self._is_valid_file_content(content, file.content_type):
-                        return False
+    async def _validate(self, scope, receive):
+        """Validate the request and get the receive callable to pass on, and whether it validates an upload.
 
-                    # Reset file pointer
-                    await file.seek(0)
+        The body is replayed if it was read; uploads are validated as the application reads them.
+        """
+        headers = Headers(scope=scope)
 
-            return True
-        except Exception as e:
-            logger.error(f"Error validating file upload: {str(e)}")
-            return False
+        # Check content length
+        content_length = headers.get("content-length")
+        if content_length and int(content_length) > self.max_file_size:
+            raise RequestTooLarge()
+
+        # Check query parameters
+        for param, value in QueryParams(scope["query_string"]).multi_items():
+            if self._is_malicious(value):
+                logger.warning(f"Potential malicious input detected in query param {param}")
+                raise HTTPException(status_code=400, detail="Invalid input detected")
+
+        # Check content type for file uploads
+        content_type = headers.get("content-type", "").lower()
+        if "multipart/form-data" in content_type:
+            return self._validate_file_upload(receive, headers["content-type"]), True
+
+        # Check JSON body, parsed once and kept for the route
+        if scope["method"] in ("POST", "PUT", "PATCH") and "application/json" in content_type:
+            body = await read_body(receive, self.max_file_size)
+            receive = replay_body(body, receive)
+            try:
+                parsed = json.loads(body) if body else None
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                pass  # Not JSON, skip; the route reports the parse error
+            else:
+                if parsed is not None:
+                    scope.setdefault("state", {})[JSON_BODY_STATE] = parsed
+                    if self._check_dict_for_malicious_input(parsed):
+                        logger.warning("Potential malicious input detected in request body")
+                        raise HTTPException(status_code=400, detail="Invalid input detected")
+
+        return receive, False
+
+    def _validate_file_upload(self, receive, content_type: str):
+        """Get a receive callable validating file uploads for type and content as they stream in."""
+        _, options = parse_options_header(content_type)
+        boundary = options.get(b"boundary")
+        if not boundary:
+            raise HTTPException(status_code=400, detail="Invalid file type or content")
+        validator = UploadValidator(boundary, self.allowed_file_types, self.max_file_size, self._is_valid_file_content)
+
+        async def validating_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                validator.feed(message.get("body", b""), message.get("more_body", False))
+            return message
+
+        return validating_receive
 
     def _is_valid_file_content(self, content: bytes, content_type: str) -> bool:
         """Validate file content based on its type."""
         if not content:
             return False
 
-        # Add more specific validations based on file type
-        if content_type == "application/pdf" and not content.startswith(b"%PDF-"):
+        # Files of types with known signatures must start with one of them
+        signatures = FILE_SIGNATURES.get(content_type)
+        if signatures and not content.startswith(signatures):
+            return False
+        if content_type in TEXT_FILE_TYPES and b"\x00" in content:
             return False
 
-        # Add more file type validations as needed
         return True
 
     def _check_dict_for_malicious_input(self, data: Any) -> bool:
-        """Recursively check dictionary for malicious input."""
-        if isinstance(data, dict):
-            return any(
-                self._is_malicious(str(key)) or self._check_dict_for_malicious_input(value) for key, value in data.items()
-            )
-        elif isinstance(data, (list, tuple)):
-            return any(self._check_dict_for_malicious_input(item) for item in data)
-        elif isinstance(data, str):
-            return self._is_malicious(data)
+        """Check the keys and values of parsed JSON for malicious input, within the scan limits."""
+        budget = self.max_scanned_chars
+        stack = [(data, 0)]
+        while stack:
+            item, depth = stack.pop()
+            if isinstance(item, str):
+                if MALICIOUS_INPUT.search(item[:budget].lower()):
+                    return True
+                budget -= len(item)
+            elif depth >= self.max_scanned_depth:
+                continue
+            elif isinstance(item, dict):
+                for key, value in item.items():
+                    stack.append((value, depth + 1))
+                    stack.append((str(key), depth + 1))
+            elif isinstance(item, (list, tuple)):
+                stack.extend((value, depth + 1) for value in reversed(item))
+            if budget <= 0:
+                logger.debug("Request body inspection stopped at the scan limit")
+                return False
         return False
 
     def _is_malicious(self, input_str: str) -> bool:
         """Check if input contains malicious patterns."""
-        if not input_str:
-            return False
-
-        input_lower = input_str.lower()
-
-        # Check for common attack patterns
-        for pattern in self.malicious_patterns:
-            if pattern.search(input_lower):
-                return True
-
-        # Check for suspicious URL schemes
-        if re.search(r"\b(?:javascript|data|vbscript):", input_lower):
-            return True
-
-        # Check for suspicious HTML/JavaScript events
-        if re.search(r"\bon\w+\s*=", input_lower):
-            return True
-
-        return False
+        return bool(input_str) and MALICIOUS_INPUT.search(input_str.lower()) is not None
@@ -7,78 +7,163 @@ Implements security best practices including:
 """
 
 import logging
-import time
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import HTTPException, JSONResponse, Request
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from settings import settings
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
-from slowapi.util import get_remote_address
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
+from jose import JWTError, jwt
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+
+from config import settings
+from config.security import security_settings
+
+from .rate_limiter import RateLimit, RateLimiter, parse_limit, rate_limiter
+from .request_validation import RequestValidationMiddleware
 
 logger = logging.getLogger(__name__)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware that adds security headers to all responses."""
+SECURITY_HEADERS: Dict[str, str] = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Content-Security-Policy": "default-src 'self'",
+}
 
-    def __init__(self, app, **kwargs):
-        super().__init__(app)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
+class SecurityHeadersMiddleware:
+    """Middleware that adds security headers to all responses.
 
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Content-Security-Policy"] = "default-src 'self'"
+    The headers are added to the response start message as it is sent, so
+    responses are never buffered and streaming responses keep streaming.
+    """
 
-        return response
+    def __init__(self, app, headers: Optional[Dict[str, str]] = None, **kwargs):
+        self.app = app
+        headers = SECURITY_HEADERS if headers is None else headers
+        self.raw_headers: List[Tuple[bytes, bytes]] = [
+            (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()
+        ]
+        self.header_names = {name for name, _ in self.raw_headers}
 
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-class RateLimitMiddleware:
-    """Middleware for rate limiting requests."""
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                # Replace any values the application set for the same headers
+                headers = [header for header in message.get("headers", ()) if header[0].lower() not in self.header_names]
+                message["headers"] = headers + self.raw_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
-    def __init__(self, app, limit: str = "100/minute", key_func=None):
+
+class RateLimitMiddleware:
+    """Middleware for rate limiting requests.
+
+    Requests are counted per principal: the user of a valid bearer token, or
+    else the client address. Routes listed in ``routes`` (``"METHOD /path"``,
+    ``*`` for any method, matching the path and everything below it) have
+    their own limit; other requests share the default limit of their kind of
+    principal. Counts are shared by all workers through ``RateLimiter``.
+    """
+
+    def __init__(
+        self,
+        app,
+        limit: str = settings.RATE_LIMIT_ANONYMOUS,
+        authenticated_limit: str = settings.RATE_LIMIT_AUTHENTICATED,
+        routes: Optional[Dict[str, str]] = None,
+        limiter: RateLimiter = rate_limiter,
+    ):
         self.app = app
-        self.limiter = Limiter(key_func=key_func or get_remote_address, default_limits=[limit])
+        self.limiter = limiter
+        self.anonymous_limit = parse_limit(limit)
+        self.authenticated_limit = parse_limit(authenticated_limit)
+
+        # Longest paths first, so the most specific rule wins
+        self.routes: List[Tuple[Optional[str], str, str, RateLimit]] = []
+        for rule, value in (settings.RATE_LIMIT_ROUTES if routes is None else routes).items():
+            method, _, path = rule.strip().partition(" ")
+            method = None if method == "*" else method.upper()
+            self.routes.append((method, path.strip().rstrip("/"), rule, parse_limit(value)))
+        self.routes.sort(key=lambda route: len(route[1]), reverse=True)
+
+    def _principal(self, scope) -> Optional[str]:
+        """Get the user id of the request's bearer token, if it is valid."""
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() != "bearer" or not token:
+                    return None
+                try:
+                    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+                except JWTError:
+                    return None
+                return payload.get("sub") if payload.get("type") == "access" else None
+        return None
+
+    def _rule(self, scope, authenticated: bool) -> Tuple[str, RateLimit]:
+        path = scope["path"].rstrip("/")
+        for method, prefix, rule, limit in self.routes:
+            if (method is None or method == scope["method"]) and (path == prefix or path.startswith(prefix + "/")):
+                return rule, limit
+        return ("default", self.authenticated_limit) if authenticated else ("default", self.anonymous_limit)
 
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http":
             await self.app(scope, receive, send)
             return
 
-        request = Request(scope, receive)
-
-        # Check rate limit
-        endpoint = f"{request.method}:{request.url.path}"
-        try:
-            self.limiter.check(request, endpoint)
-        except RateLimitExceeded:
-            response = JSONResponse(status_code=429, content={"detail": "Too many requests"})
+        user_id = self._principal(scope)
+        if user_id is not None:
+            principal = f"user:{user_id}"
+        else:
+            client = scope.get("client")
+            principal = f"ip:{client[0] if client else 'unknown'}"
+        rule, limit = self._rule(scope, user_id is not None)
+
+        decision = await self.limiter.hit(f"{rule}:{principal}", limit)
+        headers = decision.headers()
+        if not decision.allowed:
+            response = JSONResponse(status_code=429, content={"detail": "Too many requests"}, headers=headers)
             await response(scope, receive, send)
             return
 
-        await self.app(scope, receive, send)
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 def setup_security_middleware(app):
-    """Configure all security-related middleware."""
+    """Configure all security-related middleware.
 
-    # Add security headers
-    app.add_middleware(SecurityHeadersMiddleware)
+    Every middleware here is pure ASGI. The last one added runs first, so
+    requests pass the trusted host and HTTPS checks, then rate limiting, then
+    validation; security headers are added to every response, including
+    rejections.
+    """
+
+    # Add request validation
+    if security_settings.ENABLE_REQUEST_VALIDATION:
+        app.add_middleware(RequestValidationMiddleware)
 
     # Add rate limiting
-    app.add_middleware(RateLimitMiddleware, limit="100/minute")
+    app.add_middleware(RateLimitMiddleware)
+
+    # Add security headers
+    if security_settings.ENABLE_SECURITY_HEADERS:
+        app.add_middleware(SecurityHeadersMiddleware)
 
     # Add GZip compression
     app.add_middleware(GZipMiddleware, minimum_size=1000)
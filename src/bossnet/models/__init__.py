@@ -1,15 +1,36 @@
 """
 Database models for the Bangladesh Education Data Warehouse.
+
+Models are imported on first use, so importing one module of the package does
+not map every table.
 """
 
-from ..infrastructure.persistence.sqlalchemy.models.user import UserRoleModel
-from .academic import AssessmentModel, AssessmentResultModel, AttendanceModel, EnrollmentModel, GradeModel, SubjectModel
-from .base import Base
-from .geography import DistrictModel, DivisionModel, UpazilaModel
-from .performance import PerformanceMetricModel, SchoolPerformanceModel, StudentPerformanceModel
-from .school import ClassroomModel, SchoolModel, TeacherModel
-from .student import GuardianModel, StudentModel
-from .user import RefreshTokenModel, RoleModel, UserModel
+from importlib import import_module
+
+_MODELS = {
+    "UserRoleModel": "..infrastructure.persistence.sqlalchemy.models.user",
+    "AssessmentModel": ".academic",
+    "AssessmentResultModel": ".academic",
+    "AttendanceModel": ".academic",
+    "EnrollmentModel": ".academic",
+    "GradeModel": ".academic",
+    "SubjectModel": ".academic",
+    "Base": ".base",
+    "DistrictModel": ".geography",
+    "DivisionModel": ".geography",
+    "UpazilaModel": ".geography",
+    "PerformanceMetricModel": ".performance",
+    "SchoolPerformanceModel": ".performance",
+    "StudentPerformanceModel": ".performance",
+    "ClassroomModel": ".school",
+    "SchoolModel": ".school",
+    "TeacherModel": ".school",
+    "GuardianModel": ".student",
+    "StudentModel": ".student",
+    "RefreshTokenModel": ".user",
+    "RoleModel": ".user",
+    "UserModel": ".user",
+}
 
 __all__ = [
     # Base
@@ -42,3 +63,9 @@ __all__ = [
     "SchoolPerformanceModel",
     "PerformanceMetricModel",
 ]
+
+
+def __getattr__(name):
+    if name not in _MODELS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_MODELS[name], __name__), name)
@@ -320,7 +320,7 @@ class StudentUpdate(BaseModel):
 class StudentInDB(StudentBase):
     id: int
     created_at: datetime
-    updated_at: datetime
+    updated_at: Optional[datetime] = None  # set on the first update
 
     model_config = {"from_attributes": True}
 
@@ -330,7 +330,40 @@ class StudentResponse(StudentInDB):
 
 
 class PaginatedStudentResponse(BaseModel):
-    total: int
-    skip: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
     limit: int
+    next_cursor: Optional[str] = None
     items: List[StudentResponse]
+
+
+class ImportRowStatus(str, Enum):
+    """Outcome of one row of a bulk import."""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    SKIPPED = "skipped"  # repeats the student ID of an earlier row in the same batch
+    FAILED = "failed"
+
+
+class StudentImportRow(BaseModel):
+    row: int = Field(..., description="Position of the record in the file, starting at 1")
+    student_id: Optional[str] = None
+    status: ImportRowStatus
+    errors: List[str] = []
+
+
+class StudentImportResult(BaseModel):
+    total: int = 0
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    rows: List[StudentImportRow] = []
+
+
+class StudentImportJob(BaseModel):
+    job_id: str
+    status: str = Field(..., description="pending, started, success or failure")
+    result: Optional[StudentImportResult] = None
+    error: Optional[str] = None
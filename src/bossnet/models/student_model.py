@@ -1,13 +1,14 @@
+import enum
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, Enum, Index, Integer, String
+from sqlalchemy import Column, Date, DateTime, Index, Integer, String
 from sqlalchemy.dialects.postgresql import ENUM as PgEnum
 from sqlalchemy.sql import func
 
 from database.base import Base
 
 
-class Gender(str, Enum):
+class Gender(str, enum.Enum):
     MALE = "male"
     FEMALE = "female"
     OTHER = "other"
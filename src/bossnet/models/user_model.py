@@ -1,11 +1,13 @@
+import hashlib
 import uuid
 from datetime import datetime, timedelta
 
 from auth.models import PasswordMixin, UserRole
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Index, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Index, Integer, String, event, inspect
 from sqlalchemy.dialects.postgresql import ENUM as PgEnum
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, object_session, relationship
+from sqlalchemy.orm.base import NEVER_SET, NO_VALUE
 from sqlalchemy.sql import func, text
 
 from config import settings
@@ -31,6 +33,8 @@ class UserDB(Base, PasswordMixin):
     last_login = Column(DateTime(timezone=True), nullable=True)
     login_attempts = Column(Integer, default=0)
     account_locked_until = Column(DateTime(timezone=True), nullable=True)
+    # Bumped whenever the password, role or active flag changes; tokens of older versions are rejected
+    security_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -63,6 +67,14 @@ class UserDB(Base, PasswordMixin):
         """Verify password"""
         return self.verify_password(password, self.hashed_password)
 
+    def upgrade_password_hash(self, new_hash: str):
+        """Replace the hash of the current password with a stronger one, keeping issued tokens valid"""
+        self._rehashing = True
+        try:
+            self.hashed_password = new_hash
+        finally:
+            self._rehashing = False
+
     def generate_email_verification_token(self):
         """Generate email verification token"""
         self.email_verification_token = str(uuid.uuid4())
@@ -103,13 +115,55 @@ class UserDB(Base, PasswordMixin):
         return True
 
 
+def _bump_security_version(target, value, oldvalue, initiator):
+    """Invalidate the user's tokens and cached principal when a security attribute changes."""
+    if target.id is None or oldvalue is NO_VALUE or oldvalue is NEVER_SET or value == oldvalue:
+        return
+    # A rehash of the same password with new settings is not a security change
+    if getattr(target, "_rehashing", False):
+        return
+    target.security_version = (target.security_version or 0) + 1
+
+
+for _attribute in (UserDB.hashed_password, UserDB.role, UserDB.is_active):
+    event.listen(_attribute, "set", _bump_security_version, active_history=True)
+
+
+@event.listens_for(UserDB, "after_update")
+def _queue_principal_invalidation(mapper, connection, target):
+    """Remember users whose security version changed, to evict them once the change commits."""
+    if inspect(target).attrs.security_version.history.has_changes():
+        session = object_session(target)
+        session.info.setdefault("invalidated_principals", {})[target.id] = target.security_version
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals(session):
+    """Evict cached principals only after commit, so no request can re-cache the old state."""
+    invalidated = session.info.pop("invalidated_principals", None)
+    if invalidated:
+        from auth.principal_cache import principal_cache
+
+        for user_id, security_version in invalidated.items():
+            principal_cache.invalidate(user_id, security_version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_invalidations(session):
+    session.info.pop("invalidated_principals", None)
+
+
 class RefreshToken(Base):
-    """Refresh token model for JWT refresh tokens"""
+    """Refresh token model for JWT refresh tokens
+
+    Only the SHA-256 digest of each token is stored; tokens are looked up by
+    the digest of the presented value.
+    """
 
     __tablename__ = "refresh_tokens"
 
     id = Column(Integer, primary_key=True, index=True)
-    token = Column(String(512), unique=True, index=True, nullable=False)
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -118,6 +172,23 @@ class RefreshToken(Base):
     # Relationships
     user = relationship("UserDB", back_populates="refresh_tokens")
 
+    __table_args__ = (
+        # Covers revoking and listing a user's live tokens without visiting the table
+        Index(
+            "ix_refresh_tokens_user_id_revoked_at",
+            "user_id",
+            "revoked_at",
+            postgresql_include=["expires_at"],
+        ),
+        # Lets the reaper find expired tokens in batches
+        Index("ix_refresh_tokens_expires_at", "expires_at"),
+    )
+
+    @staticmethod
+    def hash_token(token: str) -> str:
+        """Get the stored digest of a refresh token"""
+        return hashlib.sha256(token.encode()).hexdigest()
+
     def is_expired(self) -> bool:
         """Check if token is expired"""
         return datetime.utcnow() >= self.expires_at
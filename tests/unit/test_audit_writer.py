@@ -0,0 +1,152 @@
+"""Tests for the batched audit log writer."""
+
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from audit import audit_service
+from audit.audit_service import AuditEventModel, AuditService
+from audit.audit_writer import AuditWriter
+
+
+async def audit_database():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(AuditEventModel.__table__.create)
+    return engine, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def stored_events(session_factory):
+    async with session_factory() as session:
+        return (await session.execute(select(AuditEventModel).order_by(AuditEventModel.id))).scalars().all()
+
+
+def test_events_are_queued_and_inserted_in_batches(monkeypatch, tmp_path):
+    """log_event only queues; the writer inserts batches and stop() writes what is left."""
+
+    async def log_events():
+        engine, session_factory = await audit_database()
+        writer = AuditWriter(
+            AuditEventModel.__table__, session_factory=session_factory, batch_size=3, spool_path=tmp_path / "spool"
+        )
+        monkeypatch.setattr(audit_service, "audit_writer", writer)
+        service = AuditService()
+        for index in range(7):
+            await service.log_event("data_access", "read_student", user_id=index, details={"token": "secret"})
+        queued = writer.stats()["queue_depth"]
+        await writer.stop()
+        events = await stored_events(session_factory)
+        await engine.dispose()
+        return writer, queued, events
+
+    writer, queued, events = asyncio.run(log_events())
+
+    assert queued == 7
+    assert [event.user_id for event in events] == list(range(7))
+    assert all(event.verify_integrity() for event in events)
+    assert events[0].details["token"].startswith("sha256:")
+    assert (writer.written, writer.batches, writer.dropped) == (7, 3, 0)
+
+
+def test_unwritten_batches_are_spooled_and_replayed_once(tmp_path):
+    """Batches the database refuses go to the spool file and are written once it is reachable again."""
+    rows = [
+        {
+            "event_id": uuid4(),
+            "event_type": "system",
+            "action": f"event-{index}",
+            "severity": "low",
+            "timestamp": datetime.utcnow(),
+        }
+        for index in range(4)
+    ]
+    spool = tmp_path / "spool" / "audit.ndjson"
+
+    async def write_through_outage():
+        engine, session_factory = await audit_database()
+        unmigrated = create_async_engine("sqlite+aiosqlite://")
+        writer = AuditWriter(
+            AuditEventModel.__table__,
+            session_factory=async_sessionmaker(unmigrated, class_=AsyncSession),
+            batch_size=2,
+            spool_path=spool,
+        )
+        for row in rows:
+            writer.submit(row)
+        await writer.stop()
+        spooled = spool.read_text().count("\n")
+
+        # A writer started later replays the spool, and the repeated event is stored once
+        recovered = AuditWriter(AuditEventModel.__table__, session_factory=session_factory, batch_size=2, spool_path=spool)
+        recovered.submit(rows[0])
+        for _ in range(200):
+            if recovered.replayed == 4:
+                break
+            await asyncio.sleep(0.01)
+        await recovered.stop()
+        events = await stored_events(session_factory)
+        await engine.dispose()
+        await unmigrated.dispose()
+        return writer, recovered, spooled, events
+
+    writer, recovered, spooled, events = asyncio.run(write_through_outage())
+
+    assert spooled == 4 and writer.failed_writes == 2
+    assert sorted(event.action for event in events) == [f"event-{index}" for index in range(4)]
+    assert recovered.replayed == 4 and list(spool.parent.iterdir()) == []
+
+
+def test_rows_of_a_dead_writer_task_are_kept(tmp_path, caplog):
+    """When the task dies, the next event restarts it and the rows it held are spooled and written."""
+    rows = [{"event_id": uuid4(), "event_type": "system", "action": f"event-{index}", "severity": "low"} for index in range(3)]
+
+    async def crash_and_restart():
+        engine, session_factory = await audit_database()
+        writer = AuditWriter(
+            AuditEventModel.__table__, session_factory=session_factory, flush_interval=0.01, spool_path=tmp_path / "spool"
+        )
+        collect = writer._collect
+
+        async def crash():
+            await collect()
+            raise RuntimeError("boom")
+
+        writer._collect = crash
+        writer.submit(rows[0])
+        writer.submit(rows[1])
+        queue, task = writer._queue, writer._task
+        await asyncio.wait([task])
+        writer._collect = collect
+
+        writer.submit(rows[2])
+        for _ in range(200):
+            if writer.replayed == 2:
+                break
+            await asyncio.sleep(0.01)
+        await writer.stop()
+        events = await stored_events(session_factory)
+        await engine.dispose()
+        return writer, queue, events
+
+    writer, queue, events = asyncio.run(crash_and_restart())
+
+    assert writer._queue is queue
+    assert sorted(event.action for event in events) == ["event-0", "event-1", "event-2"]
+    assert "RuntimeError('boom')" in caplog.text
+
+
+def test_events_are_dropped_when_the_queue_is_full(tmp_path):
+    """A full queue refuses new events and counts them instead of blocking the caller."""
+
+    async def overflow():
+        writer = AuditWriter(AuditEventModel.__table__, max_queue=2, spool_path=tmp_path / "spool")
+        accepted = [writer.submit({"action": str(index)}) for index in range(5)]
+        return accepted, writer.stats()
+
+    accepted, stats = asyncio.run(overflow())
+
+    assert accepted == [True, True, False, False, False]
+    assert (stats["queue_depth"], stats["max_queue_depth"], stats["dropped"]) == (2, 2, 3)
@@ -0,0 +1,94 @@
+"""Tests for the dashboard data change feed."""
+
+import threading
+import time
+
+from dashboards.change_feed import DataVersionFeed, VersionedResults, publish_data_version, redis_version_key
+
+
+class FakeRedis:
+    """Minimal Redis stand-in recording published messages."""
+
+    def __init__(self):
+        self.values = {}
+        self.published = []
+
+    def incr(self, key):
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    def get(self, key):
+        return self.values.get(key)
+
+
+def test_wait_for_change_wakes_on_newer_version():
+    """Subscribers waiting on a version are woken when a newer one arrives."""
+    feed = DataVersionFeed("performance_data")
+    threading.Timer(0.05, feed.set_version, args=(3,)).start()
+
+    started = time.perf_counter()
+    assert feed.wait_for_change(0, timeout=5) == 3
+    assert time.perf_counter() - started < 5
+
+
+def test_stale_versions_are_ignored():
+    """Out-of-order notifications never move the version backwards."""
+    feed = DataVersionFeed("performance_data")
+    feed.set_version(5)
+    feed.set_version(4)
+    assert feed.version == 5
+    assert feed.wait_for_change(5, timeout=0.01) == 5
+
+
+def test_versioned_results_compute_once_per_version():
+    """Concurrent clients share one computation per data version."""
+    results = VersionedResults()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return len(calls)
+
+    threads = [threading.Thread(target=results.get, args=("all", 1, compute)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results.get("all", 1, compute) == 1
+    assert results.get("all", 2, compute) == 2
+    assert results.get("all", 2, compute, refresh=True) == 3
+
+
+def test_publish_data_version_increments_and_announces():
+    """Loaders publish each new version on the dataset's channel."""
+    client = FakeRedis()
+    assert publish_data_version("performance_data", client) == 1
+    assert publish_data_version("performance_data", client) == 2
+    assert client.values[redis_version_key("performance_data")] == 2
+    assert [message for _, message in client.published] == [1, 2]
+    assert publish_data_version("performance_data", None) is None
+
+
+def test_read_version_gets_the_current_version_right_away():
+    """The version can be read before the listener has started, and stays put when it cannot be read."""
+    client = FakeRedis()
+    client.values[redis_version_key("performance_data")] = 7
+    assert DataVersionFeed("performance_data", backend="redis", redis_client=client).read_version() == 7
+    assert DataVersionFeed("performance_data", backend="redis").read_version() == 0
+
+
+def test_wait_for_version_catches_up_with_a_pushed_version():
+    """A worker waits until its feed reaches the version another worker pushed, or gives up at the timeout."""
+    feed = DataVersionFeed("performance_data")
+    feed.set_version(2)
+    threading.Timer(0.05, feed.set_version, args=(4,)).start()
+
+    assert feed.wait_for_version(3, timeout=5) == 4
+    assert feed.wait_for_version(2, timeout=0) == 4
+    assert feed.wait_for_version(9, timeout=0.01) == 4
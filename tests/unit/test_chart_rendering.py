@@ -0,0 +1,51 @@
+"""Unit tests for the dashboard chart rendering strategy."""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from dashboards.chart_rendering import box_figure, downsample_indices, lttb_indices, scatter_trace
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    """Test that LTTB keeps the first and last points and picks each bucket's peak."""
+    y = [0, 1, 9, 1, 0, -9, 0]
+    selected = lttb_indices(range(len(y)), y, 4)
+
+    assert list(selected) == [0, 2, 5, 6]
+
+
+def test_downsample_preserves_extremes_within_budget():
+    """Test that downsampling respects the budget and always keeps the minimum and maximum."""
+    rng = np.random.default_rng(0)
+    y = rng.normal(0, 1, 50_000)
+    y[1234], y[40_000] = 25.0, -25.0
+
+    selected = downsample_indices(np.arange(len(y)), y, 500)
+
+    assert len(selected) <= 500
+    assert {1234, 40_000} <= set(selected)
+    assert np.all(np.diff(selected) > 0)
+
+
+def test_scatter_trace_switches_to_webgl_when_large():
+    """Test that small series stay SVG and large ones are downsampled WebGL traces."""
+    small = scatter_trace(np.arange(10), np.arange(10), 100)
+    large = scatter_trace(np.arange(20_000), np.sin(np.arange(20_000)), 1500)
+
+    assert isinstance(small, go.Scatter)
+    assert isinstance(large, go.Scattergl)
+    assert len(large.y) <= 1500
+
+
+def test_box_figure_sends_summary_for_large_groups():
+    """Test that large groups send quartiles and sampled outliers instead of every value."""
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"group": np.repeat(["a", "b"], 5000), "score": rng.normal(50, 10, 10_000)})
+
+    fig = box_figure(df, "group", "score", budget=200)
+
+    boxes = [trace for trace in fig.data if isinstance(trace, go.Box)]
+    assert len(boxes) == 2
+    assert all(box.q1 is not None and box.y is None for box in boxes)
+    assert sum(len(trace.y) for trace in fig.data if trace.y is not None) <= 200
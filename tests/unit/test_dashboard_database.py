@@ -0,0 +1,65 @@
+"""Tests for the shared dashboard database engines."""
+
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from dashboards import database
+from dashboards.database import ANALYTICS, PRIMARY, PoolMetrics, TimedQueuePool
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    """Isolate the process-wide engine registry."""
+    monkeypatch.setattr(database, "_engines", {})
+    monkeypatch.setattr(database, "_metrics", {})
+    monkeypatch.delenv("ANALYTICS_DATABASE_URL", raising=False)
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    return monkeypatch
+
+
+def test_engines_are_shared_per_role(engines):
+    """Every caller of a role gets the same engine; analytics shares the primary without a replica."""
+    assert database.get_engine(PRIMARY) is database.get_engine(PRIMARY)
+    assert database.get_engine(ANALYTICS) is database.get_engine(PRIMARY)
+
+
+def test_analytics_uses_the_read_replica(engines, tmp_path):
+    """Long queries go to the replica when one is configured."""
+    engines.setenv("ANALYTICS_DATABASE_URL", f"sqlite:///{tmp_path / 'replica.db'}")
+    assert database.get_engine(ANALYTICS) is not database.get_engine(PRIMARY)
+    assert str(database.get_engine(ANALYTICS).url).endswith("replica.db")
+
+
+def test_postgres_connections_are_named_and_prepared():
+    """Postgres connections carry their role, and psycopg prepares repeated statements server-side."""
+    assert database._connect_args("postgresql+psycopg2://db/app", ANALYTICS) == {"application_name": "dashboards-analytics"}
+    assert database._connect_args("postgresql+psycopg://db/app", PRIMARY)["prepare_threshold"] == database.PREPARE_THRESHOLD
+    assert database._connect_args("sqlite://", PRIMARY) == {}
+
+
+def test_postgres_urls_without_a_driver_use_psycopg(engines):
+    """Plain Postgres URLs get psycopg (v3); explicitly chosen drivers are kept."""
+    engines.setenv("DATABASE_URL", "postgresql://u:p@db/app")
+    engines.setenv("ANALYTICS_DATABASE_URL", "postgresql+psycopg2://u:p@replica/app")
+
+    assert database.database_url(PRIMARY) == "postgresql+psycopg://u:p@db/app"
+    assert database.database_url(ANALYTICS) == "postgresql+psycopg2://u:p@replica/app"
+
+
+def test_pool_records_checkout_waits_and_timeouts():
+    """Checkouts are timed, and exhausted pools count as timeouts."""
+    metrics = PoolMetrics(PRIMARY)
+    pool = TimedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.05, metrics=metrics)
+
+    connection = pool.connect()
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    connection.close()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 2
+    assert snapshot["timeouts"] == 1
+    assert snapshot["max_wait_ms"] >= 50
+    assert sum(snapshot["wait_histogram"].values()) == 2
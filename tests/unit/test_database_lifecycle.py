@@ -0,0 +1,19 @@
+"""Tests for creating the database engines on startup rather than on import."""
+
+import asyncio
+
+import database
+from database import base
+
+
+def test_engines_are_created_on_startup_and_dropped_on_shutdown():
+    """Importing the package creates no engine; init_database creates them once and dispose_database drops them."""
+    assert database.sync_engine is None and database.AsyncSessionLocal is None
+
+    base.init_database()
+    engines = (database.sync_engine, database.async_engine)
+    base.init_database()
+    assert all(engines) and (database.sync_engine, database.async_engine) == engines
+
+    asyncio.run(base.dispose_database())
+    assert database.sync_engine is None and database.async_engine is None and database.SessionLocal is None
@@ -0,0 +1,148 @@
+"""Unit tests for the vectorized enrollment analytics."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboards.enrollment_trends import analytics
+
+
+@pytest.fixture
+def trends():
+    """Create two years of monthly enrollment trends."""
+    months = np.arange(24)
+    enrollment = (1000 + 10 * months + 100 * np.sin(2 * np.pi * months / 12)).astype(int)
+    return pd.DataFrame(
+        {
+            "period": pd.date_range("2022-01-01", periods=24, freq="MS").strftime("%Y-%m"),
+            "enrollment_count": enrollment,
+            "unique_students": (enrollment * 0.95).astype(int),
+            "active_schools": enrollment // 60,
+            "retention_rate": 85.0,
+        }
+    )
+
+
+def test_normalize_trends_uses_period_label():
+    """Test that raw query results are normalized to the shared trends columns."""
+    raw = pd.DataFrame(
+        {
+            "period": pd.to_datetime(["2024-01-01"]),
+            "period_label": ["2024-01"],
+            "enrollment_count": [10],
+            "unique_students": [9],
+            "active_schools": [2],
+            "retention_rate": [90],
+        }
+    )
+
+    normalized = analytics.normalize_trends(raw)
+
+    assert list(normalized.columns) == analytics.TRENDS_COLUMNS
+    assert normalized.to_dict("records") == [
+        {"period": "2024-01", "enrollment_count": 10, "unique_students": 9, "active_schools": 2, "retention_rate": 90.0}
+    ]
+
+
+def test_enrollment_volatility_skips_incomplete_windows(trends):
+    """Test that volatility is reported once a full rolling window is available."""
+    volatility = analytics.enrollment_volatility(trends)
+
+    assert len(volatility) == 13
+    assert volatility[0]["period"] == "2022-12"
+    counts = trends["enrollment_count"].iloc[:12]
+    assert volatility[0]["volatility"] == pytest.approx(counts.std() / counts.mean() * 100)
+    assert isinstance(volatility[0]["enrollment_count"], int)
+
+
+def test_growth_rate_distribution_counts_every_rate(trends):
+    """Test that the growth histogram covers every period-over-period change."""
+    distribution = analytics.growth_rate_distribution(trends)
+
+    assert sum(bin["frequency"] for bin in distribution) == 23
+    assert sum(bin["percentage"] for bin in distribution) == pytest.approx(100.0)
+
+
+def test_seasonal_patterns_cover_months_and_quarters(trends):
+    """Test that seasonal patterns include each month and quarter once."""
+    patterns = analytics.seasonal_patterns(trends)
+
+    monthly = [p for p in patterns if p["period_type"] == "monthly"]
+    quarterly = [p for p in patterns if p["period_type"] == "quarterly"]
+    assert [p["period_name"] for p in monthly[:2]] == ["January", "February"]
+    assert [p["period_name"] for p in quarterly] == ["Q1", "Q2", "Q3", "Q4"]
+
+
+def test_regional_insights_use_latest_year():
+    """Test that regional insights rank regions by growth in the latest year."""
+    regional = [
+        {"division": "Dhaka", "year": 2023, "growth_rate": 9.0},
+        {"division": "Dhaka", "year": 2024, "growth_rate": 2.0},
+        {"division": "Sylhet", "year": 2024, "growth_rate": 4.0},
+    ]
+
+    insights = analytics.regional_insights(regional)
+
+    assert insights["top_region"] == "Sylhet"
+    assert insights["lowest_region"] == "Dhaka"
+    assert insights["std_dev"] == pytest.approx(1.0)
+
+
+def test_grade_transition_rates_order_grades_numerically():
+    """Test that transitions run between consecutive grade numbers."""
+    grades = pd.DataFrame(
+        {
+            "grade_level": ["Class 10", "Class 2", "Class 1", "Class 1"],
+            "year": [2024, 2024, 2024, 2023],
+            "enrollment_count": [50, 80, 100, 500],
+        }
+    )
+
+    transitions = analytics.grade_transition_rates(grades)
+
+    assert [(t["from_grade"], t["to_grade"]) for t in transitions] == [("Class 1", "Class 2"), ("Class 2", "Class 10")]
+    assert transitions[0]["transition_rate"] == pytest.approx(80.0)
+    assert transitions[1]["current_enrollment"] == 80
+
+
+def test_trends_frames_are_reloaded_when_the_data_changes(trends, monkeypatch):
+    """Loaded trends are shared until the data version moves; the mock fallback is never kept."""
+    from dashboards.enrollment_trends import data_service
+
+    # No database or Redis: the engines are stubs and the version comes from the stubbed feed
+    monkeypatch.setattr(data_service, "get_engine", lambda role: object())
+    monkeypatch.setattr(data_service.EnrollmentDataService, "_get_redis_client", lambda self: None)
+    service = data_service.EnrollmentDataService()
+    versions = iter([1, 1, 2, 2, 2])
+    loads = []
+    monkeypatch.setattr(service, "current_data_version", lambda: next(versions))
+    monkeypatch.setattr(service, "_load_enrollment_trends", lambda key, filters: loads.append(key) or trends)
+
+    first = service.get_enrollment_trends_frame({"divisions": ["Dhaka"]})
+    assert service.get_enrollment_trends_frame({"divisions": ["Dhaka"]}) is first
+    service.get_enrollment_trends_frame({"divisions": ["Dhaka"]})
+    assert len(loads) == 2
+
+    monkeypatch.setattr(service, "_load_enrollment_trends", lambda key, filters: None)
+    service.get_enrollment_trends_frame({})
+    service.get_enrollment_trends_frame({})
+    assert len(service._trends_frames) == 2
+
+
+def test_data_version_is_read_once_then_taken_from_the_feed(monkeypatch):
+    """The version is read from the database until the change feed has one, then without a round trip."""
+    from dashboards.change_feed import DataVersionFeed
+    from dashboards.enrollment_trends import data_service
+
+    monkeypatch.setattr(data_service, "get_engine", lambda role: object())
+    monkeypatch.setattr(data_service.EnrollmentDataService, "_get_redis_client", lambda self: None)
+    monkeypatch.setattr(DataVersionFeed, "start", lambda self: self)
+    monkeypatch.setattr(data_service.EnrollmentDataService, "_data_version_feed", None)
+    reads = []
+    monkeypatch.setattr(data_service.EnrollmentDataService, "get_data_version", lambda self: reads.append(1) or 3)
+
+    service = data_service.EnrollmentDataService()
+    assert [service.current_data_version() for _ in range(3)] == [3, 3, 3]
+    data_service.EnrollmentDataService._data_version_feed.set_version(4)
+    assert data_service.EnrollmentDataService().current_data_version() == 4
+    assert len(reads) == 1
@@ -0,0 +1,76 @@
+"""Unit tests for the Enrollment Trends forecast engine."""
+
+import numpy as np
+import pytest
+
+from dashboards.enrollment_trends.forecast_engine import ForecastEngine
+
+
+@pytest.fixture
+def series():
+    """Create four years of monthly enrollment with trend and seasonality."""
+    months = np.arange(48)
+    return 1000 + 5 * months + 50 * np.sin(2 * np.pi * months / 12)
+
+
+def test_model_is_reused_across_horizons_and_confidence_levels(series):
+    """Test that changing the horizon or confidence level does not refit."""
+    engine = ForecastEngine(max_workers=1)
+    fitted = engine.get_model(series, "Linear Trend")
+
+    short = engine.forecast(series, "Linear Trend", 6, 80)
+    long = engine.forecast(series, "Linear Trend", 24, 95)
+
+    assert engine.get_model(series.copy(), "Linear Trend") is fitted
+    assert len(short["forecast"]) == 6
+    assert len(long["forecast"]) == 24
+    np.testing.assert_allclose(short["forecast"], long["forecast"][:6])
+    assert (long["upper_bound"] - long["lower_bound"])[0] > (short["upper_bound"] - short["lower_bound"])[0]
+
+
+def test_cache_evicts_least_recently_used_model(series):
+    """Test that the fitted-model cache is bounded."""
+    engine = ForecastEngine(max_models=1, max_workers=1)
+    first = engine.get_model(series, "Linear Trend")
+    engine.get_model(series + 1, "Linear Trend")
+
+    assert engine.get_model(series, "Linear Trend") is not first
+
+
+def test_fit_many_fits_duplicate_jobs_once(series):
+    """Test that identical jobs in a batch share one fitted model."""
+    engine = ForecastEngine(max_workers=1)
+    fitted = engine.fit_many([(series, "Linear Trend"), (series, "Linear Trend")])
+
+    assert fitted[0] is fitted[1]
+
+
+def test_fit_many_fits_inline_unless_parallel(series):
+    """Test that request-path batches do not start the process pool."""
+    engine = ForecastEngine(max_workers=4)
+    fitted = engine.fit_many([(series, "Linear Trend"), (series + 1, "Linear Trend")])
+
+    assert len(fitted) == 2
+    assert engine._pool is None
+
+
+def test_backtest_scores_each_method(series):
+    """Test that backtesting returns one score per method."""
+    engine = ForecastEngine(max_workers=1)
+    scores = engine.backtest(series, ["Linear Trend", "Seasonal Decomposition"])
+
+    assert [score["method"] for score in scores] == ["Linear Trend", "Seasonal Decomposition"]
+    assert all(score["mape"] >= 0 for score in scores)
+
+
+def test_select_method_prefers_fastest_adequate_method():
+    """Test that selection trades accuracy for speed only within the MAPE budget."""
+    scores = [
+        {"method": "ARIMA", "mape": 2.0, "fit_seconds": 1.5},
+        {"method": "Linear Trend", "mape": 8.0, "fit_seconds": 0.01},
+        {"method": "Seasonal Decomposition", "mape": 15.0, "fit_seconds": 0.001},
+    ]
+
+    assert ForecastEngine.select_method(scores) == "Linear Trend"
+    assert ForecastEngine.select_method(scores, max_mape=5.0) == "ARIMA"
+    assert ForecastEngine.select_method([]) is None
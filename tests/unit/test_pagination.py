@@ -0,0 +1,121 @@
+"""Tests for keyset pagination."""
+
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import Column, Date, Integer, String, create_engine, select
+from sqlalchemy.orm import Session, declarative_base
+
+from infrastructure.persistence.pagination import InvalidCursorError, Page, encode_cursor, paginate
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(20), nullable=False)
+    joined = Column(Date, nullable=False)
+
+
+class AsyncAdapter:
+    """Runs the awaited session calls of the paginator on a synchronous session."""
+
+    def __init__(self, session):
+        self.session = session
+        self.bind = session.bind
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        return self.session.execute(stmt, params)
+
+    async def scalar(self, stmt, params=None):
+        self.statements.append(stmt)
+        return self.session.scalar(stmt, params)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        # Duplicate names and dates so the id has to break ties
+        session.add_all(Item(id=i, name=f"name-{i % 4}", joined=date(2024, 1, 1 + i % 3)) for i in range(1, 24))
+        session.commit()
+        yield AsyncAdapter(session)
+
+
+def fetch_all(session, **kwargs):
+    pages, cursor = [], None
+    while True:
+        page = asyncio.run(paginate(session, select(Item), limit=5, cursor=cursor, **kwargs))
+        pages.append([item.id for item in page])
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("column,descending", [("id", False), ("name", False), ("joined", True)])
+def test_pages_cover_every_row_once_in_order(session, column, descending):
+    """Following the cursors visits each row exactly once, in (sort key, id) order."""
+    sort_column = getattr(Item, column)
+    pages = fetch_all(session, sort=column, sort_column=sort_column, id_column=Item.id, descending=descending)
+
+    expected = sorted(range(1, 24), key=lambda i: (getattr(session.session.get(Item, i), column), i), reverse=descending)
+    assert [item_id for page in pages for item_id in page] == expected
+    assert all(len(page) == 5 for page in pages[:-1])
+
+
+def test_total_is_only_counted_on_request(session):
+    """Pages skip the count unless asked; estimates fall back to an exact count off PostgreSQL."""
+    page = asyncio.run(paginate(session, select(Item), sort="id", sort_column=Item.id, id_column=Item.id, limit=5))
+    assert isinstance(page, Page) and page.total is None
+    assert len(session.statements) == 1
+
+    page = asyncio.run(
+        paginate(
+            session,
+            select(Item).where(Item.id > 3),
+            sort="id",
+            sort_column=Item.id,
+            id_column=Item.id,
+            limit=5,
+            estimate_total=True,
+        )
+    )
+    assert page.total == 20 and not page.total_is_estimate
+
+
+def test_cursors_are_bound_to_their_ordering(session):
+    """Tampered tokens and tokens from another ordering are rejected."""
+    with pytest.raises(InvalidCursorError):
+        asyncio.run(
+            paginate(session, select(Item), sort="id", sort_column=Item.id, id_column=Item.id, limit=5, cursor="garbage")
+        )
+    with pytest.raises(InvalidCursorError):
+        asyncio.run(
+            paginate(
+                session,
+                select(Item),
+                sort="id",
+                sort_column=Item.id,
+                id_column=Item.id,
+                limit=5,
+                cursor=encode_cursor("name", ["name-1", 3]),
+            )
+        )
+
+
+def test_column_selects_page_as_tuples_of_the_selected_columns(session):
+    """Pages of selected columns hold just those values, and their cursors continue after the last row."""
+    stmt = select(Item.id, Item.name)
+    page = asyncio.run(paginate(session, stmt, sort="name", sort_column=Item.name, id_column=Item.id, limit=3))
+    assert list(page) == [(4, "name-0"), (8, "name-0"), (12, "name-0")]
+
+    page = asyncio.run(
+        paginate(session, stmt, sort="name", sort_column=Item.name, id_column=Item.id, limit=3, cursor=page.next_cursor)
+    )
+    assert [row[0] for row in page] == [16, 20, 1]
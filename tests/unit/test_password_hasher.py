@@ -0,0 +1,85 @@
+"""Tests for the bounded password hashing pool."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from auth.password_hasher import PasswordHasher
+
+
+def make_context(rounds):
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds, bcrypt__min_rounds=rounds)
+
+
+def test_hashing_runs_off_the_event_loop():
+    """The event loop keeps running while passwords are hashed."""
+    hasher = PasswordHasher(make_context(10), workers=2, max_pending=8)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        hashed = await asyncio.gather(*(hasher.hash(f"password{i}") for i in range(4)))
+        task.cancel()
+        return ticks, hashed
+
+    ticks, hashed = asyncio.run(scenario())
+    assert ticks > 5
+    assert asyncio.run(hasher.verify("password0", hashed[0]))
+    assert hasher.metrics.snapshot()["completed"] == 5
+
+
+def test_saturated_pool_refuses_with_retry_after():
+    """Operations beyond max_pending are refused instead of queueing without bound."""
+    hasher = PasswordHasher(make_context(4), workers=1, max_pending=1)
+    hasher.executor.submit(time.sleep, 0.2)
+
+    async def scenario():
+        first = asyncio.ensure_future(hasher.hash("password"))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as refused:
+            await hasher.hash("password")
+        await first
+        return refused.value
+
+    refused = asyncio.run(scenario())
+    assert refused.status_code == 503
+    assert refused.headers["Retry-After"]
+    assert hasher.metrics.snapshot()["rejected"] == 1
+
+
+def test_hashes_below_the_configured_cost_are_rehashed_on_verify():
+    """Verification returns a new hash when the stored one uses fewer rounds than configured."""
+    old_hash = make_context(4).hash("password")
+    hasher = PasswordHasher(make_context(5), workers=1, max_pending=4)
+
+    verified, new_hash = asyncio.run(hasher.verify_and_update("password", old_hash))
+    assert verified and new_hash.startswith("$2b$05$")
+    assert asyncio.run(hasher.verify_and_update("password", new_hash)) == (True, None)
+    assert asyncio.run(hasher.verify_and_update("wrong", old_hash)) == (False, None)
+
+
+def test_cancelled_queued_operations_release_their_slot():
+    """A request cancelled while its hash waits in the queue gives its slot back."""
+    hasher = PasswordHasher(make_context(4), workers=1, max_pending=1)
+    hasher.executor.submit(time.sleep, 0.2)
+
+    async def scenario():
+        queued = asyncio.ensure_future(hasher.hash("password"))
+        await asyncio.sleep(0)
+        queued.cancel()
+        await asyncio.sleep(0)
+        return await hasher.hash("password")
+
+    assert asyncio.run(scenario()).startswith("$2b$04$")
+    snapshot = hasher.metrics.snapshot()
+    assert (snapshot["pending"], snapshot["cancelled"], snapshot["completed"]) == (0, 1, 1)
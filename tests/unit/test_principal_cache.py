@@ -0,0 +1,96 @@
+"""Tests for the authenticated principal cache."""
+
+import asyncio
+import threading
+from datetime import datetime
+
+from auth.models import UserInDB
+from auth.principal_cache import PrincipalCache
+
+
+def make_principal(user_id=1):
+    return UserInDB(
+        id=user_id,
+        username=f"user{user_id}",
+        email=f"user{user_id}@example.com",
+        hashed_password="$2b$12$secret",
+        reset_password_token="reset-token",
+        created_at=datetime(2025, 1, 1),
+        updated_at=datetime(2025, 1, 1),
+    )
+
+
+def test_principals_are_cached_per_security_version_without_secrets():
+    """A cached principal is only served for the security version it was loaded with, minus its secrets."""
+    cache = PrincipalCache(redis_url=None)
+    asyncio.run(cache.set(1, 3, make_principal()))
+
+    cached = asyncio.run(cache.get(1, 3))
+    assert cached.username == "user1"
+    assert cached.hashed_password == "" and cached.reset_password_token is None
+    assert asyncio.run(cache.get(1, 2)) is None
+
+
+def test_entries_expire_and_are_evicted_least_recently_used_first():
+    """Entries live for the local TTL and the cache keeps at most max_entries."""
+    cache = PrincipalCache(max_entries=2, local_ttl=60, redis_url=None)
+    for user_id in (1, 2):
+        asyncio.run(cache.set(user_id, 0, make_principal(user_id)))
+    asyncio.run(cache.get(1, 0))
+    asyncio.run(cache.set(3, 0, make_principal(3)))
+
+    assert asyncio.run(cache.get(2, 0)) is None
+    assert asyncio.run(cache.get(1, 0)) is not None
+
+    expired = PrincipalCache(local_ttl=-1, redis_url=None)
+    asyncio.run(expired.set(1, 0, make_principal()))
+    assert asyncio.run(expired.get(1, 0)) is None
+
+
+def test_invalidation_evicts_every_version_of_the_user():
+    """Invalidating a user drops their cached principals and leaves other users alone."""
+    cache = PrincipalCache(redis_url=None)
+    asyncio.run(cache.set(1, 0, make_principal(1)))
+    asyncio.run(cache.set(2, 0, make_principal(2)))
+
+    cache.invalidate(1, 1)
+
+    assert asyncio.run(cache.get(1, 0)) is None
+    assert asyncio.run(cache.get(2, 0)) is not None
+
+
+def test_invalidation_during_a_request_writes_redis_off_the_event_loop():
+    """Commits made on the event loop record the new minimum version from a worker thread."""
+    cache = PrincipalCache(redis_url="redis://cache")
+    writes = []
+
+    class Pipeline:
+        def set(self, key, value, ex):
+            writes.append((key, value, threading.get_ident()))
+
+        def delete(self, key):
+            pass
+
+        def execute(self):
+            pass
+
+    class Client:
+        def pipeline(self):
+            return Pipeline()
+
+    cache._clients[False] = Client()
+
+    async def commit():
+        cache.invalidate(1, 4)
+        loop_thread = threading.get_ident()
+        for _ in range(100):
+            if writes:
+                break
+            await asyncio.sleep(0.01)
+        return loop_thread
+
+    loop_thread = asyncio.run(commit())
+
+    ((key, value, thread),) = writes
+    assert (key, value) == ("auth:principal:1:min_version", 4)
+    assert thread != loop_thread
@@ -0,0 +1,84 @@
+"""Tests for the GCRA rate limiter and the rate limit middleware."""
+
+import asyncio
+
+import pytest
+
+from middleware.rate_limiter import RateLimit, RateLimiter, parse_limit
+from middleware.security_headers import RateLimitMiddleware
+
+
+def hits(limiter, key, limit, count):
+    async def run():
+        return [await limiter.hit(key, limit) for _ in range(count)]
+
+    return asyncio.run(run())
+
+
+class _CountingReserve:
+    def __init__(self, reserve):
+        self.reserve = reserve
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.reserve(*args)
+
+
+def test_limits_are_parsed_from_the_settings_format():
+    """Limits read as ``N/unit``; anything else is rejected."""
+    assert parse_limit("100/minute") == RateLimit(100, 60)
+    assert parse_limit("5 per hours") == RateLimit(5, 3600)
+    with pytest.raises(ValueError):
+        parse_limit("0/minute")
+
+
+def test_bursts_up_to_the_limit_are_admitted_then_rejected_with_headers():
+    """A key gets its full limit as a burst, then 429 headers say when to retry."""
+    limiter = RateLimiter(redis_url=None, max_lease=1)
+    decisions = hits(limiter, "default:ip:1", RateLimit(3, 60), 4)
+
+    assert [decision.allowed for decision in decisions] == [True, True, True, False]
+    assert [decision.remaining for decision in decisions[:3]] == [2, 1, 0]
+    headers = decisions[3].headers()
+    assert headers["RateLimit-Limit"] == "3" and headers["RateLimit-Policy"] == "3;w=60"
+    assert 19 <= int(headers["Retry-After"]) <= 20
+    assert hits(limiter, "default:ip:2", RateLimit(3, 60), 1)[0].allowed
+
+
+def test_hot_keys_lease_tokens_without_exceeding_the_limit():
+    """Keys seen often reserve several tokens per round trip, but never more than the limit allows."""
+    limiter = RateLimiter(redis_url=None, max_lease=4, lease_ttl=60)
+    limiter._reserve_fallback = counting = _CountingReserve(limiter._reserve_fallback)
+
+    decisions = hits(limiter, "default:user:1", RateLimit(10, 60), 12)
+
+    assert sum(decision.allowed for decision in decisions) == 10
+    assert counting.calls < 10
+
+
+def test_middleware_applies_route_limits_and_adds_headers():
+    """Route rules take precedence over the default limit and every response carries RateLimit headers."""
+    sent = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = RateLimitMiddleware(
+        app,
+        limit="50/minute",
+        routes={"POST /api/v1/auth/token": "1/minute"},
+        limiter=RateLimiter(redis_url=None, max_lease=1),
+    )
+    scope = {"type": "http", "method": "POST", "path": "/api/v1/auth/token", "headers": [], "client": ("10.0.0.1", 1)}
+    for _ in range(2):
+        asyncio.run(middleware(scope, None, send))
+
+    starts = [message for message in sent if message["type"] == "http.response.start"]
+    assert [start["status"] for start in starts] == [200, 429]
+    assert (b"ratelimit-policy", b"1;w=60") in starts[0]["headers"]
+    assert middleware._rule({**scope, "path": "/api/v1/students/"}, False)[1] == RateLimit(50, 60)
@@ -0,0 +1,138 @@
+"""Tests for background enrollment report jobs."""
+
+import threading
+import time
+from pathlib import Path
+
+from dashboards.enrollment_trends.data_service import REPORT_SECTIONS, EnrollmentDataService
+from dashboards.enrollment_trends.report_jobs import ReportJobManager, report_job_id
+
+
+# Canned report sections, shaped like those of the data service
+SECTIONS = {
+    "metrics": {"total_enrollments": 210},
+    "trends": [{"period": "2024-01", "enrollment_count": 100}, {"period": "2024-02", "enrollment_count": 110}],
+    "regional": {"trends": [{"division": "Dhaka", "enrollment_count": 210}], "insights": {}},
+    "demographics": {"gender_trends": [{"gender": "Female", "enrollment_count": 105}]},
+    "volatility": [{"period": "2024-02", "volatility": 4.5, "mom_change": 10.0}],
+    "forecast": {
+        "method": "Auto",
+        "confidence_level": 95,
+        "forecast_data": [{"period": "2024-03", "forecast_value": 120, "lower_bound": 100, "upper_bound": 140}],
+    },
+}
+
+
+class FakeDataService:
+    """Data service returning canned sections and recording how they were computed."""
+
+    redis_client = None
+
+    def __init__(self):
+        self.data_version = 1
+        self.calls = []
+        self.threads = set()
+        self.unavailable = set()
+
+    def get_data_version(self):
+        return self.data_version
+
+    def get_report_section(self, section, filters=None):
+        self.calls.append(section)
+        self.threads.add(threading.get_ident())
+        time.sleep(0.05)
+        if section in self.unavailable:
+            return []
+        return SECTIONS[section]
+
+    def render_report_text(self, sections):
+        return EnrollmentDataService.render_report_text(self, sections)
+
+
+class FakeRedis:
+    """Minimal Redis stand-in storing job records."""
+
+    def __init__(self):
+        self.values = {}
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    def get(self, key):
+        return self.values.get(key)
+
+
+def wait_for(manager, job_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get_job(job_id)
+        if job.finished:
+            return job
+        time.sleep(0.02)
+    raise AssertionError("Report job did not finish")
+
+
+def test_report_job_id_depends_on_filters_and_data_version():
+    """Jobs are keyed by the filter values and the data version."""
+    assert report_job_id({"division": "Dhaka"}, 1) == report_job_id({"division": "Dhaka"}, 1)
+    assert report_job_id({"division": "Dhaka"}, 1) != report_job_id({"division": "Dhaka"}, 2)
+    assert report_job_id({"division": "Dhaka"}, 1) != report_job_id({"division": "Khulna"}, 1)
+
+
+def test_sections_are_computed_concurrently_into_artifacts(tmp_path):
+    """Every section is computed in parallel and the report artifacts are written."""
+    service = FakeDataService()
+    manager = ReportJobManager(service, artifact_dir=tmp_path)
+
+    job = wait_for(manager, manager.submit({"division": "Dhaka"}))
+
+    assert job.status == "done"
+    assert sorted(service.calls) == sorted(REPORT_SECTIONS)
+    assert len(service.threads) > 1
+    assert "Total Enrollments: 210" in Path(job.artifacts["txt"]).read_text()
+    assert "<table" in Path(job.artifacts["html"]).read_text()
+
+
+def test_repeat_requests_reuse_the_report_until_the_data_changes(tmp_path):
+    """The same report is served again until the data version moves."""
+    service = FakeDataService()
+    manager = ReportJobManager(service, artifact_dir=tmp_path)
+
+    first = manager.submit({"division": "Dhaka"})
+    assert manager.submit({"division": "Dhaka"}) == first
+    wait_for(manager, first)
+    assert manager.submit({"division": "Dhaka"}) == first
+    assert len(service.calls) == len(REPORT_SECTIONS)
+
+    service.data_version = 2
+    second = manager.submit({"division": "Dhaka"})
+    assert second != first
+    wait_for(manager, second)
+    assert len(service.calls) == 2 * len(REPORT_SECTIONS)
+
+
+def test_finished_jobs_are_served_from_redis_instead_of_memory(tmp_path):
+    """Only running jobs stay in memory once Redis holds the finished records."""
+    service = FakeDataService()
+    service.redis_client = FakeRedis()
+    manager = ReportJobManager(service, artifact_dir=tmp_path)
+
+    job_id = manager.submit({"division": "Dhaka"})
+    assert wait_for(manager, job_id).status == "done"
+    assert manager._jobs == {}
+    assert manager.submit({"division": "Dhaka"}) == job_id
+    assert len(service.calls) == len(REPORT_SECTIONS)
+
+
+def test_reports_missing_sections_are_not_kept_as_done(tmp_path):
+    """A section the service could not compute fails the job, so the next request computes it again."""
+    service = FakeDataService()
+    service.unavailable = {"volatility"}
+    manager = ReportJobManager(service, artifact_dir=tmp_path)
+
+    job = wait_for(manager, manager.submit({"division": "Dhaka"}))
+    assert job.status == "failed" and "volatility" in job.error
+
+    service.unavailable = set()
+    assert wait_for(manager, manager.submit({"division": "Dhaka"})).status == "done"
+    assert len(service.calls) == 2 * len(REPORT_SECTIONS)
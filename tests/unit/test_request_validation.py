@@ -0,0 +1,127 @@
+"""Tests for the request validation middleware's input inspection."""
+
+import asyncio
+import json
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from middleware.request_validation import ParsedBodyRoute, RequestValidationMiddleware
+
+
+class Item(BaseModel):
+    name: str
+    tags: list
+
+
+def make_client(**options):
+    router = APIRouter(route_class=ParsedBodyRoute)
+
+    @router.post("/items")
+    async def create_item(item: Item):
+        return {"name": item.name}
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(RequestValidationMiddleware, **options)
+    return TestClient(app)
+
+
+def test_every_signature_is_caught_by_the_combined_pattern():
+    """Each attack signature is still detected, whatever its case, and ordinary text passes."""
+    middleware = RequestValidationMiddleware(None)
+    for payload in (
+        "<SCRIPT>x</script>",
+        "1 OR 1=1",
+        "document.cookie",
+        "UNION SELECT",
+        "JavaScript:alert",
+        "<img onError = x>",
+    ):
+        assert middleware._is_malicious(payload), payload
+    assert not middleware._is_malicious("Rahim Uddin, Class 8, Dhaka")
+    assert not middleware._is_malicious("")
+
+
+def test_nested_bodies_are_scanned_within_the_limits():
+    """Keys and values are scanned at any depth up to the limits, and not beyond them."""
+    middleware = RequestValidationMiddleware(None, max_scanned_chars=100, max_scanned_depth=3)
+
+    assert middleware._check_dict_for_malicious_input({"a": [{"<script>x</script>": 1}]})
+    assert not middleware._check_dict_for_malicious_input({"a": {"b": {"c": {"d": "drop table"}}}})
+    assert not middleware._check_dict_for_malicious_input(["x" * 100, "drop table"])
+    assert middleware._check_dict_for_malicious_input(["x" * 10, "drop table"])
+
+
+def test_json_bodies_are_parsed_once_and_malicious_ones_rejected(monkeypatch):
+    """The route gets the body the middleware parsed, and bodies with attack signatures get 400."""
+    client = make_client()
+    calls = []
+    loads = json.loads
+    monkeypatch.setattr(json, "loads", lambda *args, **kwargs: calls.append(1) or loads(*args, **kwargs))
+
+    response = client.post("/items", json={"name": "notebook", "tags": ["a"]})
+    assert len(calls) == 1
+    assert response.status_code == 200 and response.json() == {"name": "notebook"}
+
+    assert client.post("/items", json={"name": "<script>x</script>", "tags": []}).status_code == 400
+
+
+def multipart_body(content_type, content, boundary=b"upload"):
+    return (
+        b"--" + boundary + b"\r\n"
+        b'Content-Disposition: form-data; name="file"; filename="upload"\r\n'
+        b"Content-Type: " + content_type + b"\r\n\r\n" + content + b"\r\n--" + boundary + b"--\r\n"
+    )
+
+
+def send_chunked(app, body, chunk_size=512):
+    """Send a body in chunks without a content-length and get the response status and the bytes the app read."""
+    chunks = [body[index : index + chunk_size] for index in range(0, len(body), chunk_size)]
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+    messages[-1]["more_body"] = False
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/upload",
+        "query_string": b"",
+        "headers": [(b"content-type", b"multipart/form-data; boundary=upload")],
+    }
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    received = []
+
+    async def read_upload(scope, receive, send):
+        while True:
+            message = await receive()
+            received.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    asyncio.run(RequestValidationMiddleware(read_upload, **app)(scope, receive, send))
+    return sent[0]["status"], b"".join(received)
+
+
+def test_uploads_stream_through_once_their_leading_bytes_check_out():
+    """A valid file reaches the application chunk by chunk, unchanged."""
+    body = multipart_body(b"image/png", b"\x89PNG\r\n\x1a\n" + b"\x00" * 5000)
+
+    assert send_chunked({}, body) == (200, body)
+
+
+def test_uploads_are_refused_on_their_first_bytes_or_once_too_large():
+    """Wrong signatures and undeclared types get 400 before the rest is read; chunked bodies are capped."""
+    status, received = send_chunked({}, multipart_body(b"application/pdf", b"MZ" + b"\x00" * 5000))
+    assert status == 400 and len(received) < 5000
+
+    assert send_chunked({}, multipart_body(b"application/x-msdownload", b"MZ"))[0] == 400
+    assert send_chunked({"max_file_size": 2048}, multipart_body(b"text/csv", b"id,name\n" * 1000))[0] == 413
@@ -0,0 +1,61 @@
+"""Unit tests for the Demographic Insights search index."""
+
+import pandas as pd
+import pytest
+
+from dashboards.demographic_insights.search_index import StudentSearchIndex
+
+
+@pytest.fixture
+def search_index():
+    """Create a search index over a small demographics frame."""
+    df = pd.DataFrame(
+        {
+            "student_name": ["Rahim Uddin", "Karima Begum", "Abdul Karim", None],
+            "student_code": ["S001", "S002", "S003", "S004"],
+            "school_name": ["Dhaka High School", "Sylhet Girls School", "Dhaka High School", "Khulna Zilla School"],
+            "division": ["Dhaka", "Sylhet", "Dhaka", "Khulna"],
+            "school_type": ["Government", "Private", "Government", "Madrasa"],
+            "performance_category": ["Excellent", "Good", "Needs Improvement", "Good"],
+        },
+        index=[10, 11, 12, 13],
+    )
+    return StudentSearchIndex(df)
+
+
+def test_search_matches_substring_case_insensitively(search_index):
+    """Test that trigram search finds substrings regardless of case."""
+    row_ids, total = search_index.search("KARIM")
+    assert list(row_ids) == [11, 12]
+    assert total == 2
+
+
+def test_search_short_query_matches_word_prefixes(search_index):
+    """Test that queries shorter than a trigram match word prefixes."""
+    row_ids, _ = search_index.search("kh")
+    assert list(row_ids) == [13]
+
+
+def test_search_does_not_match_across_columns(search_index):
+    """Test that a match cannot span two indexed columns."""
+    row_ids, total = search_index.search("uddin s001")
+    assert list(row_ids) == []
+    assert total == 0
+
+
+def test_search_pages_results(search_index):
+    """Test that search returns the requested page and the total match count."""
+    row_ids, total = search_index.search("school", limit=2, offset=1)
+    assert list(row_ids) == [11, 12]
+    assert total == 4
+
+
+def test_search_within_restricts_to_given_rows(search_index):
+    """Test that search_within only returns rows from the given subset."""
+    assert list(search_index.search_within("dhaka", pd.Index([11, 12, 13]))) == [12]
+
+
+def test_search_matches_category_columns(search_index):
+    """Test that the school type and performance category shown in the table are searchable."""
+    assert list(search_index.search("madrasa")[0]) == [13]
+    assert list(search_index.search("needs improvement")[0]) == [12]
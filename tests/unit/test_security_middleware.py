@@ -0,0 +1,61 @@
+"""Tests for the security middleware stack."""
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from middleware.request_validation import RequestValidationMiddleware
+from middleware.security_headers import SecurityHeadersMiddleware, setup_security_middleware
+
+
+def test_security_headers_are_added_without_buffering_streams():
+    """Headers are set on the response start and each streamed chunk is sent on as it is produced."""
+    sent = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"x-frame-options", b"SAMEORIGIN")]})
+        for chunk in (b"a", b"b"):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(SecurityHeadersMiddleware(app)({"type": "http"}, None, send))
+
+    headers = dict(sent[0]["headers"])
+    assert headers[b"x-frame-options"] == b"DENY" and headers[b"x-content-type-options"] == b"nosniff"
+    assert len(sent[0]["headers"]) == len(headers)
+    assert [message.get("body") for message in sent[1:]] == [b"a", b"b", b""]
+
+
+def test_each_security_middleware_is_registered_once():
+    """The stack holds one of each middleware, with security headers outside validation."""
+    app = FastAPI()
+    setup_security_middleware(app)
+    classes = [middleware.cls for middleware in app.user_middleware]
+
+    assert classes.count(SecurityHeadersMiddleware) == 1
+    assert classes.count(RequestValidationMiddleware) == 1
+    assert classes.index(SecurityHeadersMiddleware) < classes.index(RequestValidationMiddleware)
+
+
+def test_streaming_responses_pass_through_the_validation_middleware():
+    """Rejections carry the security headers and streamed responses reach the client intact."""
+    app = FastAPI()
+
+    @app.get("/export")
+    async def export():
+        return StreamingResponse(iter([b"id,name\n", b"1,Rahim\n"]), media_type="text/csv")
+
+    app.add_middleware(RequestValidationMiddleware)
+    app.add_middleware(SecurityHeadersMiddleware)
+    client = TestClient(app)
+
+    response = client.get("/export")
+    assert response.text == "id,name\n1,Rahim\n" and response.headers["x-frame-options"] == "DENY"
+
+    rejected = client.get("/export", params={"q": "1 or 1=1"})
+    assert rejected.status_code == 400 and rejected.headers["x-content-type-options"] == "nosniff"
@@ -0,0 +1,53 @@
+"""Tests for the shared dashboard cache serialization."""
+
+import datetime
+
+import pandas as pd
+import pytest
+
+from dashboards.shared_cache import cache_key, deserialize, is_empty, loader_prefix, serialize
+
+
+def load_options(where_clause, params):
+    """Stand-in loader used for cache keys."""
+
+
+def test_non_frame_values_round_trip():
+    """Options dicts with tuples and datetimes keep their types."""
+    options = {
+        "division": ["Dhaka", "Khulna"],
+        "enrollment_date_range": (datetime.datetime(2024, 1, 1), datetime.datetime(2024, 6, 1)),
+    }
+    assert deserialize(serialize(options)) == options
+
+
+def test_unpicklable_formats_are_refused():
+    """Values that JSON cannot hold are not cached, and unknown payloads are not decoded."""
+    with pytest.raises(TypeError):
+        serialize({"loader": object()})
+    with pytest.raises(ValueError):
+        deserialize(b"P\x80\x04N.")
+
+
+def test_empty_results_are_not_cacheable():
+    """The empty fallbacks loaders return on errors are recognized; real results are not."""
+    assert is_empty(pd.DataFrame()) and is_empty({}) and is_empty(None)
+    assert not is_empty(pd.DataFrame({"a": [1]})) and not is_empty({"division": []})
+
+
+def test_frames_round_trip_through_arrow():
+    """DataFrames and dicts of DataFrames are stored as Arrow IPC."""
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"gender": ["Female", "Male"], "student_count": [10, 12], "avg_grade": [71.5, 68.0]})
+
+    pd.testing.assert_frame_equal(deserialize(serialize(df)), df)
+    restored = deserialize(serialize({"gender": df, "totals": df.head(1)}))
+    pd.testing.assert_frame_equal(restored["totals"], df.head(1))
+
+
+def test_cache_keys_depend_on_loader_and_arguments():
+    """Keys are stable per call and scoped to their loader."""
+    key = cache_key(load_options, " WHERE division = :division", {"division": "Dhaka"})
+    assert key == cache_key(load_options, " WHERE division = :division", {"division": "Dhaka"})
+    assert key != cache_key(load_options, " WHERE division = :division", {"division": "Khulna"})
+    assert key.startswith(loader_prefix(load_options))
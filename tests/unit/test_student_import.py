@@ -0,0 +1,76 @@
+"""Tests for bulk student imports."""
+
+import asyncio
+import io
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from data_processing.student_import import StudentImporter
+from models.student_model import StudentDB
+
+CSV = b"""student_id,first_name,last_name,dob,sex,email,phone,district
+s-1, abdul ,rahim,2010-01-02,M,rahim@example.com,01711000000,dhaka
+s-2,Karim,Uddin,2011-03-04,F,not-an-email,,
+s-1,Abdul,Rahim,2010-01-02,M,,,
+s-3,Nadia,Islam,not-a-date,F,,,
+s-4,,,2010-01-01,M,,,
+"""
+
+
+async def run_imports(*imports):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(StudentDB.__table__.create)
+    results = []
+    async with AsyncSession(engine) as db:
+        for body, file_format in imports:
+            results.append(await StudentImporter(db, batch_size=2).run(io.BytesIO(body), file_format))
+        await db.commit()
+        students = (await db.execute(select(StudentDB).order_by(StudentDB.student_id))).scalars().all()
+    await engine.dispose()
+    return results, students
+
+
+def test_each_row_is_cleaned_validated_and_given_an_outcome():
+    """Rows go through the transformer, invalid ones are reported with reasons and repeats are skipped."""
+    (result,), students = asyncio.run(run_imports((CSV, "csv")))
+
+    assert (result.total, result.created, result.skipped, result.failed) == (5, 1, 1, 3)
+    outcomes = {outcome.row: (outcome.student_id, outcome.status.value, outcome.errors) for outcome in result.rows}
+    assert outcomes[1] == ("S-1", "created", [])
+    assert outcomes[2] == ("S-2", "failed", ["email: Not a valid email address"])
+    assert outcomes[3][:2] == ("S-1", "skipped")
+    assert outcomes[4][1] == "failed" and outcomes[4][2][0].startswith("date_of_birth")
+    assert outcomes[5] == ("S-4", "failed", ["full_name: Field required"])
+
+    (student,) = students
+    assert (student.first_name, student.last_name) == ("Abdul", "Rahim")
+    assert (student.phone, student.district) == ("+8801711000000", "Dhaka")
+
+
+def test_failed_rows_do_not_make_later_rows_repeats():
+    """A student ID whose row failed can still be imported by a later row of the file."""
+    csv = b"student_id,name,dob,sex\nS-9,Rina Das,not-a-date,F\nS-8,Nadia Islam,2011-01-01,F\nS-9,Rina Das,2012-05-06,F\n"
+    (result,), students = asyncio.run(run_imports((csv, "csv")))
+
+    assert [(outcome.row, outcome.status.value) for outcome in result.rows] == [(1, "failed"), (2, "created"), (3, "created")]
+    assert [student.student_id for student in students] == ["S-8", "S-9"]
+
+
+def test_reimports_update_only_the_columns_they_carry():
+    """Existing students are updated in place, keep fields the file lacks or leaves blank, and taken emails are refused."""
+    ndjson = (
+        b'{"student_id": "S-1", "name": "Abdul Karim Rahim", "gender": "male", "date_of_birth": "2010-01-02"}\n'
+        b"not json\n"
+        b'{"student_id": "S-5", "name": "Rina Das", "gender": "F", "date_of_birth": "2012-05-06", '
+        b'"email": "rahim@example.com"}\n'
+    )
+    blanks = b"student_id,name,dob,sex,district\nS-1,Abdul Karim Rahim,2010-01-02,M,\n"
+    (_, result, _), students = asyncio.run(run_imports((CSV, "csv"), (ndjson, "ndjson"), (blanks, "csv")))
+
+    assert [(outcome.row, outcome.status.value) for outcome in result.rows] == [(1, "updated"), (2, "failed"), (3, "failed")]
+    assert result.rows[2].errors == ["email: rahim@example.com is already registered"]
+    (student,) = students
+    assert (student.first_name, student.last_name, student.phone) == ("Abdul Karim", "Rahim", "+8801711000000")
+    assert student.district == "Dhaka"
@@ -0,0 +1,66 @@
+"""Tests for the student search helpers."""
+
+from sqlalchemy import Column, Integer, String, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import declarative_base
+
+from database.search import (
+    escape_like,
+    location_match,
+    location_spellings,
+    normalize_search_text,
+    student_name_search,
+)
+
+Base = declarative_base()
+
+
+class Student(Base):
+    __tablename__ = "students"
+
+    id = Column(Integer, primary_key=True)
+    first_name = Column(String(100))
+    last_name = Column(String(100))
+    district = Column(String(100))
+
+
+def test_bangla_spellings_normalize_to_one_form():
+    """Precomposed and decomposed nukta letters, khanda ta forms and Bangla digits compare equal."""
+    assert normalize_search_text("\u09b0\u09be\u09df") == normalize_search_text("\u09b0\u09be\u09af\u09bc")
+    assert normalize_search_text("\u09ae\u09b9\u09a4\u09cd\u200d") == "\u09ae\u09b9\u09ce"
+    assert normalize_search_text("\u0995\u09cd\u200c\u09b7 \u09e7\u09e8\u09e9") == "\u0995\u09cd\u09b7 123"
+    assert normalize_search_text("  Abdul   RAHIM ") == "abdul rahim"
+
+
+def test_like_wildcards_in_terms_are_literal():
+    """Percent signs and underscores typed by users do not act as wildcards."""
+    assert escape_like("50%_a\\b") == "50\\%\\_a\\\\b"
+
+
+def test_name_search_matches_the_index_expression():
+    """The searched expression is the indexed one, with the separator inlined rather than bound."""
+    condition, rank = student_name_search(Student.first_name, Student.last_name, " Rahim ")
+    compiled = select(Student.id, rank).where(condition).compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+
+    assert "search_normalize((students.first_name || ' ') || students.last_name) LIKE" in sql
+    assert "%%>" in sql and "word_similarity(" in sql
+    assert "%rahim%" in compiled.params.values()
+
+
+def test_location_spellings_cover_case_suffix_and_bangla():
+    """A place is known by its English and Bangla names, with or without the kind after them."""
+    spellings = location_spellings("division", "Dhaka", "\u09a2\u09be\u0995\u09be")
+
+    assert "dhaka" in spellings and "dhaka division" in spellings
+    assert "\u09a2\u09be\u0995\u09be" in spellings and "\u09a2\u09be\u0995\u09be \u09ac\u09bf\u09ad\u09be\u0997" in spellings
+    assert normalize_search_text(" DHAKA  Division ") in spellings
+
+
+def test_location_match_compares_the_normalized_column():
+    """Whole-name matches compare the indexed normalized expression, not the raw column."""
+    condition = location_match(Student.district, location_spellings("district", "Sylhet", None))
+    compiled = select(Student.id).where(condition).compile(dialect=postgresql.dialect())
+
+    assert "search_normalize(students.district) IN" in str(compiled)
+    assert ["sylhet", "sylhet district"] in compiled.params.values()
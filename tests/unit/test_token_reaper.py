@@ -0,0 +1,52 @@
+"""Tests for refresh token hashing and the expired token reaper."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from auth.token_reaper import RefreshTokenReaper
+from models.user_model import RefreshToken
+
+
+async def reap_tokens(expiries, batch_size):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(RefreshToken.__table__.create)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session, session.begin():
+        for index, expires_in in enumerate(expiries):
+            session.add(
+                RefreshToken(
+                    token_hash=RefreshToken.hash_token(f"token-{index}"),
+                    user_id=1,
+                    expires_at=now + expires_in,
+                )
+            )
+
+    reaper = RefreshTokenReaper(session_factory=session_factory, batch_size=batch_size, retention=timedelta(hours=1))
+    deleted = await reaper.reap()
+    async with session_factory() as session:
+        remaining = (await session.execute(select(func.count()).select_from(RefreshToken))).scalar_one()
+    await engine.dispose()
+    return reaper, deleted, remaining
+
+
+def test_tokens_are_stored_as_sha256_digests():
+    """The stored value is the hex SHA-256 digest of the token, never the token itself."""
+    assert RefreshToken.hash_token("refresh-token") == "0eb17643d4e9261163783a420859c92c7d212fa9624106a12b510afbec266120"
+    assert RefreshToken.__table__.c.token_hash.unique
+
+
+def test_reaper_deletes_tokens_expired_past_retention_in_batches():
+    """Tokens expired longer than the retention period are deleted batch by batch; the rest are kept."""
+    expiries = [timedelta(hours=-2)] * 5 + [timedelta(minutes=-30), timedelta(days=7)]
+
+    reaper, deleted, remaining = asyncio.run(reap_tokens(expiries, batch_size=2))
+
+    assert deleted == 5 and remaining == 2
+    assert reaper.last_run["batches"] == 3
+    assert reaper.reaped_total == 5